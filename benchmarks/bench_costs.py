@@ -0,0 +1,97 @@
+"""Benchmarks for the construction, evaluation, and optimization of qNetVO cost functions.
+
+Each suite times, for every network in its parameter grid,
+
+* ``time_construct`` - the construction of the cost function,
+* ``time_cost`` - one evaluation of the cost,
+* ``time_grad`` - one evaluation of the cost gradient,
+* ``time_gradient_descent`` - a fixed number of :meth:`qnetvo.gradient_descent` steps.
+"""
+
+import abc
+
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo
+
+from . import networks
+
+
+class _CostEvaluationSuite(abc.ABC):
+    timeout = 600
+
+    @abc.abstractmethod
+    def network(self, *params):
+        """Returns the ``(ansatz, cost_fn)`` pair benchmarked for the suite parameters, where
+        ``cost_fn()`` constructs the cost function."""
+
+    def setup(self, *params):
+        self.ansatz, self.cost_fn = self.network(*params)
+        self.cost = self.cost_fn()
+        self.grad = qml.grad(self.cost)
+
+        np.random.seed(0)
+        self.settings = self.ansatz.rand_network_settings()
+
+    def time_construct(self, *params):
+        self.cost_fn()
+
+    def time_cost(self, *params):
+        self.cost(*self.settings)
+
+
+class _CostSuite(_CostEvaluationSuite):
+    num_steps = 3
+
+    def time_grad(self, *params):
+        self.grad(*self.settings)
+
+    def time_gradient_descent(self, *params):
+        qnetvo.gradient_descent(
+            self.cost,
+            self.settings,
+            num_steps=self.num_steps,
+            sample_width=self.num_steps,
+            verbose=False,
+        )
+
+
+class BellInequalities(_CostSuite):
+    params = ["chsh", "I_3322", "magic_squares"]
+    param_names = ["network"]
+
+    def network(self, name):
+        return getattr(networks, name)()
+
+
+class MerminKlyshko(_CostSuite):
+    params = list(range(2, 11))
+    param_names = ["n"]
+
+    def network(self, n):
+        return networks.mermin_klyshko(n)
+
+
+class NLocalNetworks(_CostSuite):
+    params = (["nlocal_chain", "nlocal_star"], [2, 3, 4])
+    param_names = ["network", "n"]
+
+    def network(self, name, n):
+        return getattr(networks, name)(n)
+
+
+class MutualInfo(_CostSuite):
+    def network(self):
+        return networks.mutual_info()
+
+
+class Negativity(_CostEvaluationSuite):
+    # the partial transpose in the negativity cost is not differentiable
+    def network(self):
+        return networks.negativity()
+
+
+class Teleportation(_CostSuite):
+    def network(self):
+        return networks.teleportation()
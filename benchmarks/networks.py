@@ -0,0 +1,153 @@
+"""Network ansatzes and cost function constructors for each benchmarked network family.
+
+Each factory returns a tuple ``(ansatz, cost_fn)`` where ``cost_fn()`` constructs the cost
+function evaluated as ``cost(*network_settings)``.
+"""
+
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo
+
+
+def chsh():
+    ansatz = qnetvo.NetworkAnsatz(
+        [qnetvo.PrepareNode(1, [0, 1], qnetvo.ghz_state, 0)],
+        [
+            qnetvo.MeasureNode(2, 2, [0], qnetvo.local_RY, 1),
+            qnetvo.MeasureNode(2, 2, [1], qnetvo.local_RY, 1),
+        ],
+    )
+
+    return ansatz, lambda: qnetvo.chsh_inequality_cost_fn(ansatz)
+
+
+def I_3322():
+    ansatz = qnetvo.NetworkAnsatz(
+        [qnetvo.PrepareNode(1, [0, 1], qnetvo.ghz_state, 0)],
+        [
+            qnetvo.MeasureNode(3, 2, [0], qnetvo.local_RY, 1),
+            qnetvo.MeasureNode(3, 2, [1], qnetvo.local_RY, 1),
+        ],
+    )
+
+    return ansatz, lambda: qnetvo.I_3322_bell_inequality_cost_fn(ansatz)
+
+
+def mermin_klyshko(n):
+    ansatz = qnetvo.NetworkAnsatz(
+        [qnetvo.PrepareNode(1, range(n), qnetvo.ghz_state, 0)],
+        [qnetvo.MeasureNode(2, 2, [i], qnetvo.local_RY, 1) for i in range(n)],
+    )
+
+    return ansatz, lambda: qnetvo.mermin_klyshko_cost_fn(ansatz)
+
+
+def nlocal_chain(n):
+    prep_nodes = [qnetvo.PrepareNode(1, [2 * i, 2 * i + 1], qnetvo.ghz_state, 0) for i in range(n)]
+    meas_nodes = (
+        [qnetvo.MeasureNode(2, 2, [0], qnetvo.local_RY, 1)]
+        + [
+            qnetvo.MeasureNode(2, 2, [2 * i + 1, 2 * i + 2], qnetvo.local_RY, 2)
+            for i in range(n - 1)
+        ]
+        + [qnetvo.MeasureNode(2, 2, [2 * n - 1], qnetvo.local_RY, 1)]
+    )
+    ansatz = qnetvo.NetworkAnsatz(prep_nodes, meas_nodes)
+
+    return ansatz, lambda: qnetvo.nlocal_chain_22_cost_fn(ansatz)
+
+
+def nlocal_star(n):
+    prep_nodes = [qnetvo.PrepareNode(1, [i, n + i], qnetvo.ghz_state, 0) for i in range(n)]
+    meas_nodes = [qnetvo.MeasureNode(2, 2, [i], qnetvo.local_RY, 1) for i in range(n)] + [
+        qnetvo.MeasureNode(2, 2, range(n, 2 * n), qnetvo.local_RY, n)
+    ]
+    ansatz = qnetvo.NetworkAnsatz(prep_nodes, meas_nodes)
+
+    return ansatz, lambda: qnetvo.nlocal_star_22_cost_fn(ansatz)
+
+
+def magic_squares():
+    ansatz = qnetvo.NetworkAnsatz(
+        [qnetvo.PrepareNode(1, range(4), qnetvo.bell_state_copies, 0)],
+        [
+            qnetvo.MeasureNode(3, 4, [0, 1], qml.ArbitraryUnitary, 15),
+            qnetvo.MeasureNode(3, 4, [2, 3], qml.ArbitraryUnitary, 15),
+        ],
+    )
+
+    return ansatz, lambda: qnetvo.magic_squares_game_cost_fn(ansatz)
+
+
+def mutual_info():
+    ansatz = qnetvo.NetworkAnsatz(
+        [qnetvo.PrepareNode(4, [0, 1], qnetvo.local_RY, 2)],
+        [qnetvo.MeasureNode(1, 4, [0, 1], qnetvo.local_RY, 2)],
+    )
+    priors = [np.ones(4) / 4]
+
+    return ansatz, lambda: qnetvo.mutual_info_cost_fn(ansatz, priors)
+
+
+def negativity():
+    ansatz = qnetvo.NetworkAnsatz([qnetvo.PrepareNode(1, [0, 1], qnetvo.local_RY, 2)])
+
+    return ansatz, lambda: qnetvo.negativity_cost_fn(ansatz, m=1, n=1, wires=[0, 1])
+
+
+def teleportation():
+    """Teleports the four states used to train the teleportation protocol in the test suite
+    using one-way classical communication."""
+    input_states = [
+        np.array([1, 0]),
+        np.array([1, 1]) / np.sqrt(2),
+        np.array([1, -1]) / np.sqrt(2),
+        np.array([1, 1j]) / np.sqrt(2),
+    ]
+
+    def locc_circuit(settings, wires):
+        qml.CNOT(wires=wires[0:2])
+        qml.Rot(*settings[0:3], wires=wires[0])
+
+        return [qml.measure(wires[0]), qml.measure(wires[1])]
+
+    def measure_circuit(settings, wires, cc_wires):
+        for i, (b0, b1) in enumerate([(0, 0), (0, 1), (1, 0), (1, 1)]):
+            qml.cond((cc_wires[0] == b0) & (cc_wires[1] == b1), qml.Rot)(
+                *settings[3 * i : 3 * i + 3], wires=wires[0]
+            )
+
+    def input_prep_node(state):
+        def circuit(settings, wires):
+            qml.StatePrep(state, wires=wires[0])
+
+        return qnetvo.PrepareNode(1, [0], circuit, 0)
+
+    ansatzes = [
+        qnetvo.NetworkAnsatz(
+            [
+                input_prep_node(state),
+                qnetvo.PrepareNode(1, [1, 2], qml.ArbitraryStatePreparation, 6),
+            ],
+            [qnetvo.CCSenderNode(1, [0, 1], [0, 1], locc_circuit, 3)],
+            [qnetvo.CCReceiverNode(1, [2], [0, 1], measure_circuit, 12)],
+        )
+        for state in input_states
+    ]
+
+    def cost_fn():
+        qnodes = [qnetvo.density_matrix_qnode(ansatz, wires=[2]) for ansatz in ansatzes]
+
+        def cost(*network_settings):
+            settings = ansatzes[0].qnode_settings(network_settings, [[0, 0], [0], [0]])
+            fidelities = [
+                qml.math.fidelity(qnode(settings), np.outer(state, state.conj()))
+                for qnode, state in zip(qnodes, input_states)
+            ]
+
+            return -sum(fidelities) / len(fidelities)
+
+        return cost
+
+    return ansatzes[0], cost_fn
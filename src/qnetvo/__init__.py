@@ -7,6 +7,8 @@ from .qnodes import *
 from .postprocessing import *
 from .information import *
 from .gradient_descent import *
+from .executors import *
+from .profiling import *
 from .cost import *
 
 # adding the quantum channels to "default.mixed" device
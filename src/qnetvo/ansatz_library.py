@@ -162,7 +162,8 @@ def local_RY(settings, wires):
     :param wires: The wires on which the rotations are applied.
     :type wires: qml.Wires
     """
-    qml.broadcast(qml.RY, wires, "single", settings)
+    for i, wire in enumerate(wires):
+        qml.RY(settings[i], wires=wire)
 
 
 def local_Rot(settings, wires):
@@ -1,6 +1,8 @@
 from pennylane import math
 from ..postprocessing import even_parity_ids
-from ..qnodes import joint_probs_qnode, local_parity_expval_qnode
+from ..qnodes import joint_probs_qnode, node_parity_sign_matrix, cached_prep_qnode_fn
+from ..executors import SerialExecutor
+from .parallel_grad import parallel_grad_fn
 
 
 def post_process_I_3322_joint_probs(probs_vec):
@@ -39,48 +41,72 @@ def post_process_I_3322_joint_probs(probs_vec):
     return sum([sum([probs[a, b] for b in even_ids]) for a in even_ids])
 
 
-def I_3322_bell_inequality_cost_fn(network_ansatz, **qnode_kwargs):
+def I_3322_bell_inequality_cost_fn(network_ansatz, cache_prep=False, executor=None, **qnode_kwargs):
     """Constructs a cost function that maximizes the score of the :math:`I_{3322}` Bell inequality.
 
     :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
     :type network_ansatz: NetworkAnsatz
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per cost evaluation
+                       and only the measurement layer is simulated for each input
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`).
+    :type cache_prep: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
     :returns: A cost function evaluated as ``cost(*network_settings)`` where
               the ``network_settings`` are obtained from the provided
               ``network_ansatz`` class.
     """
-    I_3322_joint_probs_qnode = joint_probs_qnode(network_ansatz, **qnode_kwargs)
-    I_3322_local_expval_qnode = local_parity_expval_qnode(network_ansatz, **qnode_kwargs)
-
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
 
+    xy_mults = [
+        (0, 0, 1),
+        (0, 1, 1),
+        (0, 2, 1),
+        (1, 0, 1),
+        (1, 1, 1),
+        (1, 2, -1),
+        (2, 0, 1),
+        (2, 1, -1),
+    ]
+    xy_network_inputs = [static_prep_inputs + [[x, y]] for x, y, _ in xy_mults]
+
+    # the local marginals P_A(0|0), P_B(0|0), and P_B(0|1) are derived from the joint
+    # probabilities for inputs (x,y) = (0,0) and (1,1) which are already evaluated
+    local_sign_matrix = node_parity_sign_matrix(network_ansatz.layers[-1], [[0], [1]])
+    local_xy_ids = [xy_mults.index((0, 0, 1)), xy_mults.index((1, 1, 1))]
+
+    if cache_prep:
+        I_3322_joint_probs_results = cached_prep_qnode_fn(
+            network_ansatz, joint_probs_qnode, **qnode_kwargs
+        )
+    else:
+        executor = executor or SerialExecutor()
+        executor.prepare(network_ansatz, joint_probs_qnode, qnode_kwargs)
+
     def cost(*network_settings):
+        if cache_prep:
+            probs_vecs = I_3322_joint_probs_results(network_settings, xy_network_inputs)
+        else:
+            xy_settings = [
+                network_ansatz.qnode_settings(network_settings, inputs)
+                for inputs in xy_network_inputs
+            ]
+            probs_vecs = executor.map(network_ansatz, joint_probs_qnode, xy_settings, qnode_kwargs)
+
+        expval_00, expval_11 = [
+            math.tensordot(local_sign_matrix, probs_vecs[i], axes=1) for i in local_xy_ids
+        ]
+
         score = 0
-        for x, y, mult in [
-            (0, 0, 1),
-            (0, 1, 1),
-            (0, 2, 1),
-            (1, 0, 1),
-            (1, 1, 1),
-            (1, 2, -1),
-            (2, 0, 1),
-            (2, 1, -1),
-        ]:
-            settings = network_ansatz.qnode_settings(
-                network_settings, static_prep_inputs + [[x, y]]
-            )
-
-            probs_vec_xy = I_3322_joint_probs_qnode(settings)
-            prob00_xy = post_process_I_3322_joint_probs(probs_vec_xy)
+        for i, (x, y, mult) in enumerate(xy_mults):
+            prob00_xy = post_process_I_3322_joint_probs(probs_vecs[i])
 
             score += mult * prob00_xy
 
-        settings_00 = network_ansatz.qnode_settings(network_settings, static_prep_inputs + [[0, 0]])
-        settings_11 = network_ansatz.qnode_settings(network_settings, static_prep_inputs + [[1, 1]])
-
-        expval_00 = I_3322_local_expval_qnode(settings_00)
-        expval_11 = I_3322_local_expval_qnode(settings_11)
-
         # - P_A(0|0)
         score += -1 * (expval_00[0] + 1) / 2
 
@@ -93,3 +119,54 @@ def I_3322_bell_inequality_cost_fn(network_ansatz, **qnode_kwargs):
         return -(score)
 
     return cost
+
+
+def parallel_I_3322_grad_fn(network_ansatz, natural_grad=False, executor=None, **qnode_kwargs):
+    """Constructs a parallelizeable gradient function ``grad_fn`` for the :math:`I_{3322}` cost
+    (see :meth:`qnetvo.I_3322_bell_inequality_cost_fn`).
+
+    The :math:`I_{3322}` score is a linear function of the joint probabilities for each
+    input pair :math:`(x,y)`.
+    Hence, the gradient of each joint probability vector is weighted by its contribution to the
+    score and evaluated by the ``executor`` using :meth:`qnetvo.parallel_grad_fn`.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+    :type natural_grad: *optional* bool
+
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
+    :returns: A gradient function ``grad_fn(*network_settings)``.
+    :rtype: function
+    """
+    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
+
+    num_probs = 2 ** len(network_ansatz.layers_wires[-1])
+    even_weights = math.stack(
+        [post_process_I_3322_joint_probs(probs_vec) for probs_vec in math.eye(num_probs)]
+    )
+    A_signs, B_signs = node_parity_sign_matrix(network_ansatz.layers[-1], [[0], [1]])
+
+    xy_weights = {
+        (0, 0): even_weights - A_signs / 2 - B_signs,
+        (0, 1): even_weights,
+        (0, 2): even_weights,
+        (1, 0): even_weights,
+        (1, 1): even_weights - B_signs / 2,
+        (1, 2): -even_weights,
+        (2, 0): even_weights,
+        (2, 1): -even_weights,
+    }
+
+    terms = [
+        (static_prep_inputs + [[x, y]], joint_probs_qnode, -weights)
+        for (x, y), weights in xy_weights.items()
+    ]
+
+    return parallel_grad_fn(
+        network_ansatz, terms, natural_grad=natural_grad, executor=executor, **qnode_kwargs
+    )
@@ -1,3 +1,5 @@
+from .parallel_grad import *
+from .correlator_cost import *
 from .I_3322_bell_inequality import *
 from .mermin_klyshko_inequality import *
 from .nlocal_chain_bell_inequality import *
@@ -7,3 +9,4 @@ from .chsh_inequality import *
 from .linear_inequalities import *
 from .mutual_info import *
 from .negativity import *
+from .minibatch import *
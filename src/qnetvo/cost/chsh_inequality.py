@@ -1,10 +1,12 @@
-import pennylane as qml
 from pennylane import math
-from ..qnodes import global_parity_expval_qnode
-from scipy.linalg import pinvh
+from ..qnodes import global_parity_expval_qnode, cached_prep_qnode_fn
+from ..executors import SerialExecutor, _default_thread_executor
+from .parallel_grad import parallel_grad_fn
 
 
-def chsh_inequality_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
+def chsh_inequality_cost_fn(
+    network_ansatz, parallel=False, cache_prep=False, executor=None, **qnode_kwargs
+):
     """Constructs a cost function for maximizing the score against the CHSH Bell inequality.
     This inequality is defined as
 
@@ -18,9 +20,19 @@ def chsh_inequality_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
     :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
     :type network_ansatz: NetworkAnsatz
 
-    :param parallel: If ``True``, remote qnode executions are made in parallel web requests.
+    :param parallel: If ``True``, remote qnode executions are made in parallel web requests
+                     using a :class:`qnetvo.ThreadExecutor` with four threads.
     :type parallel: *optional* bool
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per cost evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`).
+    :type cache_prep: *optional* bool
+
+    :param executor: The executor through which all qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     Default ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: Keyword arguments used only for ``pennylane.qnode`` construction.
     :type qnode_kwargs: *optional* dict
 
@@ -32,37 +44,40 @@ def chsh_inequality_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
     network_inputs = [static_prep_inputs + [xy] for xy in [[0, 0], [0, 1], [1, 0], [1, 1]]]
 
-    if parallel:
-        from ..lazy_dask_import import dask
+    if executor is None:
+        executor = _default_thread_executor() if parallel else SerialExecutor()
 
-        chsh_qnodes = [global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(4)]
+    if cache_prep:
+        chsh_qnode_results = cached_prep_qnode_fn(
+            network_ansatz, global_parity_expval_qnode, **qnode_kwargs
+        )
     else:
-        chsh_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
+        executor.prepare(network_ansatz, global_parity_expval_qnode, qnode_kwargs)
 
     def chsh_cost(*network_settings):
+        if cache_prep:
+            results = chsh_qnode_results(network_settings, network_inputs)
+            return -(math.sum(results * math.stack([1, 1, 1, -1])))
+
         xy_settings = [
             network_ansatz.qnode_settings(network_settings, network_input)
             for network_input in network_inputs
         ]
 
-        if parallel:
-            delayed_results = [
-                dask.delayed(chsh_qnodes[i])(settings) for i, settings in enumerate(xy_settings)
-            ]
-
-            results = math.stack(dask.compute(*delayed_results, scheduler="threads"))
-        else:
-            results = math.stack([chsh_qnode(settings) for settings in xy_settings])
+        results = math.stack(
+            executor.map(network_ansatz, global_parity_expval_qnode, xy_settings, qnode_kwargs)
+        )
 
         return -(math.sum(results * math.stack([1, 1, 1, -1])))
 
     return chsh_cost
 
 
-def parallel_chsh_grad_fn(network_ansatz, natural_grad=False, **qnode_kwargs):
+def parallel_chsh_grad_fn(network_ansatz, natural_grad=False, executor=None, **qnode_kwargs):
     """Constructs a parallelizeable gradient function ``grad_fn`` for the CHSH cost.
 
-    The parallelization is achieved through multithreading and intended to improve the
+    The gradient of each correlator is evaluated by the ``executor`` (see :meth:`qnetvo.parallel_grad_fn`).
+    By default, a :class:`qnetvo.ThreadExecutor` with four threads is used to improve the
     efficiency of remote qnode execution.
 
     The natural gradient
@@ -90,6 +105,10 @@ def parallel_chsh_grad_fn(network_ansatz, natural_grad=False, **qnode_kwargs):
     :param natural_grad: If ``True``, then the natural gradient is evaluated. Default ``False``.
     :type natural_grad: *optional* Bool
 
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: A keyword argument passthrough to qnode construction.
     :type qnode_kwargs: *optional* dict
 
@@ -101,43 +120,12 @@ def parallel_chsh_grad_fn(network_ansatz, natural_grad=False, **qnode_kwargs):
     
     """
 
-    from ..lazy_dask_import import dask
-
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
-    network_inputs = [static_prep_inputs + [xy] for xy in [[0, 0], [0, 1], [1, 0], [1, 1]]]
-
-    qnodes = []
-    for _ in network_inputs:
-        chsh_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
-        qnodes.append(chsh_qnode)
-
-    def _grad_fn(settings, qnode):
-        return qml.grad(qnode)(settings)
-
-    def _nat_grad_fn(settings, qnode):
-        ginv = pinvh(qml.metric_tensor(qnode, approx="block-diag")(settings))
-        return ginv @ _grad_fn(settings, qnode)
-
-    grad_fn = _nat_grad_fn if natural_grad else _grad_fn
-
-    def parallel_chsh_grad(*network_settings):
-        xy_settings = [
-            network_ansatz.qnode_settings(network_settings, input) for input in network_inputs
-        ]
-
-        delayed_grads = [
-            dask.delayed(grad_fn)(settings, qnodes[i]) for i, settings in enumerate(xy_settings)
-        ]
-        grads = dask.compute(*delayed_grads, scheduler="threads")
-
-        grad = network_ansatz.zero_network_settings()
-        for grad_id, inputs in enumerate(network_inputs):
-            x = inputs[1][0]
-            y = inputs[1][1]
-
-            scalar = -1 * (-1) ** (x * y)
-            grad += scalar * network_ansatz.expand_qnode_settings(grads[grad_id], inputs)
-
-        return grad
-
-    return parallel_chsh_grad
+    terms = [
+        (static_prep_inputs + [[x, y]], global_parity_expval_qnode, -1 * (-1) ** (x * y))
+        for x, y in [[0, 0], [0, 1], [1, 0], [1, 1]]
+    ]
+
+    return parallel_grad_fn(
+        network_ansatz, terms, natural_grad=natural_grad, executor=executor, **qnode_kwargs
+    )
@@ -0,0 +1,121 @@
+from pennylane import math
+from pennylane import numpy as np
+from ..qnodes import global_parity_expval_qnode, joint_probs_qnode, node_parity_sign_matrix
+from ..executors import SerialExecutor
+
+
+def correlator_cost_fn(network_ansatz, terms, outer_fn=None, executor=None, **qnode_kwargs):
+    """Compiles a declarative Bell expression into a cost function that evaluates each
+    distinct network input with a single qnode execution.
+
+    The Bell expression is described by a list of ``terms`` where each term
+    ``(network_inputs, coeff)`` evaluates to
+
+    .. math::
+
+        v_k(\\vec{\\theta}) = \\vec{c}_k \\cdot \\vec{P}(\\vec{\\theta}_k),
+
+    where :math:`\\vec{\\theta}_k` are the qnode settings for the ``network_inputs``.
+    If ``coeff`` is a scalar :math:`c_k`, the term is :math:`c_k` times the global parity
+    correlator of all measurement nodes.
+    Otherwise, ``coeff`` is a vector :math:`\\vec{c}_k` that weights the joint probabilities
+    :math:`\\vec{P}` across all measurement wires, e.g., the marginal parity correlators are
+    constructed with :meth:`qnetvo.node_parity_sign_matrix`.
+    The cost is :math:`C(\\vec{\\theta}) = g(\\vec{v}(\\vec{\\theta}))` where :math:`g` is the
+    ``outer_fn``.
+
+    When compiled, terms are grouped by their network inputs and all terms that share an input
+    are derived from the same qnode execution.
+    If every coefficient is a scalar, the global parity is measured with
+    :meth:`qnetvo.global_parity_expval_qnode`, otherwise the joint probabilities are measured
+    with :meth:`qnetvo.joint_probs_qnode`.
+    All executions are submitted to the ``executor`` in a single batch.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param terms: A list of ``(network_inputs, coeff)`` tuples.
+    :type terms: list[tuple[list[list[int]], float or array[float]]]
+
+    :param outer_fn: A function ``outer_fn(term_values)`` of the array of term values that
+                     returns the cost. If ``None``, the cost is the sum of the term values.
+                     Default ``None``.
+    :type outer_fn: *optional* function
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: A keyword argument passthrough to qnode construction.
+    :type qnode_kwargs: *optional* dict
+
+    :returns: A cost function evaluated as ``cost(*network_settings)``.
+    :rtype: function
+
+    :raises ValueError: If ``terms`` is empty or a vector ``coeff`` does not have one element
+                        per joint measurement outcome.
+
+    For example, the CHSH cost :math:`-I_{CHSH}` is compiled as
+
+    .. code-block:: python
+
+        terms = [([[0], [x, y]], -((-1) ** (x * y))) for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+        cost = qnetvo.correlator_cost_fn(chsh_ansatz, terms)
+    """
+    if len(terms) == 0:
+        raise ValueError("At least one term is required.")
+
+    executor = executor or SerialExecutor()
+
+    # each distinct network input is executed once and shared by all terms that need it
+    input_ids = {}
+    exec_network_inputs = []
+    term_exec_ids = []
+    for network_inputs, _ in terms:
+        key = tuple(tuple(layer_inputs) for layer_inputs in network_inputs)
+        if key not in input_ids:
+            input_ids[key] = len(exec_network_inputs)
+            exec_network_inputs.append(network_inputs)
+
+        term_exec_ids.append(input_ids[key])
+
+    coeffs = [np.array(coeff, requires_grad=False) for _, coeff in terms]
+    if all(math.ndim(coeff) == 0 for coeff in coeffs):
+        qnode_fn = global_parity_expval_qnode
+        weights = np.array(coeffs, requires_grad=False)
+    else:
+        qnode_fn = joint_probs_qnode
+        measure_nodes = network_ansatz.layers[-1]
+        global_parity = node_parity_sign_matrix(measure_nodes, [list(range(len(measure_nodes)))])[0]
+
+        num_outcomes = len(global_parity)
+        if any(math.ndim(coeff) != 0 and coeff.shape != (num_outcomes,) for coeff in coeffs):
+            raise ValueError(
+                "Each vector `coeff` must have one element per joint measurement outcome, "
+                + str(num_outcomes)
+                + "."
+            )
+
+        weights = np.array(
+            [coeff * global_parity if math.ndim(coeff) == 0 else coeff for coeff in coeffs],
+            requires_grad=False,
+        )
+
+    executor.prepare(network_ansatz, qnode_fn, qnode_kwargs)
+
+    def cost(*network_settings):
+        exec_settings = [
+            network_ansatz.qnode_settings(network_settings, network_inputs)
+            for network_inputs in exec_network_inputs
+        ]
+        results = math.stack(executor.map(network_ansatz, qnode_fn, exec_settings, qnode_kwargs))
+
+        term_results = math.take(results, term_exec_ids, axis=0)
+        if qnode_fn is global_parity_expval_qnode:
+            term_values = weights * term_results
+        else:
+            term_values = math.sum(weights * term_results, axis=1)
+
+        return math.sum(term_values) if outer_fn is None else outer_fn(term_values)
+
+    return cost
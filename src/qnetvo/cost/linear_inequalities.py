@@ -1,10 +1,72 @@
 from pennylane import math
 from pennylane import numpy as np
 from ..qnodes import joint_probs_qnode, global_parity_expval_qnode
-from ..utilities import mixed_base_num, ragged_reshape
+from ..network_ansatz import NetworkInputs
+from ..executors import SerialExecutor
+from ..postprocessing import _structured_postmap
+from .parallel_grad import parallel_grad_fn
 
 
-def linear_probs_cost_fn(network_ansatz, game, postmap=np.array([]), qnode_kwargs={}):
+def _linear_probs_input_ids(network_ansatz, game, postmap):
+    """Validates the dimensions of the ``game`` and ``postmap`` against the ``network_ansatz``
+    and returns the network inputs for each column of the ``game``.
+    """
+    node_input_ids = NetworkInputs(network_ansatz)
+    net_num_in = len(node_input_ids)
+
+    raw_net_num_out = 2 ** len(network_ansatz.layers_wires[-1])
+
+    game_outputs, game_inputs = game.shape
+
+    if game_inputs != net_num_in:
+        raise ValueError("The `game` matrix must have " + str(net_num_in) + " columns.")
+
+    has_postmap = len(postmap) != 0
+    if not (has_postmap):
+        if game_outputs != raw_net_num_out:
+            raise ValueError(
+                "The `game` matrix must either have "
+                + str(raw_net_num_out)
+                + " rows, or a `postmap` is needed."
+            )
+    else:
+        if postmap.shape[0] != game_outputs:
+            raise ValueError("The `postmap` must have " + str(game_outputs) + " rows.")
+        elif postmap.shape[1] != raw_net_num_out:
+            raise ValueError("The `postmap` must have " + str(raw_net_num_out) + " columns.")
+
+    return node_input_ids
+
+
+def _linear_probs_active_game(game, postmap):
+    """Finds the columns of the ``game`` that contribute to the score and returns their
+    ids along with the dense ``game`` matrix restricted to these columns.
+    The ``game`` may be a dense array or a ``scipy.sparse`` matrix.
+    """
+    if hasattr(game, "tocsc"):
+        # only the columns with stored elements of a sparse game are made dense
+        game = game.tocsc()
+        column_ids = np.flatnonzero(game.getnnz(axis=0))
+        game = np.array(game[:, column_ids].toarray(), requires_grad=False)
+    else:
+        column_ids = np.arange(game.shape[1])
+        game = np.array(game, requires_grad=False)
+
+    raw_game = postmap.T @ game if len(postmap) != 0 else game
+    is_active = np.any(raw_game != 0, axis=0)
+
+    return column_ids[is_active], game[:, is_active]
+
+
+def linear_probs_cost_fn(
+    network_ansatz,
+    game,
+    postmap=np.array([]),
+    qnode_kwargs={},
+    broadcast=False,
+    executor=None,
+    chunk_size=1024,
+):
     """Constructs an ansatz-specific cost that is a linear function of the network probablities.
 
     The cost function is encoded into a ``game`` matrix whose
@@ -27,16 +89,36 @@ def linear_probs_cost_fn(network_ansatz, game, postmap=np.array([]), qnode_kwarg
 
     In the above expression, :math:`z'` is a new output drawn from a new alphabet.
 
+    The ``game`` and ``postmap`` are analyzed when the cost is constructed and only the
+    input combinations :math:`\\{\\vec{x}_i\\}_i` with a nonzero column
+    :math:`\\mathbf{L}^T\\mathbf{G}_{\\cdot|\\{x_i\\}_i}` are simulated, e.g.,
+    a CHSH game embedded in larger input alphabets only executes the four CHSH inputs.
+
     :param network_ansatz: The network to which the cost function is applied.
     :type network_ansatz: ``NetworkAnsatz`` class
 
-    :param game: A matrix with dimensions ``A x (\\prod_i X_i)`` for
-    :type game: np.arrray
+    :param game: A matrix with dimensions ``A x (\\prod_i X_i)``. Sparse games may be provided
+                 as a ``scipy.sparse`` matrix.
+    :type game: np.array or scipy.sparse matrix
 
     :param postmap: A post-processing map applied to the bitstrings output from the
                      quantum circuit. The ``postmap`` matrix is column stochastic, that is,
                      each column sums to one and contains only positive values.
-    :type postmap: *optional* np.ndarray
+                     Deterministic postmaps are applied as a :class:`qnetvo.CoarseGrainingPostmap`.
+    :type postmap: *optional* np.ndarray or CoarseGrainingPostmap
+
+    :param broadcast: If ``True``, all input combinations are evaluated in one qnode execution
+                      using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      Default ``False``.
+    :type broadcast: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param chunk_size: The maximum number of input combinations submitted to the ``executor``
+                       at a time. Default ``1024``.
+    :type chunk_size: *optional* int
 
     :returns: A cost function evaluated as ``cost(*network_settings)``.
     :rtype: function
@@ -45,46 +127,99 @@ def linear_probs_cost_fn(network_ansatz, game, postmap=np.array([]), qnode_kwarg
         the number of rows in the specified ``game``.
     """
 
-    probs_qnode = joint_probs_qnode(network_ansatz, **qnode_kwargs)
+    if executor is None:
+        executor = SerialExecutor()
 
-    net_num_in = math.prod(network_ansatz.layers_total_num_in)
-    num_inputs_list = math.concatenate(network_ansatz.layers_node_num_in).tolist()
-    node_input_ids = [
-        ragged_reshape(mixed_base_num(i, num_inputs_list), network_ansatz.layers_num_nodes)
-        for i in range(net_num_in)
-    ]
+    executor.prepare(network_ansatz, joint_probs_qnode, qnode_kwargs)
 
-    raw_net_num_out = 2 ** len(network_ansatz.layers_wires[-1])
+    postmap = _structured_postmap(postmap)
+    node_input_ids = _linear_probs_input_ids(network_ansatz, game, postmap)
+    has_postmap = len(postmap) != 0
 
-    game_outputs, game_inputs = game.shape
+    # input combinations whose game column is zero do not contribute and are not simulated
+    active_ids, game = _linear_probs_active_game(game, postmap)
+    if broadcast:
+        active_input_ids = [node_input_ids[i] for i in active_ids]
 
-    if game_inputs != net_num_in:
-        raise ValueError("The `game` matrix must have " + str(net_num_in) + " columns.")
+    def cost(*network_settings):
+        if len(active_ids) == 0:
+            return 0.0
 
-    has_postmap = len(postmap) != 0
-    if not (has_postmap):
-        if game_outputs != raw_net_num_out:
-            raise ValueError(
-                "The `game` matrix must either have "
-                + str(raw_net_num_out)
-                + " rows, or a `postmap` is needed."
-            )
-    else:
-        if postmap.shape[0] != game_outputs:
-            raise ValueError("The `postmap` must have " + str(game_outputs) + " rows.")
-        elif postmap.shape[1] != raw_net_num_out:
-            raise ValueError("The `postmap` must have " + str(raw_net_num_out) + " columns.")
+        if broadcast:
+            settings = network_ansatz.broadcast_qnode_settings(network_settings, active_input_ids)
+            probs_vec = executor.map(network_ansatz, joint_probs_qnode, [settings], qnode_kwargs)[0]
 
-    def cost(*network_settings):
+            raw_probs = math.transpose(probs_vec)
+            probs = postmap @ raw_probs if has_postmap else raw_probs
+
+            return -(math.sum(game * probs))
+
+        # input combinations are streamed in chunks to bound the memory of large input spaces
         score = 0
-        for i, input_id_set in enumerate(node_input_ids):
-            settings = network_ansatz.qnode_settings(network_settings, input_id_set)
+        for start in range(0, len(active_ids), chunk_size):
+            settings_list = [
+                network_ansatz.qnode_settings(network_settings, node_input_ids[i])
+                for i in active_ids[start : start + chunk_size]
+            ]
+            probs_vecs = executor.map(
+                network_ansatz, joint_probs_qnode, settings_list, qnode_kwargs
+            )
 
-            raw_probs = probs_qnode(settings)
-            probs = postmap @ raw_probs if has_postmap else raw_probs
+            for i, raw_probs in enumerate(probs_vecs, start=start):
+                probs = postmap @ raw_probs if has_postmap else raw_probs
 
-            score += math.sum(game[:, i] * probs)
+                score += math.sum(game[:, i] * probs)
 
         return -(score)
 
     return cost
+
+
+def parallel_linear_probs_grad_fn(
+    network_ansatz, game, postmap=np.array([]), natural_grad=False, executor=None, qnode_kwargs={}
+):
+    """Constructs a parallelizeable gradient function ``grad_fn`` for the linear cost
+    (see :meth:`qnetvo.linear_probs_cost_fn`).
+
+    The gradient of the probabilities for each network input is weighted by the corresponding
+    column of the ``game`` matrix and evaluated by the ``executor`` using
+    :meth:`qnetvo.parallel_grad_fn`.
+
+    :param network_ansatz: The network to which the cost function is applied.
+    :type network_ansatz: ``NetworkAnsatz`` class
+
+    :param game: A matrix with dimensions ``A x (\\prod_i X_i)``.
+    :type game: np.array or scipy.sparse matrix
+
+    :param postmap: A post-processing map applied to the bitstrings output from the
+                     quantum circuit.
+    :type postmap: *optional* np.ndarray or CoarseGrainingPostmap
+
+    :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+    :type natural_grad: *optional* bool
+
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: Keyword arguments passed to the qnode constructor.
+    :type qnode_kwargs: *optional* dict
+
+    :returns: A gradient function ``grad_fn(*network_settings)``.
+    :rtype: function
+
+    :raises ValueError: If the ``game`` or ``postmap`` dimensions do not match the
+        ``network_ansatz`` (see :meth:`qnetvo.linear_probs_cost_fn`).
+    """
+    node_input_ids = _linear_probs_input_ids(network_ansatz, game, postmap)
+
+    active_ids, game = _linear_probs_active_game(game, postmap)
+    raw_game = postmap.T @ game if len(postmap) != 0 else game
+
+    terms = [
+        (node_input_ids[i], joint_probs_qnode, -raw_game[:, k]) for k, i in enumerate(active_ids)
+    ]
+
+    return parallel_grad_fn(
+        network_ansatz, terms, natural_grad=natural_grad, executor=executor, **qnode_kwargs
+    )
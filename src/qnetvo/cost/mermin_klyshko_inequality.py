@@ -1,6 +1,8 @@
 import pennylane as qml
 from pennylane import math
-from ..qnodes import global_parity_expval_qnode
+from ..qnodes import global_parity_expval_qnode, cached_prep_qnode_fn
+from ..executors import SerialExecutor
+from .parallel_grad import parallel_grad_fn
 
 
 def mermin_klyshko_inputs_scalars(n):
@@ -58,43 +60,95 @@ def mermin_klyshko_inputs_scalars(n):
     return inputs_list, scalars_list
 
 
-def mermin_klyshko_cost_fn(ansatz, **qnode_kwargs):
+def mermin_klyshko_cost_fn(ansatz, cache_prep=False, executor=None, **qnode_kwargs):
     """Constructs an ansatz-specific cost function based upon the
     Mermin-Klyshko (MK) inequality.
 
     :param ansatz: The network ansatz for which to apply the MK inequality.
     :type ansatz: NetworkAnsatz
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per cost evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`).
+    :type cache_prep: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: Keyword arguments passed through to the qnode constructors.
 
     :returns: A cost function, ``cost(*network_settings)``, that evaluates :math:`-I_{\\text{MK}}`
               for the supplied network settings.
     :rtype: Function
     """
-    mk_qnode = global_parity_expval_qnode(ansatz, **qnode_kwargs)
-
     num_meas_nodes = len(ansatz.layers[-1])
     meas_inputs_list, scalars_list = mermin_klyshko_inputs_scalars(num_meas_nodes)
 
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in ansatz.layers[0:-1]]
+    network_inputs_list = [static_prep_inputs + [meas_inputs] for meas_inputs in meas_inputs_list]
 
-    def cost(*network_settings):
-        score = 0
+    if cache_prep:
+        mk_qnode_results = cached_prep_qnode_fn(ansatz, global_parity_expval_qnode, **qnode_kwargs)
+        mk_scalars = math.stack(scalars_list)
+    else:
+        executor = executor or SerialExecutor()
+        executor.prepare(ansatz, global_parity_expval_qnode, qnode_kwargs)
 
-        num_correlators = len(meas_inputs_list)
+    def cost(*network_settings):
+        if cache_prep:
+            return -(math.sum(mk_scalars * mk_qnode_results(network_settings, network_inputs_list)))
 
-        for i in range(num_correlators):
-            meas_inputs = meas_inputs_list[i]
-            scalar = scalars_list[i]
+        settings_list = [
+            ansatz.qnode_settings(network_settings, network_inputs)
+            for network_inputs in network_inputs_list
+        ]
+        expvals = executor.map(ansatz, global_parity_expval_qnode, settings_list, qnode_kwargs)
 
-            settings = ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
-            score += scalar * mk_qnode(settings)
+        score = 0
+        for scalar, expval in zip(scalars_list, expvals):
+            score += scalar * expval
 
         return -(score)
 
     return cost
 
 
+def parallel_mermin_klyshko_grad_fn(ansatz, natural_grad=False, executor=None, **qnode_kwargs):
+    """Constructs a parallelizeable gradient function ``grad_fn`` for the
+    Mermin-Klyshko cost (see :meth:`qnetvo.mermin_klyshko_cost_fn`).
+
+    The gradient of each correlator is evaluated by the ``executor`` and combined
+    using :meth:`qnetvo.parallel_grad_fn`.
+
+    :param ansatz: The network ansatz for which to apply the MK inequality.
+    :type ansatz: NetworkAnsatz
+
+    :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+    :type natural_grad: *optional* bool
+
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: Keyword arguments passed through to the qnode constructors.
+
+    :returns: A gradient function ``grad_fn(*network_settings)``.
+    :rtype: function
+    """
+    meas_inputs_list, scalars_list = mermin_klyshko_inputs_scalars(len(ansatz.layers[-1]))
+    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in ansatz.layers[0:-1]]
+
+    terms = [
+        (static_prep_inputs + [meas_inputs], global_parity_expval_qnode, -scalar)
+        for meas_inputs, scalar in zip(meas_inputs_list, scalars_list)
+    ]
+
+    return parallel_grad_fn(
+        ansatz, terms, natural_grad=natural_grad, executor=executor, **qnode_kwargs
+    )
+
+
 def mermin_klyshko_classical_bound(n):
     """The classical bound for the Mermin-Klyshko inequality is :math:`2^{n-1}`.
 
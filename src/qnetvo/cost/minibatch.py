@@ -0,0 +1,455 @@
+import numpy as np
+import pennylane as qml
+from autograd.tracer import getval
+from pennylane import math
+from pennylane import numpy as qnp
+from ..qnodes import joint_probs_qnode, _is_traced
+from ..information import shannon_entropy
+from ..network_ansatz import NetworkInputs
+from ..executors import SerialExecutor
+from ..postprocessing import _structured_postmap
+from .linear_inequalities import _linear_probs_input_ids, _linear_probs_active_game
+
+
+class _EstimatorStats:
+    """Tracks the minibatch estimates of a stochastic cost function and their gradients."""
+
+    def __init__(self):
+        self.clear()
+
+    def record(self, estimate, variance, num_executions, grad_variance=None):
+        self.num_evaluations += 1
+        self.num_executions += num_executions
+        self.estimate = estimate
+        self.variance = variance
+        self._variance_sum += variance
+
+        if grad_variance is not None:
+            self.num_grad_evaluations += 1
+            self.grad_variance = grad_variance
+            self._grad_variance_sum += grad_variance
+
+    def info(self):
+        return {
+            "num_evaluations": self.num_evaluations,
+            "num_executions": self.num_executions,
+            "estimate": self.estimate,
+            "variance": self.variance,
+            "mean_variance": (
+                self._variance_sum / self.num_evaluations if self.num_evaluations else None
+            ),
+            "num_grad_evaluations": self.num_grad_evaluations,
+            "grad_variance": self.grad_variance,
+            "mean_grad_variance": (
+                self._grad_variance_sum / self.num_grad_evaluations
+                if self.num_grad_evaluations
+                else None
+            ),
+        }
+
+    def clear(self):
+        self.num_evaluations = 0
+        self.num_executions = 0
+        self.estimate = None
+        self.variance = None
+        self._variance_sum = 0.0
+        self.num_grad_evaluations = 0
+        self.grad_variance = None
+        self._grad_variance_sum = 0.0
+
+
+def _minibatch_sampler(sampling_probs, batch_size, seed):
+    """Returns a function that samples ``batch_size`` ids with replacement from ``sampling_probs``
+    and returns the distinct ids, the number of times each was drawn, and their sampling probabilities.
+    The ``seed`` is either ``None`` for the global ``np.random`` state, an integer seed, or a
+    ``np.random.Generator`` that is used and advanced in place.
+    """
+    if batch_size < 1:
+        raise ValueError("The `batch_size` must be at least 1.")
+
+    if seed is None:
+        rng = np.random
+    elif isinstance(seed, np.random.Generator):
+        rng = seed
+    else:
+        rng = np.random.default_rng(seed)
+
+    def sample():
+        sample_ids = rng.choice(len(sampling_probs), size=batch_size, p=sampling_probs)
+        ids, counts = np.unique(sample_ids, return_counts=True)
+
+        return ids, counts, sampling_probs[ids]
+
+    return sample
+
+
+def _sample_variance(values, counts):
+    """Evaluates the variance of the mean of the sampled ``values`` drawn ``counts`` times each."""
+    values = np.array(math.to_numpy(getval(values)), dtype=float)
+    batch_size = np.sum(counts)
+    if batch_size < 2:
+        return 0.0
+
+    mean = np.sum(counts * values) / batch_size
+    sample_variance = np.sum(counts * (values - mean) ** 2) / (batch_size - 1)
+
+    return float(sample_variance / batch_size)
+
+
+def _sample_grad_variance(sample_values_fn, network_ansatz, network_settings, counts):
+    """Evaluates the gradient of each sampled value with respect to the network settings and
+    returns the total variance, i.e., the trace of the covariance, of the minibatch gradient.
+    The per-sample gradients are evaluated on untraced settings, hence, they require an
+    additional forward evaluation and one backward pass per distinct sample.
+    """
+    settings = network_ansatz.network_settings_array(
+        [getval(setting) for setting in network_settings]
+    )
+    settings = qnp.array(math.to_numpy(settings), dtype=float, requires_grad=True)
+
+    sample_grads = np.reshape(
+        qml.jacobian(lambda settings: sample_values_fn((settings,)))(settings),
+        (len(counts), -1),
+    )
+
+    batch_size = np.sum(counts)
+    if batch_size < 2:
+        return 0.0
+
+    mean = counts @ sample_grads / batch_size
+    sample_variance = counts @ (sample_grads - mean) ** 2 / (batch_size - 1)
+
+    return float(np.sum(sample_variance) / batch_size)
+
+
+def minibatch_linear_probs_cost_fn(
+    network_ansatz,
+    game,
+    batch_size,
+    postmap=qnp.array([]),
+    sampling="importance",
+    input_probs=None,
+    seed=None,
+    track_grad_variance=False,
+    executor=None,
+    qnode_kwargs={},
+):
+    """Constructs a stochastic estimator of the linear cost (see :meth:`qnetvo.linear_probs_cost_fn`)
+    that simulates a minibatch of sampled input combinations on each evaluation.
+
+    Each evaluation draws ``batch_size`` input combinations :math:`k` with replacement from a
+    sampling distribution :math:`q(k)` and estimates the score as
+
+    .. math::
+
+        \\widehat{\\langle\\mathbf{G},\\mathbf{P}\\rangle} = \\frac{1}{B}\\sum_{b=1}^{B}
+        \\frac{\\vec{G}_{k_b}\\cdot\\vec{P}(k_b)}{q(k_b)},
+
+    where :math:`\\vec{G}_k` and :math:`\\vec{P}(k)` are the ``game`` and behavior columns
+    of input combination :math:`k`.
+    The estimate and its gradient are unbiased, and the number of qnode executions
+    is at most ``batch_size`` regardless of the number of input combinations.
+    Hence, the cost can be optimized with :meth:`qnetvo.gradient_descent` where a new
+    minibatch is drawn on each step.
+
+    The ``sampling`` distribution is one of:
+
+    * ``"uniform"`` - Input combinations with a nonzero game column are sampled uniformly.
+    * ``"prior"`` - Input combinations are sampled from ``input_probs``.
+    * ``"importance"`` - Input combinations are sampled proportionally to the largest
+      magnitude of their game column, which bounds the magnitude of their contribution.
+
+    The statistics of the estimator are returned by ``cost.estimator_info()`` as a dictionary
+    with the number of evaluations, the number of qnode executions, and the ``"estimate"``
+    of the score and its ``"variance"`` for the latest evaluation along with the
+    ``"mean_variance"`` across all evaluations.
+    If ``track_grad_variance=True``, each differentiated evaluation also records the
+    ``"grad_variance"``, the trace of the covariance of the minibatch gradient, and the
+    ``"mean_grad_variance"`` is averaged over the ``"num_grad_evaluations"``.
+    The statistics are reset with ``cost.estimator_clear()``.
+
+    The minibatches are drawn from the global ``np.random`` state unless a ``seed`` is given.
+    Hence, by default, the sampler state is saved and restored by the checkpoints of
+    :meth:`qnetvo.gradient_descent`. Alternatively, a ``np.random.Generator`` can be passed as
+    the ``seed`` and its ``bit_generator.state`` persisted by the caller.
+
+    :param network_ansatz: The network to which the cost function is applied.
+    :type network_ansatz: ``NetworkAnsatz`` class
+
+    :param game: A matrix with dimensions ``A x (\\prod_i X_i)``.
+    :type game: np.array or scipy.sparse matrix
+
+    :param batch_size: The number of input combinations sampled on each evaluation.
+    :type batch_size: int
+
+    :param postmap: A post-processing map applied to the bitstrings output from the
+                     quantum circuit.
+    :type postmap: *optional* np.ndarray or CoarseGrainingPostmap
+
+    :param sampling: The sampling distribution, ``"uniform"``, ``"prior"``, or ``"importance"``.
+                     Default ``"importance"``.
+    :type sampling: *optional* str
+
+    :param input_probs: The probability of each input combination used by ``"prior"`` sampling,
+                        e.g., ``np.kron`` of the input priors of each node.
+    :type input_probs: *optional* np.array
+
+    :param seed: A seed for the minibatch sampler or a ``np.random.Generator`` that is advanced
+                 in place. By default, ``np.random`` is used.
+    :type seed: *optional* int or np.random.Generator
+
+    :param track_grad_variance: If ``True``, the variance of the minibatch gradient is recorded
+                                whenever the cost is differentiated. The per-sample gradients
+                                require an additional forward evaluation and one backward pass per
+                                distinct sample. Default ``False``.
+    :type track_grad_variance: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: Keyword arguments passed to the qnode constructor.
+    :type qnode_kwargs: *optional* dict
+
+    :returns: A cost function evaluated as ``cost(*network_settings)``.
+    :rtype: function
+
+    :raises ValueError: If the ``game`` or ``postmap`` dimensions do not match the
+        ``network_ansatz``, the ``batch_size`` is less than one, the ``sampling`` is unknown,
+        the ``game`` is zero, or the ``input_probs`` do not cover each input combination
+        with a nonzero game column.
+    """
+    if executor is None:
+        executor = SerialExecutor()
+
+    executor.prepare(network_ansatz, joint_probs_qnode, qnode_kwargs)
+
+    postmap = _structured_postmap(postmap)
+    node_input_ids = _linear_probs_input_ids(network_ansatz, game, postmap)
+    has_postmap = len(postmap) != 0
+
+    active_ids, game = _linear_probs_active_game(game, postmap)
+    raw_game = postmap.T @ game if has_postmap else game
+
+    if len(active_ids) == 0:
+        raise ValueError("The `game` must have a nonzero column.")
+
+    if sampling == "uniform":
+        sampling_probs = np.ones(len(active_ids))
+    elif sampling == "importance":
+        sampling_probs = np.max(np.abs(raw_game), axis=0)
+    elif sampling == "prior":
+        if input_probs is None or len(input_probs) != len(node_input_ids):
+            raise ValueError(
+                "The `input_probs` must have " + str(len(node_input_ids)) + " elements."
+            )
+
+        sampling_probs = np.array(input_probs, dtype=float)[active_ids]
+        if np.any(sampling_probs <= 0):
+            raise ValueError(
+                "The `input_probs` must be nonzero for each input with a nonzero game column."
+            )
+    else:
+        raise ValueError(
+            "The `sampling` must be either 'uniform', 'prior', or 'importance', not "
+            + str(sampling)
+            + "."
+        )
+
+    sampling_probs = sampling_probs / np.sum(sampling_probs)
+    sample = _minibatch_sampler(sampling_probs, batch_size, seed)
+    stats = _EstimatorStats()
+
+    def sample_scores_fn(network_settings, ids, probs):
+        settings_list = [
+            network_ansatz.qnode_settings(network_settings, node_input_ids[active_ids[i]])
+            for i in ids
+        ]
+        probs_vecs = executor.map(network_ansatz, joint_probs_qnode, settings_list, qnode_kwargs)
+
+        return math.stack(
+            [
+                math.sum(game[:, i] * (postmap @ raw_probs if has_postmap else raw_probs)) / q
+                for i, q, raw_probs in zip(ids, probs, probs_vecs)
+            ]
+        )
+
+    def cost(*network_settings):
+        ids, counts, probs = sample()
+
+        # each distinct sample is executed once and weighted by the number of times it was drawn
+        sample_scores = sample_scores_fn(network_settings, ids, probs)
+        score = math.sum(sample_scores * counts) / batch_size
+
+        grad_variance = None
+        if track_grad_variance and _is_traced(network_settings):
+            grad_variance = _sample_grad_variance(
+                lambda settings: sample_scores_fn(settings, ids, probs),
+                network_ansatz,
+                network_settings,
+                counts,
+            )
+
+        stats.record(
+            float(math.to_numpy(getval(score))),
+            _sample_variance(sample_scores, counts),
+            len(ids),
+            grad_variance,
+        )
+
+        return -(score)
+
+    cost.estimator_info = stats.info
+    cost.estimator_clear = stats.clear
+
+    return cost
+
+
+def minibatch_mutual_info_cost_fn(
+    ansatz,
+    priors,
+    batch_size,
+    postmap=qnp.array([]),
+    sampling="prior",
+    seed=None,
+    track_grad_variance=False,
+    executor=None,
+    **qnode_kwargs,
+):
+    """Constructs a stochastic estimator of the mutual information cost
+    (see :meth:`qnetvo.mutual_info_cost_fn`) that simulates a minibatch of sampled input
+    combinations on each evaluation.
+
+    Each evaluation draws ``batch_size`` input combinations :math:`x` with replacement from a
+    sampling distribution :math:`q(x)`.
+    The joint entropy :math:`H(XY) = \\sum_x H(P(Y|x)P(x))` is a sum over inputs and is
+    estimated without bias as :math:`\\frac{1}{B}\\sum_{b} H(P(Y|x_b)P(x_b))/q(x_b)`.
+    The output entropy :math:`H(Y)` is evaluated on the self-normalized estimate of
+    :math:`P(Y) = \\sum_x P(Y|x)P(x)`, which is consistent, but biased for small minibatches
+    because the entropy is nonlinear.
+
+    The ``sampling`` distribution is one of:
+
+    * ``"prior"`` - Inputs are sampled from the input ``priors``, hence, :math:`P(Y)` is the
+      average of the sampled behavior columns.
+    * ``"uniform"`` - Inputs are sampled uniformly.
+
+    The statistics of the joint entropy estimator, including the variance of its gradient if
+    ``track_grad_variance=True``, are returned by ``cost.estimator_info()`` and reset with
+    ``cost.estimator_clear()``.
+    The sampler state is handled as described in :meth:`qnetvo.minibatch_linear_probs_cost_fn`.
+
+    :param ansatz: The ansatz circuit on which the mutual information is evaluated.
+    :type ansatz: NetworkAnsatz
+
+    :param priors: A list of prior distributions for the inputs of each preparation node.
+    :type priors: list[np.array]
+
+    :param batch_size: The number of input combinations sampled on each evaluation.
+    :type batch_size: int
+
+    :param postmap: The post-processing matrix mapping the bitstring output from the
+                    quantum device into the measurement node outputs.
+    :type postmap: *optional* np.array or CoarseGrainingPostmap
+
+    :param sampling: The sampling distribution, ``"prior"`` or ``"uniform"``. Default ``"prior"``.
+    :type sampling: *optional* str
+
+    :param seed: A seed for the minibatch sampler or a ``np.random.Generator`` that is advanced
+                 in place. By default, ``np.random`` is used.
+    :type seed: *optional* int or np.random.Generator
+
+    :param track_grad_variance: If ``True``, the variance of the gradient of the joint entropy
+                                estimate is recorded whenever the cost is differentiated.
+                                Default ``False``.
+    :type track_grad_variance: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: Keyword arguments passed to the execute qnodes.
+    :type qnode_kwargs: dictionary
+
+    :returns: A cost function ``mutual_info_cost(*network_settings)`` parameterized by
+              the ansatz-specific scenario settings.
+    :rtype: Function
+
+    :raises ValueError: If the ``batch_size`` is less than one or the ``sampling`` is unknown.
+    """
+    node_input_ids = NetworkInputs(ansatz)
+
+    postmap = _structured_postmap(postmap)
+    has_postmap = len(postmap) != 0
+
+    px_vec = 1
+    for i in range(len(priors)):
+        px_vec = qnp.kron(px_vec, priors[i])
+
+    Hx = shannon_entropy(px_vec)
+
+    if sampling == "prior":
+        sampling_probs = np.array(px_vec, dtype=float)
+    elif sampling == "uniform":
+        sampling_probs = np.ones(len(node_input_ids))
+    else:
+        raise ValueError(
+            "The `sampling` must be either 'prior' or 'uniform', not " + str(sampling) + "."
+        )
+
+    sampling_probs = sampling_probs / np.sum(sampling_probs)
+    sample = _minibatch_sampler(sampling_probs, batch_size, seed)
+    stats = _EstimatorStats()
+
+    if executor is None:
+        executor = SerialExecutor()
+
+    executor.prepare(ansatz, joint_probs_qnode, qnode_kwargs)
+
+    def sample_p_nets(network_settings, ids):
+        settings_list = [ansatz.qnode_settings(network_settings, node_input_ids[i]) for i in ids]
+        probs_vecs = executor.map(ansatz, joint_probs_qnode, settings_list, qnode_kwargs)
+
+        return [postmap @ probs_vec if has_postmap else probs_vec for probs_vec in probs_vecs]
+
+    def sample_Hxy_fn(p_nets, ids, probs):
+        return math.stack(
+            [shannon_entropy(p_net * px_vec[i]) / q for i, q, p_net in zip(ids, probs, p_nets)]
+        )
+
+    def cost(*network_settings):
+        ids, counts, probs = sample()
+
+        p_nets = sample_p_nets(network_settings, ids)
+        weights = counts / (batch_size * probs)
+
+        sample_Hxy = sample_Hxy_fn(p_nets, ids, probs)
+        Hxy = math.sum(sample_Hxy * counts) / batch_size
+
+        py_vec = math.sum(
+            math.stack([w * px_vec[i] * p_net for i, w, p_net in zip(ids, weights, p_nets)]), axis=0
+        )
+        Hy = shannon_entropy(py_vec / math.sum(py_vec))
+
+        grad_variance = None
+        if track_grad_variance and _is_traced(network_settings):
+            grad_variance = _sample_grad_variance(
+                lambda settings: sample_Hxy_fn(sample_p_nets(settings, ids), ids, probs),
+                ansatz,
+                network_settings,
+                counts,
+            )
+
+        stats.record(
+            float(math.to_numpy(getval(Hxy))),
+            _sample_variance(sample_Hxy, counts),
+            len(ids),
+            grad_variance,
+        )
+
+        return -(Hx + Hy - Hxy)
+
+    cost.estimator_info = stats.info
+    cost.estimator_clear = stats.clear
+
+    return cost
@@ -3,10 +3,20 @@ from pennylane import math
 from pennylane import numpy as np
 from ..qnodes import joint_probs_qnode
 from ..information import shannon_entropy
-from ..utilities import mixed_base_num, ragged_reshape
-
-
-def mutual_info_cost_fn(ansatz, priors, postmap=np.array([]), **qnode_kwargs):
+from ..network_ansatz import NetworkInputs
+from ..executors import SerialExecutor
+from ..postprocessing import _structured_postmap
+
+
+def mutual_info_cost_fn(
+    ansatz,
+    priors,
+    postmap=np.array([]),
+    broadcast=False,
+    executor=None,
+    chunk_size=1024,
+    **qnode_kwargs
+):
     """Constructs an ansatz-specific mutual information cost function.
 
     The mutual information quantifies the information shared by two distributions
@@ -33,7 +43,22 @@ def mutual_info_cost_fn(ansatz, priors, postmap=np.array([]), **qnode_kwargs):
 
     :param postmap: The post-processing matrix mapping the bitstring output from the
                     quantum device into the measurement node outputs.
-    :type postmap: np.array
+                    Deterministic postmaps are applied as a :class:`qnetvo.CoarseGrainingPostmap`
+                    and, by default, no postmap is applied.
+    :type postmap: np.array or CoarseGrainingPostmap
+
+    :param broadcast: If ``True``, all input combinations are evaluated in one qnode execution
+                      using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      Default ``False``.
+    :type broadcast: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param chunk_size: The maximum number of input combinations submitted to the ``executor``
+                       at a time (see :meth:`qnetvo.NetworkInputs.chunks`). Default ``1024``.
+    :type chunk_size: *optional* int
 
     :param qnode_kwargs: Keyword arguments passed to the execute qnodes.
     :type qnode_kwargs: dictionary
@@ -43,17 +68,13 @@ def mutual_info_cost_fn(ansatz, priors, postmap=np.array([]), **qnode_kwargs):
     :rtype: Function
     """
 
-    net_num_in = math.prod(ansatz.layers_total_num_in)
-    num_inputs_list = math.concatenate(ansatz.layers_node_num_in).tolist()
-    node_input_ids = [
-        ragged_reshape(mixed_base_num(i, num_inputs_list), ansatz.layers_num_nodes)
-        for i in range(net_num_in)
-    ]
+    node_input_ids = NetworkInputs(ansatz)
+    net_num_in = len(node_input_ids)
 
     net_num_out = math.prod([meas_node.num_out for meas_node in ansatz.layers[-1]])
 
-    if len(postmap) == 0:
-        postmap = np.eye(2 ** len(ansatz.layers_wires[-1]))
+    postmap = _structured_postmap(postmap)
+    has_postmap = len(postmap) != 0
 
     px_vec = 1
     for i in range(len(priors)):
@@ -61,17 +82,43 @@ def mutual_info_cost_fn(ansatz, priors, postmap=np.array([]), **qnode_kwargs):
 
     Hx = shannon_entropy(px_vec)
 
-    probs_qnode = joint_probs_qnode(ansatz, **qnode_kwargs)
+    if executor is None:
+        executor = SerialExecutor()
+
+    executor.prepare(ansatz, joint_probs_qnode, qnode_kwargs)
 
     def cost(*network_settings):
+        if broadcast:
+            settings = ansatz.broadcast_qnode_settings(network_settings, node_input_ids)
+            probs_vec = executor.map(ansatz, joint_probs_qnode, [settings], qnode_kwargs)[0]
+            p_net = math.transpose(probs_vec)
+            p_net = postmap @ p_net if has_postmap else p_net
+
+            Hxy = math.sum(
+                math.stack([shannon_entropy(p_net[:, i] * px_vec[i]) for i in range(net_num_in)])
+            )
+            Hy = shannon_entropy(p_net @ px_vec)
+
+            return -(Hx + Hy - Hxy)
+
+        # input combinations are streamed in chunks to bound the memory of the settings
         Hxy = 0
         py_vec = np.zeros(net_num_out)
-        for i, input_id_set in enumerate(node_input_ids):
-            settings = ansatz.qnode_settings(network_settings, input_id_set)
-            p_net = postmap @ probs_qnode(settings)
+        start = 0
+        for inputs_chunk in node_input_ids.chunks(chunk_size):
+            settings_list = [
+                ansatz.qnode_settings(network_settings, input_id_set)
+                for input_id_set in inputs_chunk
+            ]
+            probs_vecs = executor.map(ansatz, joint_probs_qnode, settings_list, qnode_kwargs)
+
+            for i, probs_vec in enumerate(probs_vecs, start=start):
+                p_net = postmap @ probs_vec if has_postmap else probs_vec
 
-            Hxy += shannon_entropy(p_net * px_vec[i])
-            py_vec += p_net * px_vec[i]
+                Hxy += shannon_entropy(p_net * px_vec[i])
+                py_vec += p_net * px_vec[i]
+
+            start += len(inputs_chunk)
 
         Hy = shannon_entropy(py_vec)
 
@@ -82,7 +129,7 @@ def mutual_info_cost_fn(ansatz, priors, postmap=np.array([]), **qnode_kwargs):
     return cost
 
 
-def shannon_entropy_cost_fn(ansatz, **qnode_kwargs):
+def shannon_entropy_cost_fn(ansatz, executor=None, **qnode_kwargs):
     """Constructs an ansatz-specific Shannon entropy cost function
 
     The Shannon entropy characterizes the amount of randomness, or similarly, the amount of
@@ -99,6 +146,10 @@ def shannon_entropy_cost_fn(ansatz, **qnode_kwargs):
     :param ansatz: The ansatz circuit on which the Shannon entropy is evalutated.
     :type ansatz: NetworkAnsatz
 
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: Keyword arguments passed to the execute qnodes.
     :type qnode_kwargs: dictionary
 
@@ -107,11 +158,14 @@ def shannon_entropy_cost_fn(ansatz, **qnode_kwargs):
     :rtype: Function
     """
     static_inputs = [[0] * num_nodes for num_nodes in ansatz.layers_num_nodes]
-    probs_qnode = joint_probs_qnode(ansatz, **qnode_kwargs)
+    if executor is None:
+        executor = SerialExecutor()
+
+    executor.prepare(ansatz, joint_probs_qnode, qnode_kwargs)
 
     def cost(*network_settings):
         settings = ansatz.qnode_settings(network_settings, static_inputs)
-        probs_vec = probs_qnode(settings)
+        probs_vec = executor.map(ansatz, joint_probs_qnode, [settings], qnode_kwargs)[0]
 
         return shannon_entropy(probs_vec)
 
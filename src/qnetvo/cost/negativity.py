@@ -3,9 +3,10 @@ from pennylane import math
 import numpy as np
 from ..qnodes import density_matrix_qnode
 from ..utilities import partial_transpose
+from ..executors import SerialExecutor
 
 
-def negativity_cost_fn(network_ansatz, m, n, wires, qnode_kwargs={}):
+def negativity_cost_fn(network_ansatz, m, n, wires, qnode_kwargs={}, executor=None):
     """Constructs an ansatz-specific negativity cost function.
 
     Negativity can be used to identify if two subsystems :math:`A` and :math:`B` are
@@ -38,6 +39,10 @@ def negativity_cost_fn(network_ansatz, m, n, wires, qnode_kwargs={}):
     :param qnode_kwargs: Keyword arguments passed to the execute qnodes.
     :type qnode_kwargs: dictionary
 
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
     :returns: A cost function ``negativity_cost(*network_settings)`` parameterized by
               the ansatz-specific scenario settings.
     :rtype: Function
@@ -48,10 +53,15 @@ def negativity_cost_fn(network_ansatz, m, n, wires, qnode_kwargs={}):
     if len(wires) != m + n:
         raise ValueError(f"Sum of sizes of two subsystems should be {len(wires)}; got {m+n}.")
 
-    density_qnode = density_matrix_qnode(network_ansatz, wires, **qnode_kwargs)
+    if executor is None:
+        executor = SerialExecutor()
+
+    density_qnode_kwargs = {"wires": wires, **qnode_kwargs}
+    executor.prepare(network_ansatz, density_matrix_qnode, density_qnode_kwargs)
 
     def negativity_cost(*network_settings):
-        dm = density_qnode(network_settings)
+        settings = network_ansatz.network_settings_array(network_settings)
+        dm = executor.map(network_ansatz, density_matrix_qnode, [settings], density_qnode_kwargs)[0]
         dm_pt = partial_transpose(dm, 2**m, 2**n)
         eigenvalues = math.eigvalsh(dm_pt)
         negativity = np.sum(np.abs(eigenvalues[eigenvalues < 0]))
@@ -1,125 +1,199 @@
-import pennylane as qml
 from pennylane import math
-from ..qnodes import global_parity_expval_qnode
-from scipy.linalg import pinvh
+from ..qnodes import global_parity_expval_qnode, cached_prep_qnode_fn
+from ..executors import SerialExecutor, _default_thread_executor
+from .parallel_grad import parallel_grad_fn
+from .correlator_cost import correlator_cost_fn
 
 
-def chain_I22_fn(network_ansatz, parallel=False, **qnode_kwargs):
+def chain_I22_fn(network_ansatz, parallel=False, cache_prep=False, executor=None, **qnode_kwargs):
     """Constructs a function for evaluating the :math:`I_{22}` quantity used in the ``nlocal_chain_22_cost_fn`` function.
 
     :param network_ansatz: The ansatz for the :math:`n`-local chain network.
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True``, remote qnode executions are made in parallel web requests.
+    :param parallel: If ``True``, remote qnode executions are made in parallel web requests
+                     using a :class:`qnetvo.ThreadExecutor` with four threads.
     :type parallel: *optional* bool, default ``False``
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with ``parallel``
+                       or an ``executor``.
+    :type cache_prep: *optional* bool, default ``False``
+
+    :param executor: The executor through which all qnodes are evaluated (see :class:`qnetvo.Executor`).
+    :type executor: *optional* Executor, default ``None``
+
     :param qnode_kwargs: keyword args to be passed to constructed QNodes.
     :type: *optional* dictionary
 
     :returns: A function callable as ``I22(*network_settings)`` that evaluates the :math:`I_{22}` quantity.
     :rtype: function
+
+    :raises ValueError: If ``cache_prep`` is combined with ``parallel`` or an ``executor``.
     """
 
     xy_vals = [[0, 0], [0, 1], [1, 0], [1, 1]]
 
-    if parallel:
-        from ..lazy_dask_import import dask
+    if cache_prep and (parallel or executor is not None):
+        raise ValueError(
+            "The `cache_prep` option cannot be combined with `parallel` or an `executor`."
+        )
 
-        chain_qnodes = [
-            global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(4)
-        ]
+    if executor is None:
+        executor = _default_thread_executor() if parallel else SerialExecutor()
+
+    if cache_prep:
+        chain_qnode_results = cached_prep_qnode_fn(
+            network_ansatz, global_parity_expval_qnode, **qnode_kwargs
+        )
     else:
-        chain_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
+        executor.prepare(network_ansatz, global_parity_expval_qnode, qnode_kwargs)
 
     num_interior_nodes = len(network_ansatz.layers[-1]) - 2
 
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
     I22_xy_inputs = [[x_a] + [0 for i in range(num_interior_nodes)] + [x_b] for x_a, x_b in xy_vals]
 
+    I22_network_inputs = [static_prep_inputs + [meas_inputs] for meas_inputs in I22_xy_inputs]
+
     def I22(*network_settings):
+        if cache_prep:
+            return math.sum(chain_qnode_results(network_settings, I22_network_inputs))
+
         I22_xy_settings = [
             network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
             for meas_inputs in I22_xy_inputs
         ]
 
-        if parallel:
-            I22_delayed_results = [
-                dask.delayed(chain_qnodes[i])(settings)
-                for i, settings in enumerate(I22_xy_settings)
-            ]
-
-            I22_results = math.stack(dask.compute(*I22_delayed_results, scheduler="threads"))
-        else:
-            I22_results = math.stack([chain_qnode(settings) for settings in I22_xy_settings])
+        I22_results = math.stack(
+            executor.map(network_ansatz, global_parity_expval_qnode, I22_xy_settings, qnode_kwargs)
+        )
 
         return math.sum(I22_results)
 
     return I22
 
 
-def chain_J22_fn(network_ansatz, parallel=False, **qnode_kwargs):
+def chain_J22_fn(network_ansatz, parallel=False, cache_prep=False, executor=None, **qnode_kwargs):
     """Constructs a function for evaluating the :math:`J_{22}` quantity used in the ``nlocal_chain_22_cost_fn`` function.
 
     :param network_ansatz: The ansatz for the :math:`n`-local chain network.
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True``, remote qnode executions are made in parallel web requests.
+    :param parallel: If ``True``, remote qnode executions are made in parallel web requests
+                     using a :class:`qnetvo.ThreadExecutor` with four threads.
     :type parallel: *optional* bool, default ``False``
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with ``parallel``
+                       or an ``executor``.
+    :type cache_prep: *optional* bool, default ``False``
+
+    :param executor: The executor through which all qnodes are evaluated (see :class:`qnetvo.Executor`).
+    :type executor: *optional* Executor, default ``None``
+
     :param qnode_kwargs: keyword args to be passed to constructed QNodes.
     :type: *optional* dictionary
 
     :returns: A function callable as ``J22(*network_settings)`` that evaluates the :math:`J_{22}` quantity.
     :rtype: function
+
+    :raises ValueError: If ``cache_prep`` is combined with ``parallel`` or an ``executor``.
     """
 
     xy_vals = [[0, 0], [0, 1], [1, 0], [1, 1]]
 
-    if parallel:
-        from ..lazy_dask_import import dask
+    if cache_prep and (parallel or executor is not None):
+        raise ValueError(
+            "The `cache_prep` option cannot be combined with `parallel` or an `executor`."
+        )
 
-        chain_qnodes = [
-            global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(4)
-        ]
+    if executor is None:
+        executor = _default_thread_executor() if parallel else SerialExecutor()
+
+    if cache_prep:
+        chain_qnode_results = cached_prep_qnode_fn(
+            network_ansatz, global_parity_expval_qnode, **qnode_kwargs
+        )
     else:
-        chain_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
+        executor.prepare(network_ansatz, global_parity_expval_qnode, qnode_kwargs)
 
     num_interior_nodes = len(network_ansatz.layers[-1]) - 2
     static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
 
     J22_xy_inputs = [[x_a] + [1 for i in range(num_interior_nodes)] + [x_b] for x_a, x_b in xy_vals]
 
+    J22_network_inputs = [static_prep_inputs + [meas_inputs] for meas_inputs in J22_xy_inputs]
+
     def J22(*network_settings):
+        if cache_prep:
+            J22_results = chain_qnode_results(network_settings, J22_network_inputs)
+            return math.sum(math.stack([1, -1, -1, 1]) * J22_results)
+
         J22_xy_settings = [
             network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
             for meas_inputs in J22_xy_inputs
         ]
 
-        if parallel:
-            J22_delayed_results = [
-                dask.delayed(chain_qnodes[i])(settings)
-                for i, settings in enumerate(J22_xy_settings)
-            ]
-
-            J22_results = math.stack(dask.compute(*J22_delayed_results, scheduler="threads"))
-        else:
-            J22_results = math.stack([chain_qnode(settings) for settings in J22_xy_settings])
+        J22_results = math.stack(
+            executor.map(network_ansatz, global_parity_expval_qnode, J22_xy_settings, qnode_kwargs)
+        )
 
         return math.sum(math.stack([1, -1, -1, 1]) * J22_results)
 
     return J22
 
 
-def nlocal_chain_22_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
+def _chain_22_terms(network_ansatz):
+    """The ``(network_inputs, coeff)`` correlator terms of :math:`I_{22}` followed by
+    :math:`J_{22}` for the :math:`n`-local chain network."""
+    xy_vals = [[0, 0], [0, 1], [1, 0], [1, 1]]
+    n = len(network_ansatz.layers[0])
+
+    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
+
+    I22_terms = [(static_prep_inputs + [[x] + [0] * (n - 1) + [y]], 1) for x, y in xy_vals]
+    J22_terms = [
+        (static_prep_inputs + [[x] + [1] * (n - 1) + [y]], (-1) ** (x + y)) for x, y in xy_vals
+    ]
+
+    return I22_terms + J22_terms
+
+
+def _chain_22_outer_fn(term_values):
+    I22_score = math.sum(term_values[0:4])
+    J22_score = math.sum(term_values[4:8])
+
+    return -(math.sqrt(math.abs(I22_score) / 4) + math.sqrt(math.abs(J22_score) / 4))
+
+
+def nlocal_chain_22_cost_fn(
+    network_ansatz, parallel=False, cache_prep=False, executor=None, **qnode_kwargs
+):
     """For the provided ``network_ansatz``, constructs the cost function for the
     :math:`n`-local chain Bell inequality for binary inputs and outputs.
 
     :param network_ansatz: The ansatz for the networks. 
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True``, remote qnode executions are made in parallel web requests.
+    :param parallel: If ``True``, remote qnode executions are made in parallel web requests
+                     using a :class:`qnetvo.ThreadExecutor` with four threads.
     :type parallel: *optional* bool
 
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with ``parallel``
+                       or an ``executor``.
+    :type cache_prep: *optional* bool
+
+    :param executor: The executor through which all qnodes are evaluated (see :class:`qnetvo.Executor`).
+    :type executor: *optional* Executor
+
     .. math::
 
        Cost(\\vec{\\theta}) = - \\left(\\sqrt{|I_{22}^n|} + \\sqrt{|J_{22}^n|} \\right)/2
@@ -147,13 +221,36 @@ def nlocal_chain_22_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
     The maximal score for the dichotomic :math:`n` -local Bell inequality is known to be
     :math:`\\sqrt{2} \\approx 1.414 213`.
 
+    Unless ``cache_prep`` is used, the correlators of both quantities are compiled with
+    :meth:`qnetvo.correlator_cost_fn` and evaluated in a single batch of executions.
+
     :returns: A cost function that can be evaluated as ``cost(*network_settings)`` where
               ``network_settings`` have the appropriate dimensions for the provided ``network_ansatz``
     :rtype: Function
+
+    :raises ValueError: If ``cache_prep`` is combined with ``parallel`` or an ``executor``.
     """
 
-    I22 = chain_I22_fn(network_ansatz, parallel=parallel, **qnode_kwargs)
-    J22 = chain_J22_fn(network_ansatz, parallel=parallel, **qnode_kwargs)
+    if cache_prep and (parallel or executor is not None):
+        raise ValueError(
+            "The `cache_prep` option cannot be combined with `parallel` or an `executor`."
+        )
+
+    if not cache_prep:
+        # the I22 and J22 correlators are compiled into a single batch of executions
+        if executor is None:
+            executor = _default_thread_executor() if parallel else SerialExecutor()
+
+        return correlator_cost_fn(
+            network_ansatz,
+            _chain_22_terms(network_ansatz),
+            outer_fn=_chain_22_outer_fn,
+            executor=executor,
+            **qnode_kwargs,
+        )
+
+    I22 = chain_I22_fn(network_ansatz, cache_prep=cache_prep, **qnode_kwargs)
+    J22 = chain_J22_fn(network_ansatz, cache_prep=cache_prep, **qnode_kwargs)
 
     def cost(*network_settings):
         I22_score = I22(*network_settings)
@@ -164,12 +261,15 @@ def nlocal_chain_22_cost_fn(network_ansatz, parallel=False, **qnode_kwargs):
     return cost
 
 
-def parallel_nlocal_chain_grad_fn(network_ansatz, natural_grad=False, **qnode_kwargs):
+def parallel_nlocal_chain_grad_fn(
+    network_ansatz, natural_grad=False, executor=None, **qnode_kwargs
+):
     """Constructs a parallelizeable gradient function ``grad_fn`` for the :math:`n`-local
     chain cost.
 
-    The parallelization is achieved through multithreading and intended to improve the
-    efficiency of remote qnode execution.
+    The gradient of each correlator is evaluated by the ``executor`` (see :meth:`qnetvo.parallel_grad_fn`).
+    By default, a :class:`qnetvo.ThreadExecutor` is used to improve the efficiency of remote
+    qnode execution.
     The number of threads is restricted to four in order to be compatible with IBM's API.
 
     :param network_ansatz: The ansatz describing the :math:`n`-local chain network.
@@ -179,6 +279,10 @@ def parallel_nlocal_chain_grad_fn(network_ansatz, natural_grad=False, **qnode_kw
                          gradient by the inverse of the metric tensor.
     :type natural_grad: *optional* Bool
 
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: A keyword argument passthrough to qnode construction.
     :type qnode_kwargs: *optional* dict
 
@@ -190,76 +294,16 @@ def parallel_nlocal_chain_grad_fn(network_ansatz, natural_grad=False, **qnode_kw
 
     """
 
-    from ..lazy_dask_import import dask
-
-    xy_vals = [[0, 0], [0, 1], [1, 0], [1, 1]]
-    n = len(network_ansatz.layers[0])
-
-    chain_qnodes = [global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(4)]
-
-    I22 = chain_I22_fn(network_ansatz, parallel=True, **qnode_kwargs)
-    J22 = chain_J22_fn(network_ansatz, parallel=True, **qnode_kwargs)
-
-    I22_xy_meas_inputs = [[x] + [0 for i in range(n - 1)] + [y] for x, y in xy_vals]
-    J22_xy_meas_inputs = [[x] + [1 for i in range(n - 1)] + [y] for x, y in xy_vals]
-
-    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
-
-    def _grad_fn(settings, qnode):
-        return qml.grad(qnode)(settings)
-
-    def _nat_grad_fn(settings, qnode):
-        ginv = pinvh(qml.metric_tensor(qnode, approx="block-diag")(settings))
-        return ginv @ _grad_fn(settings, qnode)
-
-    grad_fn = _nat_grad_fn if natural_grad else _grad_fn
-
-    def nlocal_chain_grad_fn(*network_settings):
-        I22_score = I22(*network_settings)
-        J22_score = J22(*network_settings)
-
-        I22_xy_settings = [
-            network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
-            for meas_inputs in I22_xy_meas_inputs
-        ]
-        J22_xy_settings = [
-            network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
-            for meas_inputs in J22_xy_meas_inputs
-        ]
-
-        I22_delayed_grads = [
-            dask.delayed(grad_fn)(settings, chain_qnodes[i])
-            for i, settings in enumerate(I22_xy_settings)
-        ]
-        J22_delayed_grads = [
-            dask.delayed(grad_fn)(settings, chain_qnodes[i])
-            for i, settings in enumerate(J22_xy_settings)
-        ]
-
-        I22_grads = dask.compute(*I22_delayed_grads, scheduler="threads")
-        J22_grads = dask.compute(*J22_delayed_grads, scheduler="threads")
-
-        settings_grad = network_ansatz.zero_network_settings()
-
-        I22_scalar = -(1 / 4) * math.sign(I22_score) / math.sqrt(math.abs(I22_score))
-        J22_scalar = -(1 / 4) * math.sign(J22_score) / math.sqrt(math.abs(J22_score))
-
-        for i in range(4):
-            x = I22_xy_meas_inputs[i][0]
-            y = I22_xy_meas_inputs[i][-1]
-            J22_sign = (-1) ** (x + y)
-
-            settings_grad += I22_scalar * network_ansatz.expand_qnode_settings(
-                I22_grads[i], [[0] * n, I22_xy_meas_inputs[i]]
-            )
-            settings_grad += (
-                J22_sign
-                * J22_scalar
-                * network_ansatz.expand_qnode_settings(
-                    J22_grads[i], [[0] * n, J22_xy_meas_inputs[i]]
-                )
-            )
-
-        return settings_grad
-
-    return nlocal_chain_grad_fn
+    terms = [
+        (network_inputs, global_parity_expval_qnode, coeff)
+        for network_inputs, coeff in _chain_22_terms(network_ansatz)
+    ]
+
+    return parallel_grad_fn(
+        network_ansatz,
+        terms,
+        outer_fn=_chain_22_outer_fn,
+        natural_grad=natural_grad,
+        executor=executor,
+        **qnode_kwargs,
+    )
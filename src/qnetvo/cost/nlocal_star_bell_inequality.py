@@ -1,11 +1,20 @@
-import pennylane as qml
 from pennylane import math
 from pennylane import numpy as np
-from ..qnodes import global_parity_expval_qnode
-from scipy.linalg import pinvh
-
-
-def star_I22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
+from ..qnodes import global_parity_expval_qnode, cached_prep_qnode_fn
+from ..executors import SerialExecutor, _default_thread_executor
+from .parallel_grad import parallel_grad_fn
+from .correlator_cost import correlator_cost_fn
+
+
+def star_I22_fn(
+    network_ansatz,
+    parallel=False,
+    nthreads=4,
+    broadcast=False,
+    cache_prep=False,
+    executor=None,
+    **qnode_kwargs,
+):
     """Constructs a network-specific ``I22(network_settings)`` function that
     evaluates the :math:`I_{22,n}` quantity for the :math:`n`-local star network.
 
@@ -21,19 +30,40 @@ def star_I22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
     :param network_ansatz: The :math:`n`-local star network ansatz.
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True`` qnodes will be evaluated in separate threads. This is
-                     valuable for execution on remote simulator and hardware devices.
-                     Default value: ``False``.
+    :param parallel: If ``True`` qnodes will be evaluated in separate threads by a
+                     :class:`qnetvo.ThreadExecutor`. This is valuable for execution on remote
+                     simulator and hardware devices. Default value: ``False``.
     :type parallel: *optional* Bool
 
     :param nthreads: Specifies the number of threads used when ``parallel=True``.
     :type nthreads: Int
 
+    :param broadcast: If ``True``, the :math:`2^n` correlators are evaluated in one qnode
+                      execution using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      The broadcasted correlators form a single execution, so neither ``broadcast``
+                      nor ``cache_prep`` can be combined with ``parallel``. Default value: ``False``.
+    :type broadcast: *optional* Bool
+
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with an ``executor``.
+                       Default value: ``False``.
+    :type cache_prep: *optional* Bool
+
+    :param executor: If provided, all qnodes are evaluated through the executor
+                     (see :class:`qnetvo.Executor`) and ``parallel`` and ``nthreads`` are ignored.
+                     Default value: ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: keyword args passed through to the QNode constructor.
     :type qnode_kwargs: *optional* dictionary
 
     :returns: A function callable as ``I22(*network_settings)`` that evaluates the :math:`I_{22,n}` quantity.
     :rtype: function
+
+    :raises ValueError: If ``broadcast`` or ``cache_prep`` is combined with ``parallel``, or if
+                        ``cache_prep`` is combined with an ``executor``.
     """
     n = len(network_ansatz.layers[0])
 
@@ -43,45 +73,56 @@ def star_I22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
         for x in range(2**n)
     ]
 
-    if parallel:
-        from ..lazy_dask_import import dask
+    if parallel and (broadcast or cache_prep):
+        raise ValueError(
+            "The `broadcast` and `cache_prep` options cannot be combined with `parallel`."
+        )
+    if cache_prep and executor is not None:
+        raise ValueError("The `cache_prep` option cannot be combined with an `executor`.")
+
+    if executor is None:
+        executor = _default_thread_executor(nthreads) if parallel else SerialExecutor()
 
-        star_qnodes = [
-            global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(nthreads)
-        ]
+    if cache_prep:
+        star_qnode_results = cached_prep_qnode_fn(
+            network_ansatz, global_parity_expval_qnode, broadcast=broadcast, **qnode_kwargs
+        )
     else:
-        star_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
+        executor.prepare(network_ansatz, global_parity_expval_qnode, qnode_kwargs)
 
     def I22(*network_settings):
-        I22_x_settings = [
-            network_ansatz.qnode_settings(network_settings, network_inputs)
-            for network_inputs in network_input_x_vals
-        ]
-
-        if parallel:
-            I22_results = []
-            num_batches = int((2**n) / nthreads)
-            for i in range(num_batches + 1):
-                start_id = i * nthreads
-                end_id = start_id + nthreads if i < num_batches else 2**n
-
-                I22_delayed_results = [
-                    dask.delayed(star_qnodes[i])(settings)
-                    for i, settings in enumerate(I22_x_settings[start_id:end_id])
-                ]
-
-                I22_results = math.concatenate(
-                    [I22_results, dask.compute(*I22_delayed_results, scheduler="threads")]
-                )
+        if cache_prep:
+            return math.sum(star_qnode_results(network_settings, network_input_x_vals)) / (2**n)
+
+        if broadcast:
+            x_settings = [
+                network_ansatz.broadcast_qnode_settings(network_settings, network_input_x_vals)
+            ]
         else:
-            I22_results = math.stack([star_qnode(settings) for settings in I22_x_settings])
+            x_settings = [
+                network_ansatz.qnode_settings(network_settings, network_inputs)
+                for network_inputs in network_input_x_vals
+            ]
+
+        I22_results = executor.map(
+            network_ansatz, global_parity_expval_qnode, x_settings, qnode_kwargs
+        )
+        I22_results = I22_results[0] if broadcast else math.stack(I22_results)
 
         return math.sum(I22_results) / (2**n)
 
     return I22
 
 
-def star_J22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
+def star_J22_fn(
+    network_ansatz,
+    parallel=False,
+    nthreads=4,
+    broadcast=False,
+    cache_prep=False,
+    executor=None,
+    **qnode_kwargs,
+):
     """Constructs a network-specific ``J22(network_settings)`` function that
     evaluates the :math:`J_{22,n}` quantity for the :math:`n`-local star network.
 
@@ -97,20 +138,41 @@ def star_J22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
     :param network_ansatz: The :math:`n`-local star network ansatz.
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True`` qnodes will be evaluated in separate threads. This is
-                     valuable for execution on remote simulator and hardware devices.
-                     Default value: ``False``.
+    :param parallel: If ``True`` qnodes will be evaluated in separate threads by a
+                     :class:`qnetvo.ThreadExecutor`. This is valuable for execution on remote
+                     simulator and hardware devices. Default value: ``False``.
     :type parallel: *optional* Bool
 
     :param nthreads: Specifies the number of threads used when ``parallel=True``.
     :type nthreads: Int
 
+    :param broadcast: If ``True``, the :math:`2^n` correlators are evaluated in one qnode
+                      execution using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      The broadcasted correlators form a single execution, so neither ``broadcast``
+                      nor ``cache_prep`` can be combined with ``parallel``. Default value: ``False``.
+    :type broadcast: *optional* Bool
+
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with an ``executor``.
+                       Default value: ``False``.
+    :type cache_prep: *optional* Bool
+
+    :param executor: If provided, all qnodes are evaluated through the executor
+                     (see :class:`qnetvo.Executor`) and ``parallel`` and ``nthreads`` are ignored.
+                     Default value: ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: keyword args passed through to the QNode constructor.
     :type qnode_kwargs: *optional* dictionary
 
     :returns: A function callable as ``J22(*network_settings)`` that evaluates the :math:`J_{22,n}`
               quantity for the given ``network_settings``.
     :rtype: function
+
+    :raises ValueError: If ``broadcast`` or ``cache_prep`` is combined with ``parallel``, or if
+                        ``cache_prep`` is combined with an ``executor``.
     """
 
     n = len(network_ansatz.layers[0])
@@ -121,49 +183,87 @@ def star_J22_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
         for x in range(2**n)
     ]
 
-    if parallel:
-        from ..lazy_dask_import import dask
+    if parallel and (broadcast or cache_prep):
+        raise ValueError(
+            "The `broadcast` and `cache_prep` options cannot be combined with `parallel`."
+        )
+    if cache_prep and executor is not None:
+        raise ValueError("The `cache_prep` option cannot be combined with an `executor`.")
+
+    if executor is None:
+        executor = _default_thread_executor(nthreads) if parallel else SerialExecutor()
 
-        star_qnodes = [
-            global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(nthreads)
-        ]
+    if cache_prep:
+        star_qnode_results = cached_prep_qnode_fn(
+            network_ansatz, global_parity_expval_qnode, broadcast=broadcast, **qnode_kwargs
+        )
     else:
-        star_qnode = global_parity_expval_qnode(network_ansatz, **qnode_kwargs)
+        executor.prepare(network_ansatz, global_parity_expval_qnode, qnode_kwargs)
+
+    J22_scalars = math.stack(
+        [(-1) ** (math.sum(input_vals[1][0:n])) for input_vals in network_input_x_vals]
+    )
 
     def J22(*network_settings):
-        J22_x_settings = [
-            network_ansatz.qnode_settings(network_settings, network_inputs)
-            for network_inputs in network_input_x_vals
-        ]
-
-        if parallel:
-            J22_expvals = []
-            num_batches = int((2**n) / nthreads)
-            for i in range(num_batches + 1):
-                start_id = i * nthreads
-                end_id = start_id + nthreads if i < num_batches else 2**n
-
-                J22_delayed_results = [
-                    dask.delayed(star_qnodes[i])(settings)
-                    for i, settings in enumerate(J22_x_settings[start_id:end_id])
-                ]
-
-                J22_expvals = math.concatenate(
-                    [J22_expvals, dask.compute(*J22_delayed_results, scheduler="threads")]
-                )
+        if cache_prep:
+            J22_expvals = star_qnode_results(network_settings, network_input_x_vals)
+            return math.sum(J22_scalars * J22_expvals) / (2**n)
+
+        if broadcast:
+            x_settings = [
+                network_ansatz.broadcast_qnode_settings(network_settings, network_input_x_vals)
+            ]
         else:
-            J22_expvals = math.stack([star_qnode(settings) for settings in J22_x_settings])
+            x_settings = [
+                network_ansatz.qnode_settings(network_settings, network_inputs)
+                for network_inputs in network_input_x_vals
+            ]
 
-        J22_scalars = math.stack(
-            [(-1) ** (math.sum(input_vals[1][0:n])) for input_vals in network_input_x_vals]
+        J22_expvals = executor.map(
+            network_ansatz, global_parity_expval_qnode, x_settings, qnode_kwargs
         )
+        J22_expvals = J22_expvals[0] if broadcast else math.stack(J22_expvals)
 
         return math.sum(J22_scalars * J22_expvals) / (2**n)
 
     return J22
 
 
-def nlocal_star_22_cost_fn(network_ansatz, parallel=False, nthreads=4, **qnode_kwargs):
+def _star_22_terms(network_ansatz):
+    """The ``(network_inputs, coeff)`` correlator terms of :math:`I_{22,n}` followed by
+    :math:`J_{22,n}` for the :math:`n`-local star network."""
+    n = len(network_ansatz.layers[0])
+
+    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
+    x_vals = [[int(bit) for bit in np.binary_repr(x, width=n)] for x in range(2**n)]
+
+    I22_terms = [(static_prep_inputs + [x_bits + [0]], 1 / (2**n)) for x_bits in x_vals]
+    J22_terms = [
+        (static_prep_inputs + [x_bits + [1]], (-1) ** sum(x_bits) / (2**n)) for x_bits in x_vals
+    ]
+
+    return I22_terms + J22_terms
+
+
+def _star_22_outer_fn(n):
+    def outer_fn(term_values):
+        I22_score = math.sum(term_values[0 : 2**n])
+        J22_score = math.sum(term_values[2**n :])
+
+        return -(math.abs(I22_score) ** (1 / n) + math.abs(J22_score) ** (1 / n))
+
+    return outer_fn
+
+
+def nlocal_star_22_cost_fn(
+    network_ansatz,
+    parallel=False,
+    nthreads=4,
+    broadcast=False,
+    cache_prep=False,
+    executor=None,
+    **qnode_kwargs,
+):
     """A network-specific constructor for the :math:`n`-local star Bell
     inequality for scenarios when all measurement devices in the star network
     have 2 inputs and 2 outputs.
@@ -180,29 +280,85 @@ def nlocal_star_22_cost_fn(network_ansatz, parallel=False, nthreads=4, **qnode_k
     The classical bound is found to be 1, but quantum systems can score as high as
     :math:`\\sqrt{2}`.
 
+    Unless ``cache_prep`` is used, the correlators of both quantities are compiled with
+    :meth:`qnetvo.correlator_cost_fn` and evaluated in a single batch of executions.
+
     :param network_ansatz: The :math:`n`-local star network ansatz.
     :type network_ansatz: qnet.NetworkAnsatz
 
-    :param parallel: If ``True`` qnodes will be evaluated in separate threads. This is
-                     valuable for execution on remote simulator and hardware devices.
-                     Default value: ``False``.
+    :param parallel: If ``True`` qnodes will be evaluated in separate threads by a
+                     :class:`qnetvo.ThreadExecutor`. This is valuable for execution on remote
+                     simulator and hardware devices. Default value: ``False``.
     :type parallel: *optional* Bool
 
     :param nthreads: Specifies the number of threads used when ``parallel=True``.
     :type nthreads: Int
 
+    :param broadcast: If ``True``, the :math:`2^n` correlators are evaluated in one qnode
+                      execution using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      The broadcasted correlators form a single execution, so neither ``broadcast``
+                      nor ``cache_prep`` can be combined with ``parallel``. Default value: ``False``.
+    :type broadcast: *optional* Bool
+
+    :param cache_prep: If ``True``, the preparation layers are simulated once per evaluation
+                       and only the measurement layer is simulated for each correlator
+                       (see :meth:`qnetvo.cached_prep_qnode_fn`). The cached preparation is
+                       simulated serially, so ``cache_prep`` cannot be combined with an ``executor``.
+                       Default value: ``False``.
+    :type cache_prep: *optional* Bool
+
+    :param executor: If provided, all qnodes are evaluated through the executor
+                     (see :class:`qnetvo.Executor`) and ``parallel`` and ``nthreads`` are ignored.
+                     Default value: ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: keyword args passed through to the QNode constructor.
     :type qnode_kwargs: *optional* dictionary
 
     :returns: A function callable as ``nlocal_star_22_cost(*network_settings)`` that evaluates
               the cost as :math:`-|I_{22,n}|^{1/n} - |J_{22,n}|^{1/n}`.
     :rtype: function
+
+    :raises ValueError: If ``broadcast`` or ``cache_prep`` is combined with ``parallel``, or if
+                        ``cache_prep`` is combined with an ``executor``.
     """
 
     n = len(network_ansatz.layers[0])
 
-    I22 = star_I22_fn(network_ansatz, parallel=parallel, nthreads=nthreads, **qnode_kwargs)
-    J22 = star_J22_fn(network_ansatz, parallel=parallel, nthreads=nthreads, **qnode_kwargs)
+    if parallel and (broadcast or cache_prep):
+        raise ValueError(
+            "The `broadcast` and `cache_prep` options cannot be combined with `parallel`."
+        )
+    if cache_prep and executor is not None:
+        raise ValueError("The `cache_prep` option cannot be combined with an `executor`.")
+
+    if not (broadcast or cache_prep):
+        # the I22 and J22 correlators are compiled into a single batch of executions
+        if executor is None:
+            executor = _default_thread_executor(nthreads) if parallel else SerialExecutor()
+
+        return correlator_cost_fn(
+            network_ansatz,
+            _star_22_terms(network_ansatz),
+            outer_fn=_star_22_outer_fn(n),
+            executor=executor,
+            **qnode_kwargs,
+        )
+
+    I22 = star_I22_fn(
+        network_ansatz,
+        broadcast=broadcast,
+        cache_prep=cache_prep,
+        executor=executor,
+        **qnode_kwargs,
+    )
+    J22 = star_J22_fn(
+        network_ansatz,
+        broadcast=broadcast,
+        cache_prep=cache_prep,
+        executor=executor,
+        **qnode_kwargs,
+    )
 
     def cost(*network_settings):
         I22_score = I22(*network_settings)
@@ -213,7 +369,9 @@ def nlocal_star_22_cost_fn(network_ansatz, parallel=False, nthreads=4, **qnode_k
     return cost
 
 
-def parallel_nlocal_star_grad_fn(network_ansatz, nthreads=4, natural_grad=False, **qnode_kwargs):
+def parallel_nlocal_star_grad_fn(
+    network_ansatz, nthreads=4, natural_grad=False, executor=None, **qnode_kwargs
+):
     """Constructs a parallelizeable gradient function ``grad_fn`` for the :math:`n`-local
     star cost function.
 
@@ -226,7 +384,9 @@ def parallel_nlocal_star_grad_fn(network_ansatz, nthreads=4, natural_grad=False,
 
     where the gradient differentiates with respect to the network settings :math:`\\vec{\\theta}`.
 
-    The parallelization is achieved through multithreading and intended to improve the
+    The gradients of all :math:`2^{n+1}` correlators are streamed through the ``executor``
+    (see :meth:`qnetvo.parallel_grad_fn`).
+    By default, a :class:`qnetvo.ThreadExecutor` with ``nthreads`` threads is used to improve the
     efficiency of remote qnode execution.
 
     :param network_ansatz: The ansatz describing the :math:`n`-local chain network.
@@ -239,6 +399,10 @@ def parallel_nlocal_star_grad_fn(network_ansatz, nthreads=4, natural_grad=False,
                          gradient by the inverse of the metric tensor.
     :type natural_grad: *optional* Bool
 
+    :param executor: The executor through which the qnode gradients are evaluated
+                     (see :class:`qnetvo.Executor`). Default ``None``.
+    :type executor: *optional* Executor
+
     :param qnode_kwargs: A keyword argument passthrough to qnode construction.
     :type qnode_kwargs: *optional* dict
 
@@ -250,95 +414,21 @@ def parallel_nlocal_star_grad_fn(network_ansatz, nthreads=4, natural_grad=False,
 
     """
 
-    from ..lazy_dask_import import dask
-
     n = len(network_ansatz.layers[0])
 
-    star_qnodes = [
-        global_parity_expval_qnode(network_ansatz, **qnode_kwargs) for i in range(nthreads)
-    ]
-
-    I22_x_vals = [[int(bit) for bit in np.binary_repr(x, width=n) + "0"] for x in range(2**n)]
-    J22_x_vals = [[int(bit) for bit in np.binary_repr(x, width=n) + "1"] for x in range(2**n)]
-
-    static_prep_inputs = [[0] * len(layer_nodes) for layer_nodes in network_ansatz.layers[0:-1]]
-
-    I22 = star_I22_fn(network_ansatz, parallel=True, nthreads=nthreads, **qnode_kwargs)
-    J22 = star_J22_fn(network_ansatz, parallel=True, nthreads=nthreads, **qnode_kwargs)
-
-    # gradient helper functions
-    def _g(qnode, settings):
-        return qml.grad(qnode)(settings)
+    if executor is None:
+        executor = _default_thread_executor(nthreads)
 
-    def _ng(qnode, settings):
-        metric_inv = pinvh(qml.metric_tensor(qnode, approx="block-diag")(settings))
-        return metric_inv @ _g(qnode, settings)
-
-    _grad = _ng if natural_grad else _g
-
-    def nlocal_star_grad(*network_settings):
-        I22_score = I22(*network_settings)
-        J22_score = J22(*network_settings)
-
-        I22_x_settings = [
-            network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
-            for meas_inputs in I22_x_vals
-        ]
-        J22_x_settings = [
-            network_ansatz.qnode_settings(network_settings, static_prep_inputs + [meas_inputs])
-            for meas_inputs in J22_x_vals
-        ]
-
-        grad_I22_results = []
-        grad_J22_results = []
-
-        num_batches = int((2**n) / nthreads)
-        for i in range(num_batches + 1):
-            start_id = i * nthreads
-            end_id = start_id + nthreads if i < num_batches else 2**n
-
-            grad_I22_delayed_results = [
-                dask.delayed(_grad)(star_qnodes[i], settings)
-                for i, settings in enumerate(I22_x_settings[start_id:end_id])
-            ]
-            grad_I22_results.extend(dask.compute(*grad_I22_delayed_results, scheduler="threads"))
-
-            grad_J22_delayed_results = [
-                dask.delayed(_grad)(star_qnodes[i], settings)
-                for i, settings in enumerate(J22_x_settings[start_id:end_id])
-            ]
-            grad_J22_results.extend(dask.compute(*grad_J22_delayed_results, scheduler="threads"))
-
-        settings_grad = network_ansatz.zero_network_settings()
-
-        I22_scalar = (
-            -(1 / n)
-            * np.power(math.abs(I22_score), (1 - n) / n)
-            * math.sign(I22_score)
-            * (1 / (2**n))
-        )
-        J22_scalar = (
-            -(1 / n)
-            * np.power(math.abs(J22_score), (1 - n) / n)
-            * math.sign(J22_score)
-            * (1 / (2**n))
-        )
-
-        for i in range(2**n):
-            I22_inputs = I22_x_vals[i]
-            J22_inputs = J22_x_vals[i]
-
-            J22_sign = (-1) ** math.sum(J22_inputs[0:n])
-
-            settings_grad += I22_scalar * network_ansatz.expand_qnode_settings(
-                grad_I22_results[i], [[0] * n, I22_inputs]
-            )
-            settings_grad += (
-                J22_sign
-                * J22_scalar
-                * network_ansatz.expand_qnode_settings(grad_J22_results[i], [[0] * n, J22_inputs])
-            )
-
-        return settings_grad
+    terms = [
+        (network_inputs, global_parity_expval_qnode, coeff)
+        for network_inputs, coeff in _star_22_terms(network_ansatz)
+    ]
 
-    return nlocal_star_grad
+    return parallel_grad_fn(
+        network_ansatz,
+        terms,
+        outer_fn=_star_22_outer_fn(n),
+        natural_grad=natural_grad,
+        executor=executor,
+        **qnode_kwargs,
+    )
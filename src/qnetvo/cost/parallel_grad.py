@@ -0,0 +1,140 @@
+import pennylane as qml
+from pennylane import math
+from pennylane import numpy as np
+from ..executors import _default_thread_executor
+
+
+def parallel_grad_fn(
+    network_ansatz, terms, outer_fn=None, natural_grad=False, executor=None, **qnode_kwargs
+):
+    """Constructs a parallelizeable gradient function ``grad_fn`` for any cost that is a
+    function of a weighted sum of qnode terms.
+
+    Each term :math:`k` is specified by a tuple ``(network_inputs, qnode_fn, coeff)`` and
+    evaluates to
+
+    .. math::
+
+        v_k(\\vec{\\theta}) = c_k \\cdot f_k(\\vec{\\theta}_k),
+
+    where :math:`f_k` is the qnode constructed as ``qnode_fn(network_ansatz, **qnode_kwargs)``,
+    :math:`\\vec{\\theta}_k` are the qnode settings for the ``network_inputs``, and :math:`c_k`
+    is a scalar coefficient or, for qnodes that output a vector such as
+    :meth:`qnetvo.joint_probs_qnode`, a vector of coefficients.
+    The cost is then :math:`C(\\vec{\\theta}) = g(\\vec{v}(\\vec{\\theta}))` where :math:`g` is the
+    ``outer_fn``, and its gradient is evaluated via the chain rule,
+
+    .. math::
+
+        \\nabla C(\\vec{\\theta}) = \\sum_k \\frac{\\partial g}{\\partial v_k} c_k \\cdot \\nabla f_k(\\vec{\\theta}_k).
+
+    The gradients of all terms are evaluated by the ``executor``.
+    If ``natural_grad`` is ``True``, the gradient of each term is scaled by the pseudo-inverse of
+    its metric tensor as in :meth:`qnetvo.parallel_chsh_grad_fn`.
+
+    :param network_ansatz: The ansatz describing the network.
+    :type network_ansatz: NetworkAnsatz
+
+    :param terms: A list of ``(network_inputs, qnode_fn, coeff)`` tuples.
+    :type terms: list[tuple[list[list[int]], function, float or array[float]]]
+
+    :param outer_fn: A function ``outer_fn(term_values)`` of the array of term values that
+                     returns the cost. If ``None``, the cost is the sum of the term values and
+                     the term values are not evaluated. Default ``None``.
+    :type outer_fn: *optional* function
+
+    :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+    :type natural_grad: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated
+                     (see :class:`qnetvo.Executor`). By default, a :class:`qnetvo.ThreadExecutor`
+                     with four threads on a shared thread pool is used.
+    :type executor: *optional* Executor
+
+    :param qnode_kwargs: A keyword argument passthrough to qnode construction.
+    :type qnode_kwargs: *optional* dict
+
+    :returns: A gradient function ``grad_fn(*network_settings)`` for :meth:`qnetvo.gradient_descent`.
+    :rtype: function
+
+    :raises ValueError: If ``terms`` is empty.
+
+    For example, the gradient of the CHSH cost :math:`-I_{CHSH}` is constructed as
+
+    .. code-block:: python
+
+        terms = [
+            ([[0], [x, y]], qnetvo.global_parity_expval_qnode, -((-1) ** (x * y)))
+            for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]
+        ]
+        grad_fn = qnetvo.parallel_grad_fn(chsh_ansatz, terms)
+    """
+    if len(terms) == 0:
+        raise ValueError("At least one term is required.")
+
+    if executor is None:
+        executor = _default_thread_executor()
+
+    # terms are grouped by qnode constructor so that each group is one executor call
+    term_groups = {}
+    for k, (_, qnode_fn, _) in enumerate(terms):
+        term_groups.setdefault(qnode_fn, []).append(k)
+
+    for qnode_fn in term_groups:
+        executor.prepare(network_ansatz, qnode_fn, qnode_kwargs)
+
+    coeffs = [np.array(coeff, requires_grad=False) for _, _, coeff in terms]
+    is_scalar = [math.ndim(coeff) == 0 for coeff in coeffs]
+    weights = [None if is_scalar[k] else coeffs[k] for k in range(len(terms))]
+
+    def _map_terms(term_settings, grad):
+        results = [None] * len(terms)
+        for qnode_fn, ids in term_groups.items():
+            settings_list = [term_settings[k] for k in ids]
+            if grad:
+                group_results = executor.map_grad(
+                    network_ansatz,
+                    qnode_fn,
+                    settings_list,
+                    natural_grad=natural_grad,
+                    qnode_kwargs=qnode_kwargs,
+                    weights_list=[weights[k] for k in ids],
+                )
+            else:
+                group_results = executor.map(network_ansatz, qnode_fn, settings_list, qnode_kwargs)
+
+            for k, result in zip(ids, group_results):
+                results[k] = result
+
+        return results
+
+    def grad_fn(*network_settings):
+        term_settings = [
+            network_ansatz.qnode_settings(network_settings, network_inputs)
+            for network_inputs, _, _ in terms
+        ]
+
+        if outer_fn is None:
+            outer_grad = np.ones(len(terms))
+        else:
+            term_values = np.array(
+                [
+                    math.sum(coeffs[k] * math.to_numpy(value))
+                    for k, value in enumerate(_map_terms(term_settings, grad=False))
+                ],
+                requires_grad=True,
+            )
+            outer_grad = qml.grad(outer_fn)(term_values)
+
+        term_grads = _map_terms(term_settings, grad=True)
+
+        settings_grad = network_ansatz.zero_network_settings()
+        for k, (network_inputs, _, _) in enumerate(terms):
+            scalar = outer_grad[k] * coeffs[k] if is_scalar[k] else outer_grad[k]
+            settings_grad += scalar * network_ansatz.expand_qnode_settings(
+                term_grads[k], network_inputs
+            )
+
+        return settings_grad
+
+    return grad_fn
@@ -0,0 +1,791 @@
+import pennylane as qml
+from pennylane import numpy as qnp
+import numpy as np
+from scipy.linalg import pinvh
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+import uuid
+from .qnodes import _LRUCache, _is_traced, _settings_key
+
+
+def qnode_grad(qnode, settings, natural_grad=False, weights=None):
+    """Evaluates the gradient of a qnode with respect to its settings.
+
+    The natural gradient scales the gradient by the pseudo-inverse of the block-diagonal
+    approximation of the Fubini-Study metric tensor.
+
+    :param qnode: A qnode called as ``qnode(settings)`` that returns a scalar, or a vector
+                  if ``weights`` are provided.
+    :type qnode: ``pennylane.QNode``
+
+    :param settings: A differentiable 1D array of qnode settings.
+    :type settings: array[float]
+
+    :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+    :type natural_grad: *optional* bool
+
+    :param weights: If provided, the gradient of the weighted sum
+                    ``weights @ qnode(settings)`` is evaluated, e.g., a linear function of the
+                    probabilities output from :meth:`qnetvo.joint_probs_qnode`. Default ``None``.
+    :type weights: *optional* array[float]
+
+    :returns: The gradient with the same shape as ``settings``.
+    :rtype: array[float]
+    """
+    if weights is None:
+        grad = qml.grad(qnode)(settings)
+    else:
+        grad = qml.grad(lambda settings: qml.math.tensordot(weights, qnode(settings), axes=1))(
+            settings
+        )
+
+    if natural_grad:
+        metric_inv = pinvh(qml.metric_tensor(qnode, approx="block-diag")(settings))
+        return metric_inv @ grad
+
+    return grad
+
+
+_DEFAULT_NUM_WORKERS = 4
+
+
+def _qnode_kwargs_key(qnode_kwargs):
+    """A hashable key identifying the qnode keyword arguments."""
+    try:
+        key = tuple(sorted(qnode_kwargs.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return pickle.dumps(qnode_kwargs)
+
+
+def _grad_items(settings_list, weights_list):
+    """Pairs each qnode settings with its gradient weights."""
+    if weights_list is None:
+        weights_list = [None] * len(settings_list)
+    elif len(weights_list) != len(settings_list):
+        raise ValueError("The `weights_list` must have the same length as the `settings_list`.")
+
+    return list(zip(settings_list, weights_list))
+
+
+class Executor:
+    """The interface shared by all executors in qNetVO.
+
+    An executor evaluates a qnode constructed as ``qnode_fn(network_ansatz, **qnode_kwargs)``
+    for each qnode settings in a list.
+    Cost and gradient function constructors accept an ``executor`` keyword argument
+    and dispatch all of their qnode evaluations through :meth:`map` or :meth:`map_grad`.
+    Hence, any cost function can be parallelized by swapping the executor, e.g.,
+    a :class:`qnetvo.ThreadExecutor` for remote devices or a :class:`qnetvo.ProcessExecutor`
+    for local simulators.
+
+    Executors are constructed once and reused across cost evaluations so that qnodes and
+    worker pools are not rebuilt on each call.
+    The :meth:`shutdown` method releases any held workers and the executor can be used as
+    a context manager.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        """Releases the resources held by the executor."""
+        pass
+
+    def prepare(self, network_ansatz, qnode_fn, qnode_kwargs={}):
+        """Constructs ahead of time the qnodes that :meth:`map` will evaluate.
+
+        Cost constructors call this method so that qnodes and devices are created when the
+        cost is constructed rather than on its first evaluation.
+
+        :param network_ansatz: The network ansatz simulated by the qnode.
+        :type network_ansatz: NetworkAnsatz
+
+        :param qnode_fn: A qnode constructor called as ``qnode_fn(network_ansatz, **qnode_kwargs)``.
+        :type qnode_fn: function
+
+        :param qnode_kwargs: Keyword arguments passed to the ``qnode_fn``.
+        :type qnode_kwargs: *optional* dict
+        """
+        pass
+
+    def map(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        """Evaluates a qnode for each settings in ``settings_list``.
+
+        :param network_ansatz: The network ansatz simulated by the qnode.
+        :type network_ansatz: NetworkAnsatz
+
+        :param qnode_fn: A qnode constructor called as ``qnode_fn(network_ansatz, **qnode_kwargs)``,
+                         e.g., :meth:`qnetvo.global_parity_expval_qnode`.
+        :type qnode_fn: function
+
+        :param settings_list: A list of qnode settings.
+        :type settings_list: list[array[float]]
+
+        :param qnode_kwargs: Keyword arguments passed to the ``qnode_fn``.
+        :type qnode_kwargs: *optional* dict
+
+        :returns: A list containing the qnode output for each settings in order.
+        :rtype: list
+        """
+        raise NotImplementedError
+
+    def map_grad(
+        self,
+        network_ansatz,
+        qnode_fn,
+        settings_list,
+        natural_grad=False,
+        qnode_kwargs={},
+        weights_list=None,
+    ):
+        """Evaluates the gradient of a scalar qnode for each settings in ``settings_list``
+        (see :meth:`qnetvo.qnode_grad`).
+
+        :param network_ansatz: The network ansatz simulated by the qnode.
+        :type network_ansatz: NetworkAnsatz
+
+        :param qnode_fn: A qnode constructor called as ``qnode_fn(network_ansatz, **qnode_kwargs)``.
+        :type qnode_fn: function
+
+        :param settings_list: A list of qnode settings.
+        :type settings_list: list[array[float]]
+
+        :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+        :type natural_grad: *optional* bool
+
+        :param qnode_kwargs: Keyword arguments passed to the ``qnode_fn``.
+        :type qnode_kwargs: *optional* dict
+
+        :param weights_list: If provided, the gradient of ``weights @ qnode(settings)`` is
+                             evaluated for each pair of settings and weights, where ``None``
+                             weights differentiate the scalar qnode output directly.
+        :type weights_list: *optional* list[array[float]]
+
+        :returns: A list containing the qnode gradient for each settings in order.
+        :rtype: list[array[float]]
+
+        :raises ValueError: If ``weights_list`` and ``settings_list`` have different lengths.
+        """
+        raise NotImplementedError
+
+
+class _LocalExecutor(Executor):
+    """Base class for executors that evaluate qnodes in the calling process.
+
+    Qnodes are constructed on first use and cached.
+    Each concurrently running evaluation is assigned a ``slot`` with its own qnode because
+    a qnode holds its tape while executing and cannot be shared between threads.
+    Results are returned as produced by the qnodes and remain differentiable.
+
+    If ``memoize`` is set, the results of forward evaluations are stored in a least-recently-used
+    cache keyed on the qnode and the bytes of its settings (see :meth:`qnetvo.memoize_qnode`).
+    Repeated settings are then evaluated once, whether they repeat within one call to
+    :meth:`map` or across calls.
+    Settings traced for differentiation and all gradient evaluations bypass the cache.
+    """
+
+    def __init__(self, memoize=None):
+        self._qnodes = {}
+        self.memo = _LRUCache(memoize) if memoize else None
+
+    def _qnode(self, network_ansatz, qnode_fn, qnode_kwargs, slot=0):
+        key = (id(network_ansatz), qnode_fn, _qnode_kwargs_key(qnode_kwargs), slot)
+        if key not in self._qnodes:
+            # the ansatz reference prevents its id from being reused
+            self._qnodes[key] = (network_ansatz, qnode_fn(network_ansatz, **qnode_kwargs))
+
+        return self._qnodes[key][1]
+
+    def _num_slots(self):
+        return 1
+
+    def prepare(self, network_ansatz, qnode_fn, qnode_kwargs={}):
+        for slot in range(self._num_slots()):
+            self._qnode(network_ansatz, qnode_fn, qnode_kwargs, slot)
+
+    @staticmethod
+    def _evaluate_fn(method):
+        if method == "value":
+            return lambda qnode, settings: qnode(settings)
+
+        natural_grad = method == "natural_grad"
+
+        # gradients are evaluated for (settings, weights) pairs
+        return lambda qnode, item: qnode_grad(
+            qnode,
+            qnp.array(item[0], requires_grad=True),
+            natural_grad=natural_grad,
+            weights=item[1],
+        )
+
+    def _evaluate(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs, method):
+        raise NotImplementedError
+
+    def map(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        if self.memo is None or _is_traced(settings_list):
+            return self._evaluate(network_ansatz, qnode_fn, settings_list, qnode_kwargs, "value")
+
+        qnode_key = (id(network_ansatz), qnode_fn, _qnode_kwargs_key(qnode_kwargs))
+        keys = [(qnode_key, _settings_key([settings])) for settings in settings_list]
+
+        results = {}
+        missing = {}
+        for key, settings in zip(keys, settings_list):
+            if key in results or key in missing:
+                continue
+
+            hit, result = self.memo.get(key)
+            if hit:
+                results[key] = result
+            else:
+                missing[key] = settings
+
+        if missing:
+            missing_results = self._evaluate(
+                network_ansatz, qnode_fn, list(missing.values()), qnode_kwargs, "value"
+            )
+            for key, result in zip(missing, missing_results):
+                self.memo.put(key, result)
+                results[key] = result
+
+        return [results[key] for key in keys]
+
+    def map_grad(
+        self,
+        network_ansatz,
+        qnode_fn,
+        settings_list,
+        natural_grad=False,
+        qnode_kwargs={},
+        weights_list=None,
+    ):
+        method = "natural_grad" if natural_grad else "grad"
+        items = _grad_items(settings_list, weights_list)
+
+        return self._evaluate(network_ansatz, qnode_fn, items, qnode_kwargs, method)
+
+    prepare.__doc__ = Executor.prepare.__doc__
+    map.__doc__ = Executor.map.__doc__
+    map_grad.__doc__ = Executor.map_grad.__doc__
+
+
+class SerialExecutor(_LocalExecutor):
+    """Evaluates network qnodes one after the other in the calling thread.
+
+    The ``SerialExecutor`` reproduces the default behavior of the cost functions and serves
+    as a baseline when benchmarking the other executors.
+    Results are differentiable.
+
+    :param memoize: The maximum number of forward results cached by the executor.
+                    Default ``None``, results are not cached.
+    :type memoize: *optional* int
+    """
+
+    def _evaluate(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs, method):
+        qnode = self._qnode(network_ansatz, qnode_fn, qnode_kwargs)
+        evaluate = self._evaluate_fn(method)
+
+        return [evaluate(qnode, settings) for settings in settings_list]
+
+
+class ThreadExecutor(_LocalExecutor):
+    """Evaluates network qnodes in a pool of threads.
+
+    Threads are best suited to remote devices, e.g., hardware or cloud simulators, where the
+    qnode execution time is dominated by waiting on web requests.
+    Each of the ``num_workers`` threads holds its own qnode and pulls the next settings from
+    a shared work queue as soon as its previous evaluation finishes.
+    Hence, a slow execution delays only the thread running it and all threads stay busy
+    until the queue is empty.
+    Results are written into a preallocated list in the order of the input settings and
+    are differentiable.
+
+    :param num_workers: The number of threads. Default ``4``.
+    :type num_workers: *optional* int
+
+    :param memoize: The maximum number of forward results cached by the executor.
+                    Default ``None``, results are not cached.
+    :type memoize: *optional* int
+
+    :param pool: A thread pool shared with other executors. A shared pool is owned by the caller
+                 and is not shut down by :meth:`shutdown`. Default ``None``, the executor creates
+                 its own pool with ``num_workers`` threads.
+    :type pool: *optional* concurrent.futures.ThreadPoolExecutor
+    """
+
+    def __init__(self, num_workers=_DEFAULT_NUM_WORKERS, memoize=None, pool=None):
+        super().__init__(memoize=memoize)
+        self.num_workers = num_workers
+        self._owns_pool = pool is None
+        self.pool = ThreadPoolExecutor(max_workers=num_workers) if pool is None else pool
+
+    def shutdown(self):
+        """Shuts down the thread pool unless it is shared."""
+        if self._owns_pool:
+            self.pool.shutdown()
+
+    def _num_slots(self):
+        return self.num_workers
+
+    def _evaluate(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs, method):
+        evaluate = self._evaluate_fn(method)
+
+        work_queue = queue.SimpleQueue()
+        for i in range(len(settings_list)):
+            work_queue.put(i)
+
+        results = [None] * len(settings_list)
+
+        def _worker(slot):
+            qnode = self._qnode(network_ansatz, qnode_fn, qnode_kwargs, slot)
+            while True:
+                try:
+                    i = work_queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                results[i] = evaluate(qnode, settings_list[i])
+
+        futures = [
+            self.pool.submit(_worker, slot)
+            for slot in range(min(self.num_workers, len(settings_list)))
+        ]
+        for future in futures:
+            future.result()
+
+        return results
+
+
+_shared_thread_pools = {}
+_shared_thread_pools_lock = threading.Lock()
+
+
+def _default_thread_executor(num_workers=_DEFAULT_NUM_WORKERS):
+    """The :class:`ThreadExecutor` used by cost functions constructed with ``parallel=True``
+    and no ``executor``.
+
+    Default executors with the same ``num_workers`` run on one module-level thread pool,
+    so constructing cost functions does not start threads that are never shut down.
+    """
+    with _shared_thread_pools_lock:
+        if num_workers not in _shared_thread_pools:
+            _shared_thread_pools[num_workers] = ThreadPoolExecutor(max_workers=num_workers)
+
+        pool = _shared_thread_pools[num_workers]
+
+    return ThreadExecutor(num_workers=num_workers, pool=pool)
+
+
+class _TokenBucket:
+    """A token-bucket rate limiter for coroutines running in one event loop.
+
+    Tokens are added at ``rate`` tokens per second up to ``capacity`` tokens and each
+    call to :meth:`acquire` consumes one token, waiting until a token is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncExecutor(_LocalExecutor):
+    """Evaluates network qnodes as concurrent ``asyncio`` tasks.
+
+    The ``AsyncExecutor`` is a submission layer for remote devices where many jobs can be kept
+    in flight at once.
+    The tasks are scheduled by an ``asyncio`` event loop, but PennyLane qnodes execute
+    synchronously, so each evaluation blocks one of ``num_threads`` worker threads while in flight.
+    The number of worker threads is set independently of ``max_concurrency`` and
+    at most ``min(max_concurrency, num_threads)`` evaluations are in flight at any time.
+    Submissions can be throttled by a token-bucket rate limiter that starts at most
+    ``rate_limit`` evaluations per second with bursts of up to ``burst`` evaluations.
+    Evaluations that raise one of the ``retry_exceptions`` are retried up to ``max_retries``
+    times, waiting ``retry_backoff * 2**attempt`` seconds before each retry.
+    Results are gathered in the order of the input settings and are differentiable.
+
+    The :meth:`map` and :meth:`map_grad` methods run their own event loop.
+    Inside a running event loop, e.g., a Jupyter notebook, the coroutines :meth:`amap` and
+    :meth:`amap_grad` should be awaited instead.
+
+    :param max_concurrency: The maximum number of concurrent qnode evaluations. Default ``4``.
+    :type max_concurrency: *optional* int
+
+    :param num_threads: The number of worker threads running the blocking qnode executions.
+                        Defaults to ``min(max_concurrency, os.cpu_count() + 4)``.
+    :type num_threads: *optional* int
+
+    :param rate_limit: The maximum number of evaluations started per second. Default ``None``,
+                       submissions are not rate limited.
+    :type rate_limit: *optional* float
+
+    :param burst: The capacity of the token bucket, i.e., the number of evaluations that can
+                  be started at once. Defaults to ``max(1, rate_limit)``.
+    :type burst: *optional* int
+
+    :param max_retries: The number of times a failed evaluation is retried. Default ``0``.
+    :type max_retries: *optional* int
+
+    :param retry_backoff: The delay in seconds before the first retry, doubling for each
+                          subsequent retry. Default ``1.0``.
+    :type retry_backoff: *optional* float
+
+    :param retry_exceptions: The exception types that trigger a retry. Defaults to the transient
+                             errors ``(ConnectionError, TimeoutError)``. Other errors, e.g.,
+                             invalid settings, are raised without retrying.
+    :type retry_exceptions: *optional* tuple
+
+    :param memoize: The maximum number of forward results cached by the executor.
+                    Default ``None``, results are not cached.
+    :type memoize: *optional* int
+
+    The number of retries made by the executor is counted in the ``num_retries`` attribute.
+
+    :raises ValueError: If ``max_concurrency`` or ``num_threads`` is less than one or
+                        ``rate_limit`` is not positive.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=4,
+        num_threads=None,
+        rate_limit=None,
+        burst=None,
+        max_retries=0,
+        retry_backoff=1.0,
+        retry_exceptions=(ConnectionError, TimeoutError),
+        memoize=None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("The `max_concurrency` must be at least 1.")
+        if num_threads is not None and num_threads < 1:
+            raise ValueError("The `num_threads` must be at least 1.")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("The `rate_limit` must be positive.")
+
+        super().__init__(memoize=memoize)
+        self.max_concurrency = max_concurrency
+        self.num_threads = num_threads or min(max_concurrency, (os.cpu_count() or 1) + 4)
+        self.pool = ThreadPoolExecutor(max_workers=self.num_threads)
+
+        self.rate_limiter = (
+            _TokenBucket(rate_limit, burst or max(1, rate_limit)) if rate_limit else None
+        )
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_exceptions = retry_exceptions
+        self.num_retries = 0
+
+    def shutdown(self):
+        """Shuts down the worker threads."""
+        self.pool.shutdown()
+
+    def _num_slots(self):
+        # a slot beyond the number of threads would only wait for a free thread
+        return min(self.max_concurrency, self.num_threads)
+
+    async def _aevaluate(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs, method):
+        loop = asyncio.get_running_loop()
+        evaluate = self._evaluate_fn(method)
+
+        # each in-flight task holds a slot and its qnode
+        slots = asyncio.Queue()
+        for slot in range(min(self._num_slots(), len(settings_list))):
+            slots.put_nowait(slot)
+
+        async def _attempt(settings):
+            slot = await slots.get()
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+
+                qnode = self._qnode(network_ansatz, qnode_fn, qnode_kwargs, slot)
+                return await loop.run_in_executor(self.pool, evaluate, qnode, settings)
+            finally:
+                slots.put_nowait(slot)
+
+        async def _task(settings):
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await _attempt(settings)
+                except self.retry_exceptions:
+                    if attempt == self.max_retries:
+                        raise
+
+                # the slot is released while backing off
+                self.num_retries += 1
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+        return list(await asyncio.gather(*[_task(settings) for settings in settings_list]))
+
+    def _evaluate(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs, method):
+        return asyncio.run(
+            self._aevaluate(network_ansatz, qnode_fn, settings_list, qnode_kwargs, method)
+        )
+
+    async def amap(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        """A coroutine version of :meth:`map`. Results are not memoized."""
+        return await self._aevaluate(network_ansatz, qnode_fn, settings_list, qnode_kwargs, "value")
+
+    async def amap_grad(
+        self,
+        network_ansatz,
+        qnode_fn,
+        settings_list,
+        natural_grad=False,
+        qnode_kwargs={},
+        weights_list=None,
+    ):
+        """A coroutine version of :meth:`map_grad`."""
+        method = "natural_grad" if natural_grad else "grad"
+        items = _grad_items(settings_list, weights_list)
+
+        return await self._aevaluate(network_ansatz, qnode_fn, items, qnode_kwargs, method)
+
+
+# state held by each worker process of a ``ProcessExecutor``
+_WORKER_CACHE_SIZE = 8
+_worker_ansatzes = _LRUCache(_WORKER_CACHE_SIZE)
+_worker_qnodes = _LRUCache(4 * _WORKER_CACHE_SIZE)
+
+
+def _worker_evaluate(task, items):
+    """Evaluates a qnode, or its gradient, for a chunk of settings inside a worker process.
+
+    The network ansatz and qnodes are constructed once per worker and held in least-recently-used
+    caches for later tasks.
+    Tasks identify the ansatz by its token and only carry the pickled ansatz when it is first
+    sent to the workers.
+    If the ansatz is not cached and not included in the task, ``None`` is returned and the
+    executor resends the task with the pickled ansatz.
+    """
+    ansatz_token, ansatz_bytes, qnode_fn, qnode_kwargs_bytes, method = task
+
+    hit, network_ansatz = _worker_ansatzes.get(ansatz_token)
+    if not hit:
+        if ansatz_bytes is None:
+            return None
+
+        network_ansatz = pickle.loads(ansatz_bytes)
+        _worker_ansatzes.put(ansatz_token, network_ansatz)
+
+    qnode_key = (ansatz_token, qnode_fn, qnode_kwargs_bytes)
+    hit, qnode = _worker_qnodes.get(qnode_key)
+    if not hit:
+        qnode = qnode_fn(network_ansatz, **pickle.loads(qnode_kwargs_bytes))
+        _worker_qnodes.put(qnode_key, qnode)
+
+    if method == "value":
+        return [np.asarray(qnode(settings)) for settings in items]
+
+    return [
+        np.asarray(
+            qnode_grad(
+                qnode,
+                qnp.array(settings, requires_grad=True),
+                natural_grad=method == "natural_grad",
+                weights=weights,
+            )
+        )
+        for settings, weights in items
+    ]
+
+
+class ProcessExecutor(Executor):
+    """Evaluates network qnodes in a pool of long-lived worker processes.
+
+    Local simulators such as ``"default.qubit"`` and ``"default.mixed"`` are CPU-bound and
+    serialized by the Python GIL when evaluated in threads.
+    The ``ProcessExecutor`` instead ships the network ansatz description and
+    settings to worker processes, where each worker constructs its own device and qnodes
+    once and reuses them for all subsequent evaluations.
+    The pickled ansatz is sent with the first evaluation only, later tasks identify it by a token
+    and a worker that has not cached the ansatz receives it on request.
+
+    The network ansatz is pickled by its layers and device keyword arguments, hence, the
+    ``ansatz_fn`` of each network node and the ``qnode_fn`` must be picklable, e.g., functions
+    defined at the top level of a module.
+    Results are returned as NumPy arrays and are therefore not differentiable.
+    The ``ProcessExecutor`` only supports forward evaluation and :meth:`map` raises an error
+    if its settings are traced for differentiation, e.g., by ``qml.grad``.
+    To optimize a cost evaluated with a ``ProcessExecutor``, the gradient should also be
+    evaluated with the executor, e.g., using :meth:`qnetvo.parallel_chsh_grad_fn`.
+
+    :param num_workers: The number of worker processes. Defaults to the number of CPUs.
+    :type num_workers: *optional* int
+
+    :param mp_context: The multiprocessing start method, ``"spawn"`` by default.
+    :type mp_context: *optional* string
+
+    The executor can be used as a context manager which shuts down the worker processes on exit.
+
+    .. code-block:: python
+
+        with qnetvo.ProcessExecutor(num_workers=8) as executor:
+            cost = qnetvo.chsh_inequality_cost_fn(ansatz, executor=executor)
+            grad_fn = qnetvo.parallel_chsh_grad_fn(ansatz, executor=executor)
+
+            opt_dict = qnetvo.gradient_descent(cost, init_settings, grad_fn=grad_fn)
+    """
+
+    def __init__(self, num_workers=None, mp_context="spawn"):
+        self.num_workers = num_workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.num_workers, mp_context=multiprocessing.get_context(mp_context)
+        )
+
+        self._ansatz_tasks = {}
+        self._sent_tokens = set()
+
+    def shutdown(self):
+        """Shuts down the worker processes."""
+        self.pool.shutdown()
+
+    def prepare(self, network_ansatz, qnode_fn, qnode_kwargs={}):
+        self._ansatz_task(network_ansatz)
+
+    prepare.__doc__ = Executor.prepare.__doc__
+
+    def _ansatz_task(self, network_ansatz):
+        # the ansatz is pickled once per executor and identified in workers by a unique token
+        ansatz_id = id(network_ansatz)
+        if ansatz_id not in self._ansatz_tasks:
+            self._ansatz_tasks[ansatz_id] = (
+                network_ansatz,
+                uuid.uuid4().hex,
+                pickle.dumps(network_ansatz),
+            )
+
+        _, token, ansatz_bytes = self._ansatz_tasks[ansatz_id]
+
+        return token, ansatz_bytes
+
+    def _evaluate(self, network_ansatz, qnode_fn, items, qnode_kwargs, method):
+        token, ansatz_bytes = self._ansatz_task(network_ansatz)
+
+        # the pickled ansatz is sent with the first tasks, later tasks only send its token
+        sent = token in self._sent_tokens
+        self._sent_tokens.add(token)
+
+        qnode_kwargs_bytes = pickle.dumps(qnode_kwargs)
+        task = (token, None if sent else ansatz_bytes, qnode_fn, qnode_kwargs_bytes, method)
+
+        if method == "value":
+            items = [qml.math.to_numpy(settings) for settings in items]
+        else:
+            items = [
+                (qml.math.to_numpy(settings), None if weights is None else np.asarray(weights))
+                for settings, weights in items
+            ]
+
+        chunk_size = -(-len(items) // self.num_workers)
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        futures = [self.pool.submit(_worker_evaluate, task, chunk) for chunk in chunks]
+        chunk_results = [future.result() for future in futures]
+
+        # chunks evaluated by workers that have not cached the ansatz are resent with it
+        ansatz_task = (token, ansatz_bytes, qnode_fn, qnode_kwargs_bytes, method)
+        retries = {
+            j: self.pool.submit(_worker_evaluate, ansatz_task, chunks[j])
+            for j, results in enumerate(chunk_results)
+            if results is None
+        }
+        for j, future in retries.items():
+            chunk_results[j] = future.result()
+
+        return [result for results in chunk_results for result in results]
+
+    def map(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        """Evaluates a qnode for each settings in ``settings_list``.
+
+        :param network_ansatz: The network ansatz simulated by the qnode.
+        :type network_ansatz: NetworkAnsatz
+
+        :param qnode_fn: A qnode constructor called as ``qnode_fn(network_ansatz, **qnode_kwargs)``,
+                         e.g., :meth:`qnetvo.global_parity_expval_qnode`.
+        :type qnode_fn: function
+
+        :param settings_list: A list of qnode settings.
+        :type settings_list: list[array[float]]
+
+        :param qnode_kwargs: Keyword arguments passed to the ``qnode_fn``.
+        :type qnode_kwargs: *optional* dict
+
+        :returns: A list containing the qnode output for each settings.
+        :rtype: list[np.ndarray]
+
+        :raises ValueError: If the ``settings_list`` is traced for differentiation.
+        """
+        if _is_traced(settings_list):
+            raise ValueError(
+                "The `ProcessExecutor` only supports forward evaluation. Gradients must be "
+                + "evaluated with `map_grad`, e.g., using `qnetvo.parallel_grad_fn`."
+            )
+
+        return self._evaluate(network_ansatz, qnode_fn, settings_list, qnode_kwargs, "value")
+
+    def map_grad(
+        self,
+        network_ansatz,
+        qnode_fn,
+        settings_list,
+        natural_grad=False,
+        qnode_kwargs={},
+        weights_list=None,
+    ):
+        """Evaluates the gradient of a scalar qnode for each settings in ``settings_list``
+        (see :meth:`qnetvo.qnode_grad`).
+
+        :param network_ansatz: The network ansatz simulated by the qnode.
+        :type network_ansatz: NetworkAnsatz
+
+        :param qnode_fn: A qnode constructor called as ``qnode_fn(network_ansatz, **qnode_kwargs)``.
+        :type qnode_fn: function
+
+        :param settings_list: A list of qnode settings.
+        :type settings_list: list[array[float]]
+
+        :param natural_grad: If ``True``, the natural gradient is evaluated. Default ``False``.
+        :type natural_grad: *optional* bool
+
+        :param qnode_kwargs: Keyword arguments passed to the ``qnode_fn``.
+        :type qnode_kwargs: *optional* dict
+
+        :param weights_list: If provided, the gradient of ``weights @ qnode(settings)`` is
+                             evaluated for each pair of settings and weights, where ``None``
+                             weights differentiate the scalar qnode output directly.
+        :type weights_list: *optional* list[array[float]]
+
+        :returns: A list containing the qnode gradient for each settings.
+        :rtype: list[np.ndarray]
+
+        :raises ValueError: If ``weights_list`` and ``settings_list`` have different lengths.
+        """
+        method = "natural_grad" if natural_grad else "grad"
+        items = _grad_items(settings_list, weights_list)
+
+        return self._evaluate(network_ansatz, qnode_fn, items, qnode_kwargs, method)
@@ -1,6 +1,12 @@
 import pennylane as qml
+from pennylane import math
+import numpy as np
+from collections import deque
 from datetime import datetime
+import json
+import os
 import time
+from .utilities import write_optimization_checkpoint, read_optimization_checkpoint
 
 
 def gradient_descent(
@@ -14,6 +20,15 @@ def gradient_descent(
     interface="autograd",
     optimizer=None,
     optimizer_kwargs={},
+    trainable_mask=None,
+    multi_start=False,
+    history_width=1,
+    history_size=None,
+    history_array=None,
+    checkpoint_path=None,
+    checkpoint_width=None,
+    record_path=None,
+    resume_from=None,
 ):
     """Performs a numerical gradient descent optimization on the provided ``cost`` function.
     The optimization is seeded with (random) ``init_settings`` which are then varied to
@@ -22,7 +37,9 @@ def gradient_descent(
     :param cost: The cost function to be minimized with gradient descent.
     :type cost: function
 
-    :param init_settings: A valid input for the cost function.
+    :param init_settings: A valid input for the cost function. If a list is provided, the cost
+        is evaluated as ``cost(*init_settings)``, otherwise, the settings are treated as a single
+        array and the cost is evaluated as ``cost(init_settings)``.
     :type init_settings: array-like[float]
 
     :param num_steps: The number of gradient descent iterations, defaults to ``150``.
@@ -48,9 +65,70 @@ def gradient_descent(
                       Set to ``"adam"`` to use the ``qml.AdamOptimizer``, note that ``interface="autograd"`` must be set.
     :type optimizer: String
 
-    :param optimizer_kwargs: Keyword arguments to pass to the specified optimizer.
+    :param optimizer_kwargs: Keyword arguments to pass to the specified optimizer. For the ``"tf"``
+                             interface, they are passed to ``tf.keras.optimizers.SGD``,
+                             e.g., ``{"momentum": 0.9}``.
     :type optimizer_kwargs: Dict
 
+    :param trainable_mask: A boolean array having the same shape as an array of ``init_settings``.
+        If the ``init_settings`` are a list, the mask is indexed per element, i.e., the element
+        ``trainable_mask[j]`` masks the settings ``init_settings[j]``.
+        Settings are held constant where the mask is ``False``, see
+        :meth:`qnetvo.NetworkAnsatz.trainable_settings_mask`. Default ``None`` trains all settings.
+    :type trainable_mask: array[bool], optional
+
+    :param multi_start: If ``True``, the ``init_settings`` are a 2D array of shape
+        ``(num_starts, num_settings)`` where each row is an independent starting point
+        (see the ``num_starts`` argument of :meth:`qnetvo.NetworkAnsatz.rand_network_settings`).
+        Multi-start mode is a sequential convenience wrapper, that is, the ``cost`` and its
+        gradient are evaluated as ``cost(settings[j])`` for each start ``j`` in turn and each
+        step costs as much as ``num_starts`` independent steps.
+        The starts share one optimization loop, history, and checkpoint by minimizing the sum
+        of their costs, which has a block-diagonal gradient and therefore leaves each start's
+        trajectory unchanged.
+    :type multi_start: bool, optional
+
+    :param history_width: The number of steps between settings recorded in the
+        ``settings_history``, defaults to ``1`` which records every step. If ``None``, no
+        settings history is recorded.
+    :type history_width: int, optional
+
+    :param history_size: If provided, only the ``history_size`` most recently recorded settings
+        are kept, i.e., the history is a fixed-size ring buffer. Cannot be combined with
+        ``history_array``.
+    :type history_size: int, optional
+
+    :param history_array: A preallocated array, e.g., a ``np.memmap``, into which the settings
+        history is streamed. Each recorded settings is written as a row of floats, hence, the array
+        has shape ``(num_records, num_settings)`` (``(num_records, num_starts, num_settings)`` if
+        ``multi_start=True``) where ``num_records`` is at least the number of recorded steps.
+        The returned ``settings_history`` is a view of the filled rows.
+    :type history_array: np.ndarray, optional
+
+    :param checkpoint_path: If provided, a checkpoint containing the settings, optimizer state
+        (e.g., Adam moments), step index, NumPy random state, and the optimization data collected
+        so far is written to this path every ``checkpoint_width`` steps
+        (see :meth:`qnetvo.write_optimization_checkpoint`).
+    :type checkpoint_path: string, optional
+
+    :param checkpoint_width: The number of steps between checkpoints, defaults to ``sample_width``.
+    :type checkpoint_width: int, optional
+
+    :param record_path: If provided, a JSON record containing the ``"step"``, ``"step_time"``,
+        and, if evaluated, the ``"score"`` of each step is appended to this JSON lines file
+        (see :meth:`qnetvo.read_optimization_records`).
+    :type record_path: string, optional
+
+    :param resume_from: The path of a checkpoint from which to continue the optimization.
+        All other arguments should match the checkpointed run, in which case, the resumed run
+        reproduces the uninterrupted run. The records in ``record_path`` written after the
+        checkpoint are discarded. If a ``history_array`` is used, it must contain the rows
+        written before the checkpoint, e.g., by reopening the same ``np.memmap`` file.
+        For the ``"tf"`` interface, the checkpointed values are assigned to the
+        ``init_settings`` variables and the optimizer slots, e.g., momentum, are built for these
+        variables before their checkpointed values are restored.
+    :type resume_from: string, optional
+
     :return: Data regarding the gradient descent optimization.
     :rtype: dictionary, contains the following keys:
 
@@ -59,10 +137,28 @@ def gradient_descent(
         * **scores** (*array[float]*) - The list of rewards sampled during the gradient descent.
         * **samples** (*array[int]*) - A list containing the iteration for each sample.
         * **settings_history** (*array[array-like]*) - A list of all settings found for each
-          intermediate step of gradient descent
+          intermediate step of gradient descent, subject to the history policy set by
+          ``history_width``, ``history_size``, and ``history_array``.
+        * **history_steps** (*list[int]*) - The step of each element in ``settings_history``.
         * **datetime** (*string*) - The date and time in UTC when the optimization occurred.
         * **step_times** (*list[float]*) - The time elapsed during each sampled optimization step.
         * **step_size** (*float*) - The learning rate of the optimization.
+        * **step_scores** (*list[float]*) - The score of the settings at each of the
+          ``num_steps + 1`` steps. The score is read from the forward pass of the gradient computation
+          and is therefore recorded without additional cost evaluations. This key is omitted if a
+          custom ``grad_fn`` is provided because the cost is then only evaluated on sampled steps.
+
+        If ``multi_start=True``, the above values describe the start achieving the largest final
+        score and the following keys are added:
+
+        * **best_start** (*int*) - The index of the start having the largest final score.
+        * **start_opt_scores** (*array[float]*) - The final score of each start.
+        * **start_opt_settings** (*array[float]*) - The final settings of each start, shape
+          ``(num_starts, num_settings)``.
+        * **start_scores** (*array[float]*) - The sampled scores of each start, shape
+          ``(num_starts, num_samples)``.
+        * **start_settings_history** (*array[float]*) - The settings of all starts at each
+          recorded step, shape ``(num_records, num_starts, num_settings)``.
 
     .. warning::
 
@@ -75,6 +171,12 @@ def gradient_descent(
         which maximizes a reward function equivalent to ``-(cost)``.
 
     :raises ValueError: If the ``interface`` is not supported.
+    :raises ValueError: If the ``history_array`` has fewer rows than the number of recorded steps
+        or if both ``history_size`` and ``history_array`` are specified.
+    :raises ValueError: If the ``init_settings`` are a list and the ``trainable_mask`` has a
+        different number of elements.
+    :raises ValueError: If the optimizer state in the ``resume_from`` checkpoint does not match
+        the optimizer, e.g., because the ``optimizer_kwargs`` differ.
     """
 
     if interface == "autograd":
@@ -85,7 +187,7 @@ def gradient_descent(
     elif interface == "tf":
         from .lazy_tensorflow_import import tensorflow as tf
 
-        opt = tf.keras.optimizers.SGD(learning_rate=step_size)
+        opt = tf.keras.optimizers.SGD(learning_rate=step_size, **optimizer_kwargs)
     else:
         raise ValueError('Interface "' + interface + '" is not supported.')
 
@@ -93,56 +195,273 @@ def gradient_descent(
     scores = []
     samples = []
     step_times = []
-    settings_history = [init_settings]
+
+    if history_array is not None:
+        if history_size is not None:
+            raise ValueError("Only one of `history_size` and `history_array` can be specified.")
+
+        num_records = 0 if history_width is None else len(range(0, num_steps + 1, history_width))
+        if len(history_array) < num_records:
+            raise ValueError("The `history_array` requires at least " + str(num_records) + " rows.")
+        settings_history = history_array
+    else:
+        settings_history = [] if history_size is None else deque(maxlen=history_size)
+
+    history_steps = [] if history_size is None else deque(maxlen=history_size)
+
+    def record_settings(step, settings):
+        if history_width is None or step % history_width != 0:
+            return
+
+        if history_array is not None:
+            history_array[len(history_steps)] = math.to_numpy(
+                settings if is_settings_array else math.stack(settings)
+            )
+        else:
+            settings_history.append(math.to_numpy(settings) if multi_start else settings)
+
+        history_steps.append(step)
+
+    is_settings_array = not isinstance(init_settings, (list, tuple))
+    cost_args = (lambda settings: [settings]) if is_settings_array else (lambda settings: settings)
+
+    # the mask of each argument passed to the cost
+    if trainable_mask is not None:
+        if not is_settings_array and len(trainable_mask) != len(init_settings):
+            raise ValueError(
+                "The `trainable_mask` must have one element per element of the `init_settings`."
+            )
+        arg_masks = cost_args(trainable_mask)
+
+    # the cost is obtained from the forward pass of the gradient unless a custom ``grad_fn`` is used
+    fused_cost = interface == "tf" or grad_fn is None
+    step_scores = []
+
+    if multi_start:
+        start_cost = cost
+        num_starts = math.shape(init_settings)[0]
+        fused_start_costs = {}
+
+        def start_costs(settings):
+            # each start is evaluated sequentially
+            return math.stack([start_cost(settings[j]) for j in range(num_starts)])
+
+        def cost(settings):
+            fused_start_costs["costs"] = start_costs(settings)
+            return math.sum(fused_start_costs["costs"])
+
+        start_scores = []
 
     start_datetime = datetime.utcnow()
     elapsed = 0
+    start_step = 0
+
+    if resume_from is not None:
+        checkpoint = read_optimization_checkpoint(resume_from)
+
+        start_step = checkpoint["step"]
+        start_datetime = checkpoint["datetime"]
+        elapsed = checkpoint["elapsed"]
+        scores = checkpoint["scores"]
+        samples = checkpoint["samples"]
+        step_times = checkpoint["step_times"]
+        step_scores = checkpoint["step_scores"]
+        history_steps.extend(checkpoint["history_steps"])
+        if history_array is None:
+            settings_history.extend(checkpoint["settings_history"])
+        if multi_start:
+            start_scores = checkpoint["start_scores"]
 
-    # performing gradient descent
-    for i in range(num_steps):
-        if i % sample_width == 0:
-            score = -(cost(*settings))
-            scores.append(score)
-            samples.append(i)
+        if interface == "autograd":
+            settings = checkpoint["settings"]
+            opt.__dict__.update(checkpoint["optimizer_state"])
+        elif interface == "tf":
+            for var, val in zip(cost_args(settings), cost_args(checkpoint["settings"])):
+                if isinstance(var, tf.Variable):
+                    var.assign(val)
 
-            if verbose:
-                print("iteration : ", i, ", score : ", score)
+            # the optimizer slots are created lazily and must be built before they are restored
+            opt.build([var for var in cost_args(settings) if isinstance(var, tf.Variable)])
+            if len(opt.variables) != len(checkpoint["optimizer_state"]):
+                raise ValueError("The checkpointed optimizer state does not match the optimizer.")
+
+            for var, val in zip(opt.variables, checkpoint["optimizer_state"]):
+                var.assign(val)
+
+        np.random.set_state(checkpoint["random_state"])
+
+        if record_path is not None:
+            with open(record_path, "a") as file:
+                file.truncate(checkpoint["record_offset"])
+    else:
+        record_settings(0, init_settings)
+
+    checkpoint_width = checkpoint_width or sample_width
+
+    # TensorFlow variables are stored as NumPy arrays in the checkpoint
+    def checkpoint_settings(settings):
+        if interface == "autograd":
+            return settings
+
+        return math.to_numpy(settings) if is_settings_array else list(map(math.to_numpy, settings))
+
+    # performing gradient descent
+    for i in range(start_step, num_steps):
+        if i % sample_width == 0 and not fused_cost:
+            step_cost = cost(*cost_args(settings))
 
         start = time.time()
         if interface == "autograd":
-            settings = opt.step(cost, *settings, grad_fn=grad_fn)
-            if not (isinstance(settings, list)):
-                settings = [settings]
+            args = cost_args(settings)
+            grads, forward = opt.compute_grad(cost, args, {}, grad_fn=grad_fn)
+            if trainable_mask is not None:
+                # gradients are only returned for the trainable arguments
+                trainable_masks = [
+                    mask
+                    for mask, arg in zip(arg_masks, args)
+                    if getattr(arg, "requires_grad", False)
+                ]
+                grads = tuple(mask * grad for mask, grad in zip(trainable_masks, grads))
+
+            new_args = opt.apply_grad(grads, args)
+            settings = new_args[0] if is_settings_array else new_args
+
+            step_cost = forward if fused_cost else step_cost
         elif interface == "tf":
+            tf_settings = cost_args(settings)
             with tf.GradientTape() as tape:
-                tf_cost = cost(*settings)
+                step_cost = cost(*tf_settings)
+
+            gradients = tape.gradient(step_cost, tf_settings)
+            if trainable_mask is not None:
+                gradients = [
+                    grad * tf.cast(mask, grad.dtype) for mask, grad in zip(arg_masks, gradients)
+                ]
 
-            gradients = tape.gradient(tf_cost, settings)
-            opt.apply_gradients(zip(gradients, settings))
+            opt.apply_gradients(zip(gradients, tf_settings))
 
         elapsed = time.time() - start
 
+        if fused_cost or i % sample_width == 0:
+            if multi_start:
+                step_start_scores = -math.to_numpy(fused_start_costs["costs"])
+                score = max(step_start_scores)
+            else:
+                score = -(step_cost)
+
+            if fused_cost:
+                step_scores.append(score)
+
         if i % sample_width == 0:
+            scores.append(score)
+            samples.append(i)
             step_times.append(elapsed)
 
+            if multi_start:
+                start_scores.append(step_start_scores)
+
             if verbose:
+                print("iteration : ", i, ", score : ", score)
                 print("elapsed time : ", elapsed)
 
-        settings_history.append(settings)
+        record_settings(i + 1, settings)
+
+        if record_path is not None:
+            record = {"step": i, "step_time": elapsed}
+            if fused_cost or i % sample_width == 0:
+                record["score"] = float(score)
+
+            with open(record_path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+
+        if checkpoint_path is not None and (i + 1) % checkpoint_width == 0:
+            write_optimization_checkpoint(
+                {
+                    "step": i + 1,
+                    "settings": checkpoint_settings(settings),
+                    "optimizer_state": (
+                        vars(opt)
+                        if interface == "autograd"
+                        else [var.numpy() for var in opt.variables]
+                    ),
+                    "random_state": np.random.get_state(),
+                    "datetime": start_datetime,
+                    "elapsed": elapsed,
+                    "scores": scores,
+                    "samples": samples,
+                    "step_times": step_times,
+                    "step_scores": step_scores,
+                    "start_scores": start_scores if multi_start else None,
+                    "history_steps": list(history_steps),
+                    "settings_history": (
+                        None
+                        if history_array is not None
+                        else list(map(checkpoint_settings, settings_history))
+                    ),
+                    "record_offset": (
+                        os.path.getsize(record_path) if record_path is not None else 0
+                    ),
+                },
+                checkpoint_path,
+            )
 
-    opt_score = -(cost(*settings))
     step_times.append(elapsed)
-
-    scores.append(opt_score)
     samples.append(num_steps)
 
-    return {
-        "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "opt_score": opt_score,
-        "opt_settings": settings,
-        "scores": scores,
-        "samples": samples,
-        "settings_history": settings_history,
-        "step_times": step_times,
-        "step_size": step_size,
-    }
+    if history_array is not None:
+        settings_history = history_array[0 : len(history_steps)]
+    else:
+        settings_history = list(settings_history)
+    history_steps = list(history_steps)
+
+    if multi_start:
+        start_scores.append(-math.to_numpy(start_costs(settings)))
+        start_scores = math.stack(start_scores, axis=1)
+        best_start = int(math.argmax(start_scores[:, -1]))
+
+        start_settings_history = np.reshape(
+            np.asarray(settings_history), (-1,) + tuple(math.shape(init_settings))
+        )
+
+        if fused_cost:
+            step_scores.append(max(start_scores[:, -1]))
+
+        opt_dict = {
+            "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "opt_score": start_scores[best_start, -1],
+            "opt_settings": settings[best_start],
+            "scores": list(start_scores[best_start]),
+            "samples": samples,
+            "settings_history": list(start_settings_history[:, best_start]),
+            "history_steps": history_steps,
+            "step_times": step_times,
+            "step_size": step_size,
+            "best_start": best_start,
+            "start_opt_scores": start_scores[:, -1],
+            "start_opt_settings": math.to_numpy(settings),
+            "start_scores": start_scores,
+            "start_settings_history": start_settings_history,
+        }
+    else:
+        opt_score = -(cost(*cost_args(settings)))
+        scores.append(opt_score)
+
+        if fused_cost:
+            step_scores.append(opt_score)
+
+        opt_dict = {
+            "datetime": start_datetime.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "opt_score": opt_score,
+            "opt_settings": settings,
+            "scores": scores,
+            "samples": samples,
+            "settings_history": settings_history,
+            "history_steps": history_steps,
+            "step_times": step_times,
+            "step_size": step_size,
+        }
+
+    if fused_cost:
+        opt_dict["step_scores"] = step_scores
+
+    return opt_dict
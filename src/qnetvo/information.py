@@ -1,10 +1,19 @@
 from pennylane import math
 from .qnodes import joint_probs_qnode
-from .utilities import mixed_base_num, ragged_reshape
+from .network_ansatz import NetworkInputs
+from .executors import SerialExecutor
+from .postprocessing import _structured_postmap
 from pennylane import numpy as np
 
 
-def behavior_fn(network_ansatz, postmap=np.array([]), qnode_kwargs={}):
+def behavior_fn(
+    network_ansatz,
+    postmap=np.array([]),
+    qnode_kwargs={},
+    broadcast=False,
+    executor=None,
+    chunk_size=1024,
+):
     """Creates an ansatz-specific function for constructing the behavior matrix.
 
     A behavior function is created as ``P_Net = behavior(network_ansatz)``
@@ -37,45 +46,74 @@ def behavior_fn(network_ansatz, postmap=np.array([]), qnode_kwargs={}):
     :param postmap: A post-processing map applied to the bitstrings output from the
                      quantum circuit. The ``postmap`` matrix is column stochastic, that is,
                      each column sums to one and contains only positive values.
-    :type postmap: *optional* np.ndarray
+                     Deterministic postmaps are applied as a :class:`qnetvo.CoarseGrainingPostmap`.
+    :type postmap: *optional* np.ndarray or CoarseGrainingPostmap
+
+    :param broadcast: If ``True``, all columns of the behavior are evaluated in one qnode execution
+                      using parameter broadcasting (see :meth:`qnetvo.NetworkAnsatz.broadcast_qnode_settings`).
+                      Default ``False``.
+    :type broadcast: *optional* bool
+
+    :param executor: The executor through which the qnodes are evaluated (see :class:`qnetvo.Executor`).
+                     By default, qnodes are evaluated serially.
+    :type executor: *optional* Executor
+
+    :param chunk_size: The maximum number of input combinations submitted to the ``executor``
+                       at a time (see :meth:`qnetvo.NetworkInputs.chunks`). Default ``1024``.
+    :type chunk_size: *optional* int
 
     :returns: A function ``P_Net(network_settings)`` that evaluates the
               behavior matrix for a given set of settings.
     :rtype: function
-    """
-    # num_in_prep_nodes = [node.num_in for node in network_ansatz.layers[0]]
-    # num_in_meas_nodes = [node.num_in for node in network_ansatz.layers[-1]]
 
-    # base_digits = num_in_prep_nodes + num_in_meas_nodes
-    # net_num_in = math.prod(base_digits)
+    The qnode executions of a behavior evaluation are submitted to the ``executor`` in batches of
+    at most ``chunk_size`` input combinations, and the behavior matrix is differentiable with respect to the ``network_settings``.
+    Hence, any differentiable function of the behavior can be optimized, e.g.,
 
-    # raw_net_num_out = 2 ** len(network_ansatz.layers_wires[-1])
+    .. code-block:: python
 
-    probs_qnode = joint_probs_qnode(network_ansatz, **qnode_kwargs)
+        P_Net = qnetvo.behavior_fn(network_ansatz)
+        cost = lambda settings: -qml.math.trace(P_Net(settings))
 
-    net_num_in = math.prod(network_ansatz.layers_total_num_in)
-    num_inputs_list = math.concatenate(network_ansatz.layers_node_num_in).tolist()
-    node_input_ids = [
-        ragged_reshape(mixed_base_num(i, num_inputs_list), network_ansatz.layers_num_nodes)
-        for i in range(net_num_in)
-    ]
+        settings = network_ansatz.network_settings_array(network_ansatz.rand_network_settings())
+        grad = qml.grad(cost)(settings)
+    """
+    if executor is None:
+        executor = SerialExecutor()
+
+    executor.prepare(network_ansatz, joint_probs_qnode, qnode_kwargs)
+
+    node_input_ids = NetworkInputs(network_ansatz)
 
     raw_net_num_out = 2 ** len(network_ansatz.layers_wires[-1])
 
+    postmap = _structured_postmap(postmap)
     has_postmap = len(postmap) != 0
     if has_postmap:
         if postmap.shape[1] != raw_net_num_out:
             raise ValueError("The `postmap` must have " + str(raw_net_num_out) + " columns.")
 
-    # node_input_ids = [mixed_base_num(i, base_digits) for i in range(net_num_in)]
-
-    # probs_qnode = joint_probs_qnode(network_ansatz, **qnode_kwargs)
-
     def behavior(network_settings):
-        raw_behavior = np.zeros((raw_net_num_out, net_num_in))
-        for i, input_id_set in enumerate(node_input_ids):
-            settings = network_ansatz.qnode_settings(network_settings, input_id_set)
-            raw_behavior[:, i] += probs_qnode(settings)
+        if broadcast:
+            settings = network_ansatz.broadcast_qnode_settings(network_settings, node_input_ids)
+            probs_vec = executor.map(network_ansatz, joint_probs_qnode, [settings], qnode_kwargs)[0]
+            raw_behavior = math.transpose(probs_vec)
+
+            return postmap @ raw_behavior if has_postmap else raw_behavior
+
+        # input combinations are streamed in chunks to bound the memory of the settings
+        probs_vecs = []
+        for inputs_chunk in node_input_ids.chunks(chunk_size):
+            settings_list = [
+                network_ansatz.qnode_settings(network_settings, input_id_set)
+                for input_id_set in inputs_chunk
+            ]
+            probs_vecs += executor.map(
+                network_ansatz, joint_probs_qnode, settings_list, qnode_kwargs
+            )
+
+        # columns are stacked rather than assigned in place so that the behavior is differentiable
+        raw_behavior = math.stack(probs_vecs, axis=1)
 
         return postmap @ raw_behavior if has_postmap else raw_behavior
 
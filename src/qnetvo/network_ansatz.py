@@ -1,5 +1,6 @@
 import pennylane as qml
 from pennylane import numpy as qnp
+import numpy as np
 from pennylane import math
 
 from .network_nodes import *
@@ -38,6 +39,8 @@ class NetworkAnsatz:
     * **layers_total_num_in** - ``list[int]``, The total number of inputs for each layer.
     * **layers_node_num_in** - ``list[list[int]]``, The number of inputs for each node in the layer.
     * **layers_num_nodes** - ``list[int]``, The number of nodes in each layer.
+    * **num_settings** - ``int``, The total number of settings used by the network ansatz.
+    * **qnode_num_settings** - ``int``, The number of settings passed to a qnode simulating the network.
     * **network_wires** - The list of wires used by the network ansatz.
     * **network_cc_wires** - The list of classical communication wires in the network.
     * **num_cc_wires** - The number of classical communication wires.
@@ -90,18 +93,39 @@ class NetworkAnsatz:
         # ansatz function attributes
         self.fn = self.ansatz_circuit_fn()
         self.parameter_partitions = self.get_network_parameter_partitions()
+        self.num_settings = self.parameter_partitions[-1][-1][-1][-1]
+        self.qnode_num_settings = int(math.sum(self.layers_num_settings))
+
+        self._qnode_settings_ids_cache = {}
 
     def __call__(self, settings=[]):
         self.fn(settings)
 
-    def ansatz_circuit_fn(self):
-        layer_fns = [self.circuit_layer_fn(layer_nodes) for layer_nodes in self.layers]
+    def __getstate__(self):
+        # the ansatz is pickled by its description and reconstructed upon unpickling
+        return {"layers": self.layers, "dev_kwargs": self.dev_kwargs}
+
+    def __setstate__(self, state):
+        self.__init__(*state["layers"], dev_kwargs=state["dev_kwargs"])
+
+    def ansatz_circuit_fn(self, layer_ids=None):
+        """Constructs a quantum function that sequentially applies the specified network layers.
+
+        :param layer_ids: The ids of the layers to apply. By default, all layers are applied.
+        :type layer_ids: *optional* list[int]
+
+        :returns: A quantum function evaluated as ``ansatz_circuit(settings)`` where ``settings``
+                  contains the settings of the specified layers in order.
+        :rtype: function
+        """
+        layer_ids = range(len(self.layers)) if layer_ids is None else layer_ids
+        layer_fns = [self.circuit_layer_fn(self.layers[i]) for i in layer_ids]
 
         def ansatz_circuit(settings=[]):
             cc_wires = [None] * self.num_cc_wires
 
             start_id = 0
-            for i, layer_fn in enumerate(layer_fns):
+            for i, layer_fn in zip(layer_ids, layer_fns):
                 end_id = start_id + self.layers_num_settings[i]
                 layer_settings = settings[start_id:end_id]
                 layer_fn(layer_settings, cc_wires)
@@ -247,11 +271,82 @@ class NetworkAnsatz:
 
         return settings
 
+    def network_settings_array(self, network_settings):
+        """Represents the network settings as a contiguous 1D array.
+
+        Network settings are either a list of scalar settings, as returned by
+        :meth:`rand_network_settings`, or a single 1D array, as returned by
+        ``rand_network_settings(as_array=True)``.
+        Since cost functions are called as ``cost(*network_settings)``, a settings array
+        passed as ``cost(settings_array)`` is received as the one-element tuple
+        ``(settings_array,)``, which is unwrapped here.
+
+        :param network_settings: The settings for the network ansatz.
+        :type network_settings: list[float] or array[float]
+
+        :returns: A 1D array containing all network settings.
+        :rtype: array[float]
+        """
+        if isinstance(network_settings, (list, tuple)):
+            if len(network_settings) == 1 and qml.math.ndim(network_settings[0]) == 1:
+                return network_settings[0]
+
+            return qml.math.stack(network_settings)
+
+        return network_settings
+
+    def qnode_settings_ids(self, network_inputs):
+        """Constructs the index array that gathers the qnode settings from a 1D array of
+        network settings, i.e., ``qnode_settings = network_settings[qnode_settings_ids]``.
+
+        The index array is computed once for each combination of network inputs and cached
+        on the ansatz.
+
+        :param network_inputs: The classical inputs passed to each network node.
+        :type network_inputs: List[List[int]]
+
+        :returns: A 1D integer array of length ``qnode_num_settings``.
+        :rtype: np.ndarray
+        """
+        key = tuple(tuple(layer_inputs) for layer_inputs in network_inputs)
+
+        if key not in self._qnode_settings_ids_cache:
+            ids = [
+                np.arange(*self.parameter_partitions[i][j][node_input])
+                for i, layer_inputs in enumerate(network_inputs)
+                for j, node_input in enumerate(layer_inputs)
+            ]
+            self._qnode_settings_ids_cache[key] = np.concatenate(ids + [np.array([], dtype=int)])
+
+        return self._qnode_settings_ids_cache[key]
+
+    def qnode_settings_ids_matrix(self, network_inputs_list):
+        """Constructs a dense index matrix for gathering the qnode settings of many network inputs at once.
+
+        :param network_inputs_list: A list of classical network inputs.
+        :type network_inputs_list: List[List[List[int]]] or NetworkInputs
+
+        :returns: An integer array with dimensions ``(len(network_inputs_list), qnode_num_settings)``
+                  where each row is the :meth:`qnode_settings_ids` of the corresponding network inputs.
+        :rtype: np.ndarray
+        """
+        if isinstance(network_inputs_list, NetworkInputs):
+            return network_inputs_list.qnode_settings_ids_matrix()
+
+        return np.array(
+            [self.qnode_settings_ids(network_inputs) for network_inputs in network_inputs_list],
+            dtype=int,
+        ).reshape((len(network_inputs_list), self.qnode_num_settings))
+
     def qnode_settings(self, network_settings, network_inputs):
         """Constructs a list of settings to pass to the qnode executing the network ansatz.
 
-        :param network_settings: The settings for the network ansatz scenario.
-        :type network_settings: list[list[np.ndarray]]
+        The settings are gathered from the network settings with a single index operation
+        using the precomputed :meth:`qnode_settings_ids`.
+
+        :param network_settings: The settings for the network ansatz scenario, either a list
+                                 of scalars or a 1D array (see :meth:`network_settings_array`).
+        :type network_settings: list[float] or array[float]
 
         :param network_inputs: The classical inputs passed to each network node.
         :type network_inputs: List[List[int]]
@@ -259,18 +354,51 @@ class NetworkAnsatz:
         :returns: A list of settings to pass to the constructed qnode.
         :rtype: np.array
         """
-        settings = []
-        for i, layer_inputs in enumerate(network_inputs):
-            settings += self.layer_settings(network_settings, i, layer_inputs)
+        settings_array = self.network_settings_array(network_settings)
+
+        return qml.math.take(settings_array, self.qnode_settings_ids(network_inputs))
+
+    def broadcast_qnode_settings(self, network_settings, network_inputs_list):
+        """Constructs the qnode settings for many network inputs as a single array
+        suitable for `PennyLane parameter broadcasting`_.
+
+        The settings of each network input are stacked along the last axis so that
+        each node receives settings whose elements are 1D arrays with one value per network input.
+        A single qnode execution then evaluates all network inputs where the qnode output
+        has a leading batch dimension of size ``len(network_inputs_list)``.
+
+        .. _PennyLane parameter broadcasting: https://docs.pennylane.ai/en/stable/introduction/circuits.html#parameter-broadcasting-in-qnodes
+
+        .. note::
+
+            Broadcasting requires that the node ansatz functions apply each setting as a gate
+            parameter, e.g., ``qml.RY(settings[0], wires=wires[0])``, as is done
+            by ansatz library functions such as :meth:`qnetvo.local_RY`.
+
+        :param network_settings: The settings for the network ansatz scenario, either a list
+                                 of scalars or a 1D array (see :meth:`network_settings_array`).
+        :type network_settings: list[float] or array[float]
+
+        :param network_inputs_list: A list of classical network inputs.
+        :type network_inputs_list: List[List[List[int]]] or NetworkInputs
+
+        :returns: An array with dimensions ``(qnode_num_settings, len(network_inputs_list))``.
+        :rtype: np.array
+        """
+        settings_array = self.network_settings_array(network_settings)
+        ids_matrix = self.qnode_settings_ids_matrix(network_inputs_list)
 
-        return qml.math.stack(settings)
+        return qml.math.transpose(qml.math.take(settings_array, ids_matrix))
 
     def expand_qnode_settings(self, qn_settings, network_inputs):
         """Constructs network settings from qnode settings and the network inputs.
 
-        This implements the reverse mapping implemented in :meth:`qnetvo.NetworkAnsatz.qnode_settings`.
+        This implements the reverse mapping implemented in :meth:`qnetvo.NetworkAnsatz.qnode_settings`
+        as a scatter-add using the precomputed :meth:`qnode_settings_ids`.
         Since there are fewer qnode settings than network settings, empty elements in the returned
-        list are set to zero.
+        array are set to zero.
+        The scatter-add is differentiable and the returned array has the same interface as
+        the ``qn_settings``, e.g., autograd or TensorFlow.
 
         :param qn_settings: Settings to pass to the network qnode.
         :type qn_settings: array[float]
@@ -281,22 +409,20 @@ class NetworkAnsatz:
         :returns: The network settings
         :rtype: array[float]
         """
-        expanded_settings = self.zero_network_settings()
+        if math.get_interface(qn_settings) == "numpy":
+            qn_settings = qnp.array(qn_settings, dtype=np.result_type(qn_settings, float))
 
-        qn_start_id = 0
-        for i, layer_inputs in enumerate(network_inputs):
-            for j, node_input in enumerate(layer_inputs):
-                node = self.layers[i][j]
-                qn_stop_id = qn_start_id + node.num_settings
-                start_id, stop_id = self.parameter_partitions[i][j][node_input]
-
-                expanded_settings[start_id:stop_id] = qn_settings[qn_start_id:qn_stop_id]
-
-                qn_start_id = qn_stop_id
+        zero_settings = math.cast_like(
+            math.convert_like(np.zeros(self.num_settings), qn_settings), qn_settings
+        )
 
-        return qml.math.stack(expanded_settings)
+        return math.scatter_element_add(
+            zero_settings, (self.qnode_settings_ids(network_inputs),), qn_settings
+        )
 
-    def rand_network_settings(self, fixed_setting_ids=[], fixed_settings=[]):
+    def rand_network_settings(
+        self, fixed_setting_ids=[], fixed_settings=[], as_array=False, num_starts=None
+    ):
         """Creates an array of randomized differentiable settings for the network ansatz.
         If fixed settings are specified, then they are marked as ``requires_grad=False`` and
         not differentatiated during optimzation.
@@ -308,12 +434,36 @@ class NetworkAnsatz:
         :param fixed_settings: The constant values for fixed settings.
         :type fixed_settings: *optional* List[Float]
 
-        :returns: A 1D list of ``qnp.tensor`` scalar values having ``requires_grad=True``.
-        :rtype: List[Float]
+        :param as_array: If ``True``, the settings are returned as a single contiguous 1D
+                         ``qnp.tensor`` having ``requires_grad=True``. Since the fixed settings
+                         cannot be marked individually, they are instead held constant by
+                         passing :meth:`trainable_settings_mask` to :meth:`qnetvo.gradient_descent`.
+                         Default ``False``.
+        :type as_array: *optional* Bool
+
+        :param num_starts: If provided, a batch of ``num_starts`` random settings arrays is returned
+                           as a 2D ``qnp.tensor`` of shape ``(num_starts, num_settings)``, e.g., for
+                           a multi-start optimization with :meth:`qnetvo.gradient_descent`.
+                           Implies ``as_array=True``. Default ``None``.
+        :type num_starts: *optional* Int
+
+        :returns: A 1D list of ``qnp.tensor`` scalar values having ``requires_grad=True``,
+                  a 1D ``qnp.tensor`` if ``as_array=True``, or a 2D ``qnp.tensor`` if
+                  ``num_starts`` is provided.
+        :rtype: List[Float] or array[float]
         """
-        num_settings = self.parameter_partitions[-1][-1][-1][-1]
+        if as_array or num_starts is not None:
+            shape = self.num_settings if num_starts is None else (num_starts, self.num_settings)
+            rand_settings = qnp.array(
+                2 * qnp.pi * qnp.random.rand(*qnp.atleast_1d(shape)) - qnp.pi, requires_grad=True
+            )
+            if len(fixed_setting_ids) > 0 and len(fixed_settings) > 0:
+                rand_settings[..., fixed_setting_ids] = fixed_settings
+
+            return rand_settings
+
         rand_settings = [
-            qnp.array(2 * qnp.pi * qnp.random.rand() - qnp.pi) for _ in range(num_settings)
+            qnp.array(2 * qnp.pi * qnp.random.rand() - qnp.pi) for _ in range(self.num_settings)
         ]
         if len(fixed_setting_ids) > 0 and len(fixed_settings) > 0:
             for i, id in enumerate(fixed_setting_ids):
@@ -321,7 +471,9 @@ class NetworkAnsatz:
 
         return rand_settings
 
-    def tf_rand_network_settings(self, fixed_setting_ids=[], fixed_settings=[]):
+    def tf_rand_network_settings(
+        self, fixed_setting_ids=[], fixed_settings=[], as_array=False, num_starts=None
+    ):
         """Creates a randomized settings array for the network ansatz using TensorFlow
         tensor types.
 
@@ -332,22 +484,204 @@ class NetworkAnsatz:
         :param fixed_settings: The constant values for fixed settings.
         :type fixed_settings: *optional* List[Float]
 
-        :returns: A 1D list of ``tf.Variable`` and ``tf.constant`` scalar values.
-        :rtype: List[tf.Tensor]
+        :param as_array: If ``True``, the settings are returned as a single 1D ``tf.Variable``.
+                         Fixed settings are then held constant using :meth:`trainable_settings_mask`.
+                         Default ``False``.
+        :type as_array: *optional* Bool
+
+        :param num_starts: If provided, a 2D ``tf.Variable`` of shape ``(num_starts, num_settings)``
+                           is returned. Implies ``as_array=True``. Default ``None``.
+        :type num_starts: *optional* Int
+
+        :returns: A 1D list of ``tf.Variable`` and ``tf.constant`` scalar values, a 1D
+                  ``tf.Variable`` if ``as_array=True``, or a 2D ``tf.Variable`` if
+                  ``num_starts`` is provided.
+        :rtype: List[tf.Tensor] or tf.Variable
         """
         from .lazy_tensorflow_import import tensorflow as tf
 
-        np_settings = self.rand_network_settings(fixed_setting_ids, fixed_settings)
+        np_settings = self.rand_network_settings(
+            fixed_setting_ids, fixed_settings, as_array, num_starts
+        )
+        if as_array or num_starts is not None:
+            return tf.Variable(np_settings.numpy())
+
         return [
             tf.Variable(setting) if qml.math.requires_grad(setting) else tf.constant(setting)
             for setting in np_settings
         ]
 
-    def zero_network_settings(self):
+    def zero_network_settings(self, as_array=False):
         """Creates a settings array for the network ansatz that consists of zeros.
 
-        :returns: A 1D list of ``np.tensor`` scalar values having ``requires_grad=True``.
-        :rtype: List[Float]
+        :param as_array: If ``True``, the settings are returned as a single contiguous 1D
+                         ``qnp.tensor``. Default ``False``.
+        :type as_array: *optional* Bool
+
+        :returns: A 1D list of ``np.tensor`` scalar values having ``requires_grad=True``,
+                  or a 1D ``qnp.tensor`` if ``as_array=True``.
+        :rtype: List[Float] or array[float]
+        """
+        if as_array:
+            return qnp.zeros(self.num_settings, requires_grad=True)
+
+        return [qnp.array(0, requires_grad=True) for _ in range(self.num_settings)]
+
+    def trainable_settings_mask(self, fixed_setting_ids=[]):
+        """Creates a mask that marks the trainable elements of a 1D settings array.
+
+        The mask is passed to :meth:`qnetvo.gradient_descent` as ``trainable_mask`` to hold the
+        ``fixed_setting_ids`` constant when the settings are represented as a single array
+        (see :meth:`rand_network_settings`).
+
+        :param fixed_setting_ids: The ids of settings that are held constant during optimization.
+        :type fixed_setting_ids: *optional* List[Int]
+
+        :returns: A 1D boolean array that is ``False`` for fixed settings and ``True`` otherwise.
+        :rtype: np.ndarray
         """
-        num_settings = self.parameter_partitions[-1][-1][-1][-1]
-        return [qnp.array(0, requires_grad=True) for _ in range(num_settings)]
+        mask = np.ones(self.num_settings, dtype=bool)
+        mask[list(fixed_setting_ids)] = False
+
+        return mask
+
+
+class NetworkInputs:
+    """A lazy enumeration of the classical input combinations of a network ansatz.
+
+    The ``k`` th combination assigns to each node an input given by the mixed base digits of ``k``
+    where the first node of the first layer is the most significant digit
+    (see :meth:`qnetvo.mixed_base_num`).
+    Each combination is a ragged list of network inputs ``[[x_0, ...], ..., [..., y_n]]``
+    suitable for :meth:`qnetvo.NetworkAnsatz.qnode_settings`.
+
+    Combinations are computed on demand from integer arrays using ``np.unravel_index``,
+    hence, large input spaces support random access, e.g., ``network_inputs[k]``, and can be
+    streamed with bounded memory using :meth:`chunks`.
+
+    .. code-block:: python
+
+        network_inputs = qnetvo.NetworkInputs(network_ansatz)
+
+        for network_inputs_list in network_inputs.chunks(1024):
+            settings_list = [
+                network_ansatz.qnode_settings(network_settings, inputs)
+                for inputs in network_inputs_list
+            ]
+
+    :param network_ansatz: The network ansatz whose input combinations are enumerated.
+    :type network_ansatz: NetworkAnsatz
+
+    ATTRIBUTES:
+
+    * **node_num_in** - ``list[int]``, The number of inputs of each node ordered by layer.
+    * **num_inputs** - ``int``, The number of input combinations, ``prod(node_num_in)``.
+    """
+
+    def __init__(self, network_ansatz):
+        self.network_ansatz = network_ansatz
+        self.node_num_in = [
+            num_in for layer in network_ansatz.layers_node_num_in for num_in in layer
+        ]
+        self.num_inputs = int(math.prod(self.node_num_in))
+
+        self._layer_bounds = np.cumsum([0] + list(network_ansatz.layers_num_nodes))
+
+        # the settings of each node's input x are the slice offset + x * num_settings
+        nodes = [node for layer in network_ansatz.layers for node in layer]
+        partitions = [
+            node_partitions
+            for layer in network_ansatz.parameter_partitions
+            for node_partitions in layer
+        ]
+        self._node_settings_offsets = [node_partitions[0][0] for node_partitions in partitions]
+        self._node_num_settings = [node.num_settings for node in nodes]
+
+    def __len__(self):
+        return self.num_inputs
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.num_inputs)
+            return [self._nest(ids) for ids in self.input_ids_array(start, stop, step)]
+
+        index = key + self.num_inputs if key < 0 else key
+        if not 0 <= index < self.num_inputs:
+            raise IndexError("The index " + str(key) + " is out of range.")
+
+        return self._nest(self.input_ids_array(index, index + 1)[0])
+
+    def __iter__(self):
+        for network_inputs_list in self.chunks():
+            yield from network_inputs_list
+
+    def _nest(self, ids):
+        return [
+            ids[self._layer_bounds[i] : self._layer_bounds[i + 1]].tolist()
+            for i in range(len(self._layer_bounds) - 1)
+        ]
+
+    def input_ids_array(self, start=0, stop=None, step=1):
+        """Constructs the node inputs for a range of input combinations.
+
+        :param start: The first combination. Default ``0``.
+        :type start: *optional* int
+
+        :param stop: The end of the range. Default ``num_inputs``.
+        :type stop: *optional* int
+
+        :param step: The step between combinations. Default ``1``.
+        :type step: *optional* int
+
+        :returns: An integer array with dimensions ``(num_combinations, len(node_num_in))`` whose rows
+                  are the inputs of each node.
+        :rtype: np.ndarray
+        """
+        stop = self.num_inputs if stop is None else stop
+
+        return np.stack(
+            np.unravel_index(np.arange(start, stop, step), self.node_num_in), axis=1
+        ).astype(int)
+
+    def chunks(self, chunk_size=1024):
+        """Iterates over the input combinations in chunks.
+
+        :param chunk_size: The maximum number of combinations in each chunk. Default ``1024``.
+        :type chunk_size: *optional* int
+
+        :returns: A generator of lists of network inputs.
+        :rtype: generator
+
+        :raises ValueError: If ``chunk_size < 1``.
+        """
+        if chunk_size < 1:
+            raise ValueError("The `chunk_size` must be at least 1.")
+
+        for start in range(0, self.num_inputs, chunk_size):
+            yield self[start : start + chunk_size]
+
+    def qnode_settings_ids_matrix(self, start=0, stop=None):
+        """Constructs the index matrix gathering the qnode settings for a range of input combinations
+        without enumerating nested lists (see :meth:`qnetvo.NetworkAnsatz.qnode_settings_ids_matrix`).
+
+        :param start: The first combination. Default ``0``.
+        :type start: *optional* int
+
+        :param stop: The end of the range. Default ``num_inputs``.
+        :type stop: *optional* int
+
+        :returns: An integer array with dimensions ``(num_combinations, qnode_num_settings)``.
+        :rtype: np.ndarray
+        """
+        input_ids = self.input_ids_array(start, stop)
+
+        ids_blocks = [
+            (offset + input_ids[:, [k]] * num_settings) + np.arange(num_settings)
+            for k, (offset, num_settings) in enumerate(
+                zip(self._node_settings_offsets, self._node_num_settings)
+            )
+        ]
+
+        return np.concatenate(
+            ids_blocks + [np.zeros((len(input_ids), 0), dtype=int)], axis=1
+        ).astype(int)
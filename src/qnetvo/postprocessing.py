@@ -1,3 +1,4 @@
+from pennylane import math
 from pennylane import numpy as np
 
 
@@ -31,3 +32,223 @@ def even_parity_ids(n_qubits):
     """
     p_vec = parity_vector(n_qubits)
     return np.argwhere(p_vec == 1).flatten()
+
+
+def parity_sign_vector(n_qubits, qubit_ids):
+    """Constructs a vector with elements :math:`\\pm 1` describing the parity of the
+    subset of bits ``qubit_ids`` in each :math:`n`-bit string measured from :math:`n`-qubits.
+
+    The inner product of this vector with a probability vector measured in the computational
+    basis yields the expectation of the parity observable :math:`\\prod_{i\\in S} Z_i`
+    where :math:`S` is the subset ``qubit_ids``.
+    If ``qubit_ids`` contains all qubits, the vector is equal to ``parity_vector(n_qubits)``.
+
+    :param n_qubits: The number of qubits measured.
+    :type n_qubits: int
+
+    :param qubit_ids: The ids of the qubits in the parity subset where qubit ``0`` corresponds
+                      to the most significant bit.
+    :type qubit_ids: list[int]
+
+    :raises ValueError: If ``n_qubits < 1`` or ``qubit_ids`` is not a subset of ``range(n_qubits)``.
+    """
+    if n_qubits < 1:
+        raise ValueError("Input `n_qubits` must satisfy `n_qubits >= 1`.")
+    if not set(qubit_ids).issubset(range(n_qubits)):
+        raise ValueError("Input `qubit_ids` must be a subset of `range(n_qubits)`.")
+
+    sign_vec = np.ones(1, dtype=int)
+    for i in range(n_qubits):
+        sign_vec = np.kron(sign_vec, [1, -1] if i in qubit_ids else [1, 1])
+
+    return sign_vec
+
+
+def parity_sign_matrix(n_qubits, qubit_subsets):
+    """Stacks the ``parity_sign_vector`` for each subset in ``qubit_subsets`` into a
+    matrix of shape ``(len(qubit_subsets), 2 ** n_qubits)``.
+
+    Multiplying the matrix with a probability vector evaluates all parity correlators
+    at once, e.g., ``correlators = parity_sign_matrix(n_qubits, qubit_subsets) @ probs_vec``.
+
+    :param n_qubits: The number of qubits measured.
+    :type n_qubits: int
+
+    :param qubit_subsets: The qubit ids of each considered parity observable.
+    :type qubit_subsets: list[list[int]]
+
+    :raises ValueError: If ``n_qubits < 1`` or a subset is not contained in ``range(n_qubits)``.
+    """
+    return np.array(
+        [parity_sign_vector(n_qubits, qubit_ids) for qubit_ids in qubit_subsets],
+        dtype=int,
+        requires_grad=False,
+    )
+
+
+class CoarseGrainingPostmap:
+    """A deterministic post-processing map that coarse-grains the :math:`2^N` bitstrings
+    measured from :math:`N` qubits into ``num_out`` labels.
+
+    The map is stored as a vector ``labels`` where the bitstring with value :math:`y`
+    is mapped to the output ``labels[y]``.
+    This is equivalent to the column stochastic matrix
+
+    .. math::
+
+        \\mathbf{L} = \\sum_{y}|\\text{labels}[y]\\rangle\\langle y|,
+
+    however, ``postmap @ probs`` is evaluated as a segmented sum over the elements of ``probs``
+    that share a label rather than as a dense matrix product.
+    Hence, applying the map scales as :math:`O(2^N)` rather than :math:`O(2^N \\cdot` ``num_out``:math:`)`.
+    The ``probs`` may be a probability vector or a behavior matrix whose columns are probability
+    vectors, and the result is differentiable.
+
+    A ``CoarseGrainingPostmap`` can be passed as the ``postmap`` of :meth:`qnetvo.behavior_fn`,
+    :meth:`qnetvo.linear_probs_cost_fn`, and :meth:`qnetvo.mutual_info_cost_fn`.
+    These functions also convert any deterministic ``postmap`` matrix into a
+    ``CoarseGrainingPostmap`` so that dense matrix products are only used for
+    postmaps that are truly stochastic.
+
+    :param labels: The output label of each bitstring.
+    :type labels: list[int] or np.array[int]
+
+    :param num_out: The number of outputs of the postmap. Default ``max(labels) + 1``.
+    :type num_out: *optional* int
+
+    :raises ValueError: If a label is not in ``range(num_out)``.
+    """
+
+    def __init__(self, labels, num_out=None):
+        self.labels = np.array(labels, dtype=int, requires_grad=False)
+        self.num_out = int(np.max(self.labels)) + 1 if num_out is None else num_out
+
+        if np.any(self.labels < 0) or np.any(self.labels >= self.num_out):
+            raise ValueError("Each label must be in `range(" + str(self.num_out) + ")`.")
+
+        self.is_identity = self.num_out == len(self.labels) and np.all(
+            self.labels == np.arange(len(self.labels))
+        )
+
+        # bitstrings sharing a label are contiguous once sorted by label
+        self._order = np.argsort(self.labels, kind="stable")
+        self._is_sorted = np.all(self._order == np.arange(len(self.labels)))
+        bounds = np.searchsorted(self.labels[self._order], np.arange(self.num_out + 1))
+        self._segments = [(bounds[i], bounds[i + 1]) for i in range(self.num_out)]
+
+    @classmethod
+    def from_matrix(cls, postmap):
+        """Constructs a ``CoarseGrainingPostmap`` from a deterministic ``postmap`` matrix
+        in which each column contains a single one and zeros elsewhere.
+
+        :param postmap: A deterministic column stochastic matrix.
+        :type postmap: np.array
+
+        :returns: The equivalent coarse-graining postmap.
+        :rtype: CoarseGrainingPostmap
+
+        :raises ValueError: If the ``postmap`` matrix is not deterministic.
+        """
+        postmap = np.array(postmap, requires_grad=False)
+        if not is_deterministic_postmap(postmap):
+            raise ValueError("The `postmap` matrix must be deterministic.")
+
+        return cls(np.argmax(postmap, axis=0), num_out=postmap.shape[0])
+
+    @classmethod
+    def parity(cls, n_qubits):
+        """Constructs the postmap that outputs ``0`` for even and ``1`` for odd parity bitstrings
+        (see :meth:`qnetvo.parity_vector`).
+
+        :param n_qubits: The number of qubits measured.
+        :type n_qubits: int
+
+        :rtype: CoarseGrainingPostmap
+        """
+        return cls((1 - parity_vector(n_qubits)) // 2, num_out=2)
+
+    @classmethod
+    def bit_selection(cls, n_qubits, qubit_ids):
+        """Constructs the postmap that outputs the bitstring of the subset of bits ``qubit_ids``
+        where qubit ``0`` corresponds to the most significant bit.
+
+        :param n_qubits: The number of qubits measured.
+        :type n_qubits: int
+
+        :param qubit_ids: The ids of the selected qubits in the order of the output bitstring.
+        :type qubit_ids: list[int]
+
+        :rtype: CoarseGrainingPostmap
+
+        :raises ValueError: If ``qubit_ids`` is not a subset of ``range(n_qubits)``.
+        """
+        if not set(qubit_ids).issubset(range(n_qubits)):
+            raise ValueError("Input `qubit_ids` must be a subset of `range(n_qubits)`.")
+
+        bitstrings = np.arange(2**n_qubits)
+        labels = np.zeros(2**n_qubits, dtype=int)
+        for qubit_id in qubit_ids:
+            labels = 2 * labels + (bitstrings >> (n_qubits - 1 - qubit_id)) % 2
+
+        return cls(labels, num_out=2 ** len(qubit_ids))
+
+    @property
+    def shape(self):
+        """The shape ``(num_out, 2 ** N)`` of the equivalent postmap matrix."""
+        return (self.num_out, len(self.labels))
+
+    @property
+    def matrix(self):
+        """The equivalent dense postmap matrix."""
+        matrix = np.zeros(self.shape, dtype=int, requires_grad=False)
+        matrix[self.labels, np.arange(len(self.labels))] = 1
+
+        return matrix
+
+    @property
+    def T(self):
+        """The transpose of the equivalent dense postmap matrix."""
+        return self.matrix.T
+
+    def __len__(self):
+        return self.num_out
+
+    def __matmul__(self, probs):
+        if self.is_identity:
+            return probs
+
+        sorted_probs = probs if self._is_sorted else math.take(probs, self._order, axis=0)
+
+        return math.stack(
+            [math.sum(sorted_probs[start:end], axis=0) for start, end in self._segments]
+        )
+
+
+def is_deterministic_postmap(postmap):
+    """Checks whether a ``postmap`` matrix is deterministic, that is, each column
+    contains a single one and zeros elsewhere.
+
+    :param postmap: A post-processing matrix.
+    :type postmap: np.array
+
+    :rtype: bool
+    """
+    postmap = np.array(postmap, requires_grad=False)
+
+    return bool(
+        postmap.ndim == 2
+        and np.all((postmap == 0) | (postmap == 1))
+        and np.all(np.sum(postmap, axis=0) == 1)
+    )
+
+
+def _structured_postmap(postmap):
+    """Converts a deterministic ``postmap`` matrix into a ``CoarseGrainingPostmap``.
+    Empty, stochastic, and structured postmaps are returned unchanged.
+    """
+    if isinstance(postmap, CoarseGrainingPostmap) or len(postmap) == 0:
+        return postmap
+
+    return (
+        CoarseGrainingPostmap.from_matrix(postmap) if is_deterministic_postmap(postmap) else postmap
+    )
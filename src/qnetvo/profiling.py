@@ -0,0 +1,230 @@
+import pennylane as qml
+import autograd.core
+import threading
+import time
+import warnings
+from .network_ansatz import NetworkAnsatz
+
+try:
+    import pennylane.workflow.execution as _pl_execution
+except ImportError:  # pragma: no cover
+    _pl_execution = None
+
+
+class Profiler:
+    """A context manager that counts qnode executions and times each phase of the
+    cost and gradient evaluations made inside its context.
+
+    Time is attributed exclusively to the innermost active phase:
+
+    * ``"settings"`` - marshalling network settings into qnode settings
+      (see :meth:`qnetvo.NetworkAnsatz.qnode_settings`).
+    * ``"construct"`` - constructing the quantum tape of a qnode.
+    * ``"device"`` - simulating tapes on the device, including the shifted tapes of
+      parameter-shift gradients.
+    * ``"backward"`` - the autograd backward pass.
+    * ``"qnode"`` - the remaining time spent in qnode calls, e.g., transforms and
+      interface conversions.
+    * ``"other"`` - the remaining wall time of the context, e.g., post-processing of qnode
+      results, optimizer updates, and waiting on worker threads.
+
+    .. code-block:: python
+
+        with qnetvo.Profiler() as profiler:
+            qnetvo.gradient_descent(cost, init_settings, num_steps=10)
+
+        print(profiler.report())
+
+    The hot paths are instrumented only while the context is active, hence, there is no
+    overhead when profiling is disabled.
+    Evaluations made in threads are profiled, whereas evaluations in worker processes,
+    e.g., by a :class:`qnetvo.ProcessExecutor`, are not.
+    Only one ``Profiler`` can be active at a time.
+
+    The phases are timed by temporarily wrapping PennyLane and autograd internals, namely,
+    ``qml.QNode.construct``, ``autograd.core.backward_pass``, and
+    ``pennylane.workflow.execution._make_inner_execute``.
+    These internals are only guaranteed to exist in the PennyLane versions listed in
+    ``Profiler.supported_pennylane_versions``, i.e., the version pinned in ``requirements.txt``.
+    If an internal is missing, it is not instrumented and a warning is raised.
+    The time of an uninstrumented phase is then attributed to the enclosing phase, e.g.,
+    device executions are counted as ``"qnode"`` time, while the ``total_time`` is always
+    measured as wall-clock time.
+
+    The following attributes are populated on exit:
+
+    * **phase_times** (*dict[str, float]*) - The time in seconds attributed to each phase.
+    * **phase_counts** (*dict[str, int]*) - The number of calls made in each phase.
+    * **qnode_stats** (*dict[str, dict]*) - For each qnode, named by its constructor, the number
+      of ``"calls"``, the number of device ``"executions"``, and the total ``"time"`` spent in
+      the qnode calls.
+    * **total_time** (*float*) - The wall time of the context in seconds.
+    * **uninstrumented** (*list[str]*) - The internals that could not be instrumented.
+
+    :raises RuntimeError: If a ``Profiler`` is entered while another is active.
+    """
+
+    _active = None
+
+    supported_pennylane_versions = ["0.37"]
+
+    phases = ["settings", "construct", "device", "backward", "qnode", "other"]
+
+    def __init__(self):
+        self.phase_times = {phase: 0.0 for phase in self.phases}
+        self.phase_counts = {phase: 0 for phase in self.phases}
+        self.qnode_stats = {}
+        self.total_time = 0.0
+        self.uninstrumented = []
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patches = []
+
+    def __enter__(self):
+        if Profiler._active is not None:
+            raise RuntimeError("A `Profiler` is already active.")
+
+        Profiler._active = self
+
+        pl_version = ".".join(qml.__version__.split(".")[0:2])
+        if pl_version not in self.supported_pennylane_versions:
+            warnings.warn(
+                "The `Profiler` is not tested with PennyLane "
+                + qml.__version__
+                + ", the supported versions are "
+                + str(self.supported_pennylane_versions)
+                + "."
+            )
+
+        self.uninstrumented = []
+        self._patch(NetworkAnsatz, "qnode_settings", self._wrap_phase("settings"))
+        self._patch(qml.QNode, "__call__", self._wrap_qnode_call)
+        self._patch(qml.QNode, "construct", self._wrap_phase("construct"))
+        self._patch(autograd.core, "backward_pass", self._wrap_phase("backward"))
+        self._patch(_pl_execution, "_make_inner_execute", self._wrap_inner_execute)
+
+        if self.uninstrumented:
+            warnings.warn(
+                "The `Profiler` could not instrument "
+                + ", ".join(self.uninstrumented)
+                + " in PennyLane "
+                + qml.__version__
+                + ", the time of these phases is attributed to the enclosing phase."
+            )
+
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time = time.perf_counter() - self._start
+
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        Profiler._active = None
+
+        with self._lock:
+            instrumented_time = sum(self.phase_times[phase] for phase in self.phases[0:-1])
+            self.phase_times["other"] = max(0.0, self.total_time - instrumented_time)
+
+    def _patch(self, owner, name, wrapper_fn):
+        if owner is None or not hasattr(owner, name):
+            self.uninstrumented.append(name)
+            return
+
+        original = getattr(owner, name)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, wrapper_fn(original))
+
+    def _timed(self, phase, fn, args, kwargs):
+        # the stack accumulates the time spent in nested phases of the current thread
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested_time = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+
+            with self._lock:
+                self.phase_times[phase] += elapsed - nested_time
+                self.phase_counts[phase] += 1
+
+    def _wrap_phase(self, phase):
+        def wrapper_fn(fn):
+            def wrapped(*args, **kwargs):
+                return self._timed(phase, fn, args, kwargs)
+
+            return wrapped
+
+        return wrapper_fn
+
+    def _wrap_qnode_call(self, fn):
+        def wrapped(qnode, *args, **kwargs):
+            func = getattr(qnode, "func", qnode)
+            name = getattr(func, "__qualname__", str(func)).split(".<locals>")[0]
+
+            with self._lock:
+                stats = self.qnode_stats.setdefault(
+                    name, {"calls": 0, "executions": 0, "time": 0.0}
+                )
+                stats["calls"] += 1
+
+            qnode_names = self._local.__dict__.setdefault("qnode_names", [])
+            qnode_names.append(name)
+            start = time.perf_counter()
+            try:
+                return self._timed("qnode", fn, (qnode,) + args, kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                qnode_names.pop()
+                with self._lock:
+                    stats["time"] += elapsed
+
+        return wrapped
+
+    def _wrap_inner_execute(self, make_inner_execute):
+        def wrapped_make_inner_execute(*args, **kwargs):
+            inner_execute = make_inner_execute(*args, **kwargs)
+
+            def wrapped_inner_execute(tapes, **inner_kwargs):
+                qnode_names = self._local.__dict__.get("qnode_names", [])
+                if qnode_names:
+                    with self._lock:
+                        self.qnode_stats[qnode_names[-1]]["executions"] += len(tapes)
+
+                return self._timed("device", inner_execute, (tapes,), inner_kwargs)
+
+            return wrapped_inner_execute
+
+        return wrapped_make_inner_execute
+
+    @property
+    def num_executions(self):
+        """The total number of tapes executed on devices within qnode calls."""
+        return sum(stats["executions"] for stats in self.qnode_stats.values())
+
+    def report(self):
+        """Formats the phase times and qnode statistics as a table.
+
+        :returns: A multi-line summary of the profile.
+        :rtype: str
+        """
+        lines = ["phase       calls     time (s)   fraction"]
+        for phase in self.phases:
+            fraction = self.phase_times[phase] / self.total_time if self.total_time else 0
+            calls = "" if phase == "other" else str(self.phase_counts[phase])
+            lines.append(f"{phase:<10}{calls:>7}{self.phase_times[phase]:>13.4f}{fraction:>11.1%}")
+        lines.append(f"{'total':<10}{'':>7}{self.total_time:>13.4f}")
+
+        lines += ["", "qnode                                 calls  executions     time (s)"]
+        for name, stats in self.qnode_stats.items():
+            lines.append(
+                f"{name:<36}{stats['calls']:>7}{stats['executions']:>12}{stats['time']:>13.4f}"
+            )
+
+        return "\n".join(lines)
@@ -1,5 +1,15 @@
 import pennylane as qml
 from pennylane import math
+from autograd.tracer import Box
+from pennylane.measurements import MidMeasureMP
+from pennylane.operation import Channel
+from collections import OrderedDict
+import logging
+import numpy as np
+import threading
+from .postprocessing import parity_sign_matrix
+
+logger = logging.getLogger(__name__)
 
 
 def parity_observable(wires):
@@ -33,70 +43,410 @@ def local_parity_observables(measure_nodes):
     return obs_list
 
 
-def local_parity_expval_qnode(network_ansatz, **qnode_kwargs):
+def select_diff_method(network_ansatz, allow_adjoint=True, max_backprop_wires=16):
+    """Selects the differentiation method for the qnodes simulating the ``network_ansatz``.
+
+    All qnode constructors in qNetVO, and hence all cost functions, accept the keyword argument
+    ``diff_method="auto"``, which is replaced by the method returned from this function.
+    The method is selected as follows:
+
+    * ``"parameter-shift"`` if the device samples a finite number of shots, if the device is
+      not a ``"default.qubit"``, ``"lightning.qubit"``, or ``"default.mixed"`` simulator, or if
+      noise channels are applied without a ``"default.mixed"`` device.
+    * ``"backprop"`` on the ``"default.mixed"`` device and on the ``"default.qubit"`` device
+      if the network uses mid-circuit measurements for classical communication,
+      if the adjoint method is not allowed, or if the network has at most ``max_backprop_wires``
+      wires.
+    * ``"adjoint"`` on the ``"lightning.qubit"`` device and on larger ``"default.qubit"``
+      networks where backpropagation requires too much memory, unless the network has a single
+      trainable setting in which case ``"parameter-shift"`` requires only two executions.
+
+    The selected method and the reason for its selection are logged at the ``INFO`` level to the
+    ``"qnetvo.qnodes"`` logger. The method used by a constructed qnode is also available as its
+    ``diff_method`` attribute.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param allow_adjoint: Set to ``False`` for qnodes that do not return an expectation value
+                          because the adjoint method cannot differentiate them. Default ``True``.
+    :type allow_adjoint: *optional* bool
+
+    :param max_backprop_wires: The largest number of wires for which backpropagation is selected
+                               on a ``"default.qubit"`` device. Default ``16``.
+    :type max_backprop_wires: *optional* int
+
+    :returns: One of ``"backprop"``, ``"adjoint"``, or ``"parameter-shift"``.
+    :rtype: str
+    """
+    dev_name = network_ansatz.dev_kwargs["name"]
+    num_wires = len(network_ansatz.network_wires)
+    num_settings = network_ansatz.qnode_num_settings
+
+    ops = qml.tape.make_qscript(network_ansatz.fn)(np.zeros(num_settings)).operations
+    has_mcm = network_ansatz.num_cc_wires > 0 or any(isinstance(op, MidMeasureMP) for op in ops)
+    has_noise = any(isinstance(op, Channel) for op in ops)
+
+    if network_ansatz.dev_kwargs.get("shots") is not None:
+        method, reason = "parameter-shift", "the device samples a finite number of shots"
+    elif dev_name == "default.mixed":
+        method, reason = "backprop", "the mixed-state simulator supports backpropagation"
+    elif has_noise:
+        method, reason = "parameter-shift", "noise channels are applied on a state-vector device"
+    elif dev_name not in ("default.qubit", "lightning.qubit"):
+        method, reason = "parameter-shift", "the device is not a known simulator"
+    elif has_mcm or not allow_adjoint:
+        cause = "mid-circuit measurements are" if has_mcm else "the qnode output is"
+        if dev_name == "default.qubit":
+            method, reason = "backprop", cause + " not supported by the adjoint method"
+        else:
+            method, reason = "parameter-shift", cause + " not supported by the adjoint method"
+    elif dev_name == "lightning.qubit":
+        method, reason = "adjoint", "the device is a compiled state-vector simulator"
+    elif num_wires <= max_backprop_wires:
+        method, reason = "backprop", "the state vector of " + str(num_wires) + " wires is small"
+    elif num_settings <= 1:
+        method, reason = "parameter-shift", "a single setting requires only two executions"
+    else:
+        method, reason = "adjoint", "the state vector of " + str(num_wires) + " wires is large"
+
+    logger.info("selected diff_method='" + method + "' because " + reason)
+
+    return method
+
+
+_PREPARED_STATE_DIFF_METHODS = ("backprop", "adjoint", "finite-diff", "best", None)
+
+
+def _resolve_qnode_kwargs(network_ansatz, qnode_kwargs, allow_adjoint=True, prepared_state=False):
+    """Replaces ``diff_method="auto"`` with the method from :meth:`select_diff_method`.
+
+    Qnodes that return or take a prepared state cannot be differentiated using shift rules
+    because ``qml.state()`` and ``qml.StatePrep`` have no parameter-shift recipe.
+    For these qnodes, ``"auto"`` selects ``"backprop"`` on the ``"default.qubit"`` and
+    ``"default.mixed"`` simulators and PennyLane's ``"best"`` method otherwise.
+    """
+    if prepared_state:
+        diff_method = qnode_kwargs.get("diff_method", "best")
+        if diff_method == "auto":
+            dev_kwargs = network_ansatz.dev_kwargs
+            backprop_dev = dev_kwargs["name"] in ("default.qubit", "default.mixed")
+            use_backprop = backprop_dev and dev_kwargs.get("shots") is None
+            return {**qnode_kwargs, "diff_method": "backprop" if use_backprop else "best"}
+
+        if diff_method not in _PREPARED_STATE_DIFF_METHODS:
+            raise ValueError(
+                "A prepared state cannot be differentiated with `diff_method="
+                + repr(diff_method)
+                + "`. Use one of "
+                + str(_PREPARED_STATE_DIFF_METHODS)
+                + ", e.g., 'backprop' on a 'default.qubit' or 'default.mixed' device."
+            )
+
+        return qnode_kwargs
+
+    if qnode_kwargs.get("diff_method") == "auto":
+        diff_method = select_diff_method(network_ansatz, allow_adjoint=allow_adjoint)
+        return {**qnode_kwargs, "diff_method": diff_method}
+
+    return qnode_kwargs
+
+
+def network_circuit_fn(network_ansatz, prepared_state=False):
+    """Constructs the quantum function applied by the qnodes simulating the ``network_ansatz``.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param prepared_state: If ``True``, the quantum function is called as ``circuit(state, settings)``
+                           where ``state`` is the output of a :meth:`prepared_state_qnode` and
+                           only the measurement layer is applied using the measurement layer ``settings``.
+                           Otherwise, the full network ansatz is applied as ``circuit(settings)``.
+    :type prepared_state: *optional* bool
+
+    :returns: A quantum function.
+    :rtype: function
+
+    :raises ValueError: If ``prepared_state=True`` and the network uses classical communication.
+    """
+    if not prepared_state:
+        return network_ansatz.fn
+
+    if network_ansatz.num_cc_wires > 0:
+        raise ValueError(
+            "A prepared state cannot be cached for networks that use classical communication."
+        )
+
+    meas_fn = network_ansatz.ansatz_circuit_fn([len(network_ansatz.layers) - 1])
+    wires = network_ansatz.network_wires
+
+    def circuit(state, settings):
+        if math.ndim(state) == 2:
+            qml.QubitDensityMatrix(state, wires=wires)
+        else:
+            qml.StatePrep(state, wires=wires)
+
+        meas_fn(settings)
+
+    return circuit
+
+
+def prepared_state_qnode(network_ansatz, **qnode_kwargs):
+    """Constructs a qnode that simulates all network layers preceding the measurement layer
+    and returns the resulting quantum state.
+
+    For a ``"default.mixed"`` device, the returned state is a density matrix, otherwise, the
+    returned state is a state vector.
+    The state is consumed by qnodes constructed with ``prepared_state=True``, for instance,
+    ``global_parity_expval_qnode(network_ansatz, prepared_state=True)``.
+
+    The returned state can only be differentiated with the ``"backprop"``, ``"adjoint"``,
+    ``"finite-diff"``, or ``"best"`` methods because ``qml.state()`` has no parameter-shift
+    recipe. The ``diff_method="auto"`` keyword argument selects ``"backprop"`` on the
+    ``"default.qubit"`` and ``"default.mixed"`` simulators and ``"best"`` otherwise.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :returns: A qnode called as ``qnode(settings)`` where the ``settings`` are the qnode settings
+              of the preparation layers.
+    :rtype: ``pennylane.QNode``
+
+    :raises ValueError: If the network uses classical communication or if the ``diff_method``
+                        cannot differentiate a prepared state, e.g., ``"parameter-shift"``.
+    """
+    if network_ansatz.num_cc_wires > 0:
+        raise ValueError(
+            "A prepared state cannot be cached for networks that use classical communication."
+        )
+
+    prep_fn = network_ansatz.ansatz_circuit_fn(range(len(network_ansatz.layers) - 1))
+    qnode_kwargs = _resolve_qnode_kwargs(network_ansatz, qnode_kwargs, prepared_state=True)
+
+    @qml.qnode(qml.device(**network_ansatz.dev_kwargs), **qnode_kwargs)
+    def circuit(settings):
+        prep_fn(settings)
+
+        return qml.state()
+
+    return circuit
+
+
+def cached_prep_qnode_fn(network_ansatz, qnode_fn, broadcast=False, **qnode_kwargs):
+    """Constructs a function that evaluates a qnode for many network inputs that share
+    the same inputs for the preparation layers.
+
+    The preparation layers are simulated once per call using a :meth:`prepared_state_qnode`
+    and only the measurement layer is simulated for each of the network inputs.
+    Gradients flow through the cached state, hence, the ``diff_method`` must be able to
+    differentiate a prepared state (see :meth:`prepared_state_qnode`).
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param qnode_fn: A qnode constructor that accepts the ``prepared_state`` keyword argument,
+                     e.g., :meth:`global_parity_expval_qnode`.
+    :type qnode_fn: function
+
+    :param broadcast: If ``True``, the measurement layer is evaluated for all network inputs
+                      in one qnode execution using parameter broadcasting.
+    :type broadcast: *optional* bool
+
+    :param qnode_kwargs: Keyword arguments passed through to the qnode constructors.
+    :type qnode_kwargs: *optional* dict
+
+    :returns: A function called as ``qnode_results(network_settings, network_inputs_list)``
+              that returns an array stacking the qnode output for each network input.
+              All network inputs must have the same inputs for the preparation layers.
+    :rtype: function
+
+    :raises ValueError: If the network uses classical communication or if the ``diff_method``
+                        cannot differentiate a prepared state, e.g., ``"parameter-shift"``.
+    """
+    prep_qnode = prepared_state_qnode(network_ansatz, **qnode_kwargs)
+    meas_qnode = qnode_fn(network_ansatz, prepared_state=True, **qnode_kwargs)
+
+    num_prep_settings = network_ansatz.qnode_num_settings - network_ansatz.layers_num_settings[-1]
+
+    def qnode_results(network_settings, network_inputs_list):
+        if broadcast:
+            settings = network_ansatz.broadcast_qnode_settings(
+                network_settings, network_inputs_list
+            )
+            state = prep_qnode(settings[0:num_prep_settings, 0])
+
+            return meas_qnode(state, settings[num_prep_settings:])
+
+        settings_list = [
+            network_ansatz.qnode_settings(network_settings, network_inputs)
+            for network_inputs in network_inputs_list
+        ]
+        state = prep_qnode(settings_list[0][0:num_prep_settings])
+
+        return math.stack(
+            [meas_qnode(state, settings[num_prep_settings:]) for settings in settings_list]
+        )
+
+    return qnode_results
+
+
+def local_parity_expval_qnode(network_ansatz, prepared_state=False, **qnode_kwargs):
     """Constructs a qnode that computes expectation values for the local parity observable
     at each measurement node.
 
     :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
     :type network_ansatz: NetworkAnsatz
 
+    :param prepared_state: If ``True``, the qnode is called as ``qnode(state, settings)`` and
+                           only simulates the measurement layer (see :meth:`network_circuit_fn`).
+    :type prepared_state: *optional* bool
+
     :returns: A qnode that performs a local parity measurement at measurement nodes.
               The qnode is called as ``qnode(settings)``.
     :rtype: ``qml.QNode``
     """
     observables = local_parity_observables(network_ansatz.layers[-1])
+    circuit_fn = network_circuit_fn(network_ansatz, prepared_state)
+    qnode_kwargs = _resolve_qnode_kwargs(
+        network_ansatz, qnode_kwargs, prepared_state=prepared_state
+    )
 
     @qml.qnode(qml.device(**network_ansatz.dev_kwargs), **qnode_kwargs)
-    def circuit(settings):
-        network_ansatz.fn(settings)
+    def circuit(*args):
+        circuit_fn(*args)
 
         return [qml.expval(obs) for obs in observables]
 
     return circuit
 
 
-def global_parity_expval_qnode(network_ansatz, **qnode_kwargs):
+def global_parity_expval_qnode(network_ansatz, prepared_state=False, **qnode_kwargs):
     """Constructs a qnode that computes expectation values for the local parity observable
     at each measurement node.
 
     :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
     :type network_ansatz: NetworkAnsatz
 
+    :param prepared_state: If ``True``, the qnode is called as ``qnode(state, settings)`` and
+                           only simulates the measurement layer (see :meth:`network_circuit_fn`).
+    :type prepared_state: *optional* bool
+
     :returns: A qnode the performs a global parity measurement and is called as ``qnode(settings)``.
     :rtype: ``qml.QNode``
     """
     parity_obs = parity_observable(network_ansatz.layers_wires[-1])
+    circuit_fn = network_circuit_fn(network_ansatz, prepared_state)
+    qnode_kwargs = _resolve_qnode_kwargs(
+        network_ansatz, qnode_kwargs, prepared_state=prepared_state
+    )
 
     @qml.qnode(qml.device(**network_ansatz.dev_kwargs), **qnode_kwargs)
-    def circuit(settings):
-        network_ansatz.fn(settings)
+    def circuit(*args):
+        circuit_fn(*args)
 
         return qml.expval(parity_obs)
 
     return circuit
 
 
-def joint_probs_qnode(network_ansatz, **qnode_kwargs):
+def joint_probs_qnode(network_ansatz, prepared_state=False, **qnode_kwargs):
     """Constructs a qnode that computes the joint probabilities in the computational basis
     across all measurement wires.
 
     :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
     :type network_ansatz: NetworkAnsatz
 
+    :param prepared_state: If ``True``, the qnode is called as ``qnode(state, settings)`` and
+                           only simulates the measurement layer (see :meth:`network_circuit_fn`).
+    :type prepared_state: *optional* bool
+
     :returns: A qnode called as ``qnode(settings)`` for evaluating the joint probabilities of the
               network ansatz.
     :rtype: ``pennylane.QNode``
     """
+    circuit_fn = network_circuit_fn(network_ansatz, prepared_state)
+    qnode_kwargs = _resolve_qnode_kwargs(
+        network_ansatz, qnode_kwargs, allow_adjoint=False, prepared_state=prepared_state
+    )
 
     @qml.qnode(qml.device(**network_ansatz.dev_kwargs), **qnode_kwargs)
-    def circuit(settings):
-        network_ansatz.fn(settings)
+    def circuit(*args):
+        circuit_fn(*args)
 
         return qml.probs(wires=network_ansatz.layers_wires[-1])
 
     return circuit
 
 
+def node_parity_sign_matrix(measure_nodes, node_subsets):
+    """Constructs the sign matrix that maps the joint probabilities of the ``measure_nodes``
+    onto the parity correlators of each subset of nodes in ``node_subsets``.
+
+    The parity correlator of a subset of nodes is the expectation value of the product of
+    their local parity observables (see :meth:`local_parity_observables`).
+
+    :param measure_nodes: A list of ``MeasureNode`` classes whose wires are measured.
+    :type measure_nodes: list[ MeasureNode ]
+
+    :param node_subsets: Each subset is a list of ids for the nodes in ``measure_nodes``.
+    :type node_subsets: list[list[int]]
+
+    :returns: A matrix of shape ``(len(node_subsets), 2 ** num_wires)`` with :math:`\\pm 1` elements.
+    :rtype: np.ndarray
+    """
+    meas_wires = qml.wires.Wires.all_wires([node.wires for node in measure_nodes])
+    qubit_subsets = [
+        [meas_wires.index(wire) for node_id in node_ids for wire in measure_nodes[node_id].wires]
+        for node_ids in node_subsets
+    ]
+
+    return parity_sign_matrix(len(meas_wires), qubit_subsets)
+
+
+def parity_correlators_fn(network_ansatz, node_subsets=None, prepared_state=False, **qnode_kwargs):
+    """Constructs a function that evaluates many parity correlators from a single
+    simulation of the network ansatz.
+
+    The joint probabilities across all measurement wires are obtained from one
+    :meth:`joint_probs_qnode` execution and every requested correlator is derived
+    from them using a precomputed sign matrix (see :meth:`node_parity_sign_matrix`).
+    Hence, all correlators that share a measurement basis are evaluated for the cost of one
+    device run.
+
+    :param network_ansatz: A ``NetworkAnsatz`` class specifying the quantum network simulation.
+    :type network_ansatz: NetworkAnsatz
+
+    :param node_subsets: A list of measurement node subsets for which the parity correlators are
+                         evaluated, e.g., ``[[0, 1], [0], [1]]``. By default, the global parity
+                         correlator is followed by the local parity correlator of each measurement
+                         node.
+    :type node_subsets: *optional* list[list[int]]
+
+    :param prepared_state: If ``True``, the function is called as ``correlators(state, settings)``
+                           (see :meth:`network_circuit_fn`).
+    :type prepared_state: *optional* bool
+
+    :returns: A function called as ``correlators(settings)`` that returns an array of length
+              ``len(node_subsets)``. If the ``settings`` are broadcasted, the returned array
+              has shape ``(batch_size, len(node_subsets))``.
+    :rtype: function
+    """
+    measure_nodes = network_ansatz.layers[-1]
+    if node_subsets is None:
+        node_subsets = [list(range(len(measure_nodes)))] + [[i] for i in range(len(measure_nodes))]
+
+    sign_matrix = node_parity_sign_matrix(measure_nodes, node_subsets).T
+
+    probs_qnode = joint_probs_qnode(network_ansatz, prepared_state=prepared_state, **qnode_kwargs)
+
+    def correlators(*args):
+        probs = probs_qnode(*args)
+
+        return math.tensordot(probs, math.convert_like(sign_matrix, probs), axes=[[-1], [0]])
+
+    return correlators
+
+
 def density_matrix_qnode(network_ansatz, wires=None, **qnode_kwargs):
     """
     Constructs a qnode that computes the density matrix in the computational basis
@@ -121,9 +471,116 @@ def density_matrix_qnode(network_ansatz, wires=None, **qnode_kwargs):
     if not set(wires).issubset(network_ansatz.layers_wires[-1]):
         raise ValueError("Specified wires must be a subset of the wires in the network ansatz.")
 
+    qnode_kwargs = _resolve_qnode_kwargs(network_ansatz, qnode_kwargs, allow_adjoint=False)
+
     @qml.qnode(qml.device(**network_ansatz.dev_kwargs), **qnode_kwargs)
     def circuit(settings):
         network_ansatz.fn(settings)
         return qml.density_matrix(wires)
 
     return circuit
+
+
+def _is_traced(args):
+    """Returns ``True`` if any argument is being traced for differentiation."""
+    if any(isinstance(arg, Box) for arg in args):
+        return True
+
+    return math.get_interface(*args) not in ("numpy", "autograd")
+
+
+def _settings_key(args):
+    """A hashable key identifying the bytes of concrete qnode arguments."""
+    arrays = [np.asarray(math.unwrap(arg)) for arg in args]
+
+    return tuple((array.shape, array.dtype.str, array.tobytes()) for array in arrays)
+
+
+class _LRUCache:
+    """A thread-safe least-recently-used cache that holds at most ``maxsize`` items."""
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("The `maxsize` must be at least 1.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return True, self._items[key]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._items),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def memoize_qnode(qnode, maxsize=128):
+    """Wraps a qnode such that repeated forward evaluations with identical arguments are
+    read from a least-recently-used cache instead of being executed.
+
+    The cache is keyed on the bytes of the qnode arguments, e.g., the ``settings`` obtained
+    from :meth:`qnetvo.NetworkAnsatz.qnode_settings`, which identify both the network inputs
+    and the network settings.
+    Evaluations traced for differentiation, e.g., inside ``qml.grad``, always execute the
+    qnode and are not cached, hence, gradients are unaffected by memoization.
+    Only deterministic qnodes should be memoized because a cached result is returned for a
+    device with finite shots.
+
+    :param qnode: A qnode called as ``qnode(*args)``.
+    :type qnode: ``pennylane.QNode``
+
+    :param maxsize: The maximum number of cached results. Default ``128``.
+    :type maxsize: *optional* int
+
+    :returns: A function called as ``memoized_qnode(*args)``. The cache statistics are returned
+              by ``memoized_qnode.cache_info()`` and the cache is emptied with
+              ``memoized_qnode.cache_clear()``.
+    :rtype: function
+
+    :raises ValueError: If ``maxsize`` is less than one.
+    """
+    cache = _LRUCache(maxsize)
+
+    def memoized_qnode(*args):
+        if _is_traced(args):
+            return qnode(*args)
+
+        key = _settings_key(args)
+        hit, result = cache.get(key)
+        if not hit:
+            result = qnode(*args)
+            cache.put(key, result)
+
+        return result
+
+    memoized_qnode.cache_info = cache.info
+    memoized_qnode.cache_clear = cache.clear
+
+    return memoized_qnode
@@ -3,8 +3,11 @@ import pennylane.numpy as qnp
 import numpy as np
 from pennylane import math
 import itertools
-import copy
 import json
+import os
+import pickle
+import struct
+import zipfile
 
 
 def unitary_matrix(circuit, num_wires, *circ_args, **circ_kwargs):
@@ -104,7 +107,8 @@ def write_optimization_json(opt_dict, filename):
     :returns: ``None``
     """
 
-    opt_dict_json = copy.deepcopy(opt_dict)
+    # a shallow copy suffices because converted values are replaced rather than modified
+    opt_dict_json = dict(opt_dict)
 
     opt_dict_json["opt_score"] = float(opt_dict_json["opt_score"])
     opt_dict_json["scores"] = [float(score) for score in opt_dict_json["scores"]]
@@ -113,6 +117,19 @@ def write_optimization_json(opt_dict, filename):
         [float(setting) for setting in settings] for settings in opt_dict_json["settings_history"]
     ]
 
+    if "step_scores" in opt_dict_json:
+        opt_dict_json["step_scores"] = [float(score) for score in opt_dict_json["step_scores"]]
+
+    # arrays added by a multi-start optimization
+    for key in [
+        "start_opt_scores",
+        "start_opt_settings",
+        "start_scores",
+        "start_settings_history",
+    ]:
+        if key in opt_dict_json:
+            opt_dict_json[key] = np.asarray(opt_dict_json[key], dtype=float).tolist()
+
     with open(filename + ".json", "w") as file:
         file.write(json.dumps(opt_dict_json, indent=2))
 
@@ -133,6 +150,160 @@ def read_optimization_json(filepath):
     return opt_dict
 
 
+def write_optimization_npz(opt_dict, filename):
+    """Writes the optimization dictionary to an uncompressed NumPy ``.npz`` archive.
+
+    Each array-like value, e.g., the ``settings_history``, is stored as a separate binary
+    ``.npy`` member while scalar values such as the ``opt_score`` and ``datetime`` are stored
+    in a small JSON ``"metadata"`` member.
+    Compared to :meth:`write_optimization_json`, the archive is compact and fast to write, and
+    it can be read selectively or memory-mapped with :meth:`read_optimization_npz`.
+
+    :param opt_dict: The dictionary returned by a network optimization.
+    :type opt_dict: dict
+
+    :param filename: The name of the file to be written. Note that ``.npz`` extension is automatically added.
+    :type filename: string
+
+    :returns: ``None``
+    """
+    metadata = {}
+    arrays = {}
+    for key, value in opt_dict.items():
+        if isinstance(value, str):
+            metadata[key] = value
+        elif np.ndim(value) == 0:
+            metadata[key] = np.asarray(value).item()
+        else:
+            array = np.asarray(value)
+            arrays[key] = array.astype(float) if array.dtype == object else array
+
+    np.savez(filename + ".npz", metadata=np.array(json.dumps(metadata)), **arrays)
+
+
+def read_optimization_npz(filepath, keys=None, mmap_mode=None):
+    """Reads data from an optimization archive created via ``write_optimization_npz``.
+
+    The metadata, e.g., ``opt_score`` and ``datetime``, is always read while arrays are
+    only read if requested.
+
+    :param filepath: The path to the archive. Note this string must contain the ``.npz`` extension.
+    :type filepath: string
+
+    :param keys: The array-valued keys to read, e.g., ``["opt_settings"]``. By default, all arrays
+                 are read. Use ``keys=[]`` to read only the metadata.
+    :type keys: *optional* list[string]
+
+    :param mmap_mode: If provided, the arrays are memory-mapped using the given mode
+                      (see ``numpy.memmap``), e.g., ``"r"``, rather than read into memory.
+    :type mmap_mode: *optional* string
+
+    :returns: The optimization dictionary read from the file.
+    :rtype: dict
+    """
+    with np.load(filepath) as npz_file:
+        opt_dict = json.loads(str(npz_file["metadata"]))
+        array_keys = [key for key in npz_file.files if key != "metadata"]
+        keys = array_keys if keys is None else [key for key in array_keys if key in keys]
+
+        if mmap_mode is None:
+            opt_dict.update({key: npz_file[key] for key in keys})
+            return opt_dict
+
+    for key in keys:
+        opt_dict[key] = _memmap_npz_member(filepath, key + ".npy", mmap_mode)
+
+    return opt_dict
+
+
+def _memmap_npz_member(filepath, member_name, mmap_mode):
+    """Memory-maps an uncompressed ``.npy`` member of a ``.npz`` archive."""
+    with zipfile.ZipFile(filepath) as zip_file:
+        info = zip_file.getinfo(member_name)
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError("Compressed `.npz` members cannot be memory-mapped.")
+
+    with open(filepath, "rb") as file:
+        # the member data follows the 30 byte local file header, the file name, and extra field
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", file.read(4))
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+        offset = file.tell()
+
+    if np.prod(shape) == 0:
+        return np.zeros(shape, dtype=dtype)
+
+    return np.memmap(
+        filepath,
+        dtype=dtype,
+        mode=mmap_mode,
+        shape=shape,
+        order="F" if fortran_order else "C",
+        offset=offset,
+    )
+
+
+def write_optimization_checkpoint(checkpoint, filepath):
+    """Atomically writes an optimization checkpoint to a pickle file.
+
+    The checkpoint is first written to a temporary file which then replaces the file at
+    ``filepath``. Hence, an interruption during the write never corrupts an existing checkpoint.
+
+    :param checkpoint: The checkpoint data, e.g., as written by :meth:`qnetvo.gradient_descent`.
+    :type checkpoint: dict
+
+    :param filepath: The path of the checkpoint file.
+    :type filepath: string
+
+    :returns: ``None``
+    """
+    tmp_filepath = filepath + ".tmp"
+    with open(tmp_filepath, "wb") as file:
+        pickle.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_filepath, filepath)
+
+
+def read_optimization_checkpoint(filepath):
+    """Reads an optimization checkpoint created via ``write_optimization_checkpoint``.
+
+    :param filepath: The path of the checkpoint file.
+    :type filepath: string
+
+    :returns: The checkpoint data.
+    :rtype: dict
+    """
+    with open(filepath, "rb") as file:
+        checkpoint = pickle.load(file)
+
+    return checkpoint
+
+
+def read_optimization_records(filepath):
+    """Reads the per-step records streamed by :meth:`qnetvo.gradient_descent` to a JSON lines file.
+
+    :param filepath: The path of the records file.
+    :type filepath: string
+
+    :returns: A list containing the dictionary recorded for each step.
+    :rtype: list[dict]
+    """
+    with open(filepath) as file:
+        records = [json.loads(line) for line in file if line.strip()]
+
+    return records
+
+
 def mixed_base_num(n, base_digits):
     """Converts a base-10 number ``n`` into a mixed base number with digit
     values described by the ``base_digits`` array.
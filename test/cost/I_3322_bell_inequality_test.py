@@ -54,3 +54,40 @@ class TestCostI3322BellInequality:
         ]
 
         assert np.isclose(I_3322_cost(*settings), -0.25, atol=1e-3)
+
+    def test_I_3322_bell_inequality_cost_fn_cache_prep(self):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+        meas_nodes = [
+            qnet.MeasureNode(3, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(3, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        I_3322_cost = qnet.I_3322_bell_inequality_cost_fn(ansatz)
+        cached_I_3322_cost = qnet.I_3322_bell_inequality_cost_fn(ansatz, cache_prep=True)
+
+        np.random.seed(7)
+        settings = ansatz.rand_network_settings()
+
+        assert np.isclose(cached_I_3322_cost(*settings), I_3322_cost(*settings))
+        assert np.allclose(
+            qml.grad(cached_I_3322_cost)(*settings), qml.grad(I_3322_cost)(*settings)
+        )
+
+    @pytest.mark.parametrize("wires_per_node", [1, 2])
+    def test_parallel_I_3322_grad_fn(self, wires_per_node):
+        n = wires_per_node
+        prep_nodes = [qnet.PrepareNode(1, range(2 * n), qnet.local_RY, 2 * n)]
+        meas_nodes = [
+            qnet.MeasureNode(3, 2, range(n), qnet.local_RY, n),
+            qnet.MeasureNode(3, 2, range(n, 2 * n), qnet.local_RY, n),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        I_3322_cost = qnet.I_3322_bell_inequality_cost_fn(ansatz)
+        grad_fn = qnet.parallel_I_3322_grad_fn(ansatz)
+
+        np.random.seed(23)
+        settings = ansatz.rand_network_settings()
+
+        assert np.allclose(grad_fn(*settings), qml.grad(I_3322_cost)(*settings))
@@ -1,12 +1,22 @@
 import pytest
+import pennylane as qml
 from pennylane import numpy as np
 
 import qnetvo as qnet
 
 
 class TestCHSHInequalityCost:
-    @pytest.mark.parametrize("parallel_flag", [False, True])
-    def test_chsh_inequality_cost_fn(self, parallel_flag):
+    @pytest.mark.parametrize(
+        "parallel_flag, cache_prep, diff_method",
+        [
+            (False, False, "best"),
+            (True, False, "best"),
+            (False, True, "best"),
+            (False, False, "parameter-shift"),
+            (False, True, "parameter-shift"),
+        ],
+    )
+    def test_chsh_inequality_cost_fn(self, parallel_flag, cache_prep, diff_method):
         prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
         meas_nodes = [
             qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
@@ -15,10 +25,48 @@ class TestCHSHInequalityCost:
 
         chsh_ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
 
-        chsh_cost = qnet.chsh_inequality_cost_fn(chsh_ansatz, parallel=parallel_flag)
+        if cache_prep and diff_method == "parameter-shift":
+            with pytest.raises(ValueError, match="A prepared state cannot be differentiated"):
+                qnet.chsh_inequality_cost_fn(
+                    chsh_ansatz, cache_prep=cache_prep, diff_method=diff_method
+                )
+            return
+
+        chsh_cost = qnet.chsh_inequality_cost_fn(
+            chsh_ansatz, parallel=parallel_flag, cache_prep=cache_prep, diff_method=diff_method
+        )
 
         zero_settings = chsh_ansatz.zero_network_settings()
         assert np.isclose(chsh_cost(*zero_settings), -2)
 
         settings = [0, np.pi / 2, np.pi / 4, -np.pi / 4]
         assert np.isclose(chsh_cost(*settings), -2 * np.sqrt(2))
+
+    @pytest.mark.parametrize(
+        "dev_name, diff_method",
+        [
+            ("default.qubit", "auto"),
+            ("default.qubit", "adjoint"),
+            ("default.mixed", "auto"),
+            ("lightning.qubit", "auto"),
+            ("lightning.qubit", "finite-diff"),
+        ],
+    )
+    def test_chsh_inequality_cost_fn_cache_prep_grad(self, dev_name, diff_method):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        chsh_ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes, dev_kwargs={"name": dev_name})
+
+        chsh_cost = qnet.chsh_inequality_cost_fn(chsh_ansatz)
+        cached_chsh_cost = qnet.chsh_inequality_cost_fn(
+            chsh_ansatz, cache_prep=True, diff_method=diff_method
+        )
+
+        settings = np.array([0, np.pi / 2, np.pi / 4, -np.pi / 4 + 0.3], requires_grad=True)
+        assert np.isclose(cached_chsh_cost(settings), chsh_cost(settings))
+        assert np.allclose(
+            qml.grad(cached_chsh_cost)(settings), qml.grad(chsh_cost)(settings), atol=1e-4
+        )
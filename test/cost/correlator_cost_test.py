@@ -0,0 +1,85 @@
+import pytest
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo as qnet
+
+
+@pytest.fixture
+def chsh_ansatz():
+    prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+    meas_nodes = [
+        qnet.MeasureNode(3, 2, [0], qnet.local_RY, 1),
+        qnet.MeasureNode(3, 2, [1], qnet.local_RY, 1),
+    ]
+    return qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+
+class CountingExecutor(qnet.SerialExecutor):
+    def __init__(self):
+        super().__init__()
+        self.num_executions = 0
+
+    def map(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        self.num_executions += len(settings_list)
+        return super().map(network_ansatz, qnode_fn, settings_list, qnode_kwargs)
+
+
+class TestCorrelatorCostFn:
+    def test_global_parity_terms(self, chsh_ansatz):
+        terms = [([[0], [x, y]], -((-1) ** (x * y))) for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+        cost = qnet.correlator_cost_fn(chsh_ansatz, terms)
+        chsh_cost = qnet.chsh_inequality_cost_fn(chsh_ansatz)
+
+        np.random.seed(13)
+        settings = chsh_ansatz.rand_network_settings()
+        assert np.isclose(cost(*settings), chsh_cost(*settings))
+        assert np.allclose(qml.grad(cost)(*settings), qml.grad(chsh_cost)(*settings))
+
+        outer_cost = qnet.correlator_cost_fn(
+            chsh_ansatz, terms, outer_fn=lambda term_values: qml.math.sum(term_values) ** 2
+        )
+        assert np.isclose(outer_cost(*settings), chsh_cost(*settings) ** 2)
+
+    def test_shared_executions(self, chsh_ansatz):
+        xy_mults = [
+            (0, 0, 1),
+            (0, 1, 1),
+            (0, 2, 1),
+            (1, 0, 1),
+            (1, 1, 1),
+            (1, 2, -1),
+            (2, 0, 1),
+            (2, 1, -1),
+        ]
+        local_signs = qnet.node_parity_sign_matrix(chsh_ansatz.layers[-1], [[0], [1]])
+
+        # I_3322 with its marginal terms sharing the (0,0) and (1,1) executions
+        terms = [([[0], [x, y]], mult * np.array([1, 0, 0, 0])) for x, y, mult in xy_mults]
+        terms += [
+            ([[0], [0, 0]], -local_signs[0] / 2 - local_signs[1]),
+            ([[0], [1, 1]], -local_signs[1] / 2),
+        ]
+
+        executor = CountingExecutor()
+        cost = qnet.correlator_cost_fn(
+            chsh_ansatz,
+            terms,
+            outer_fn=lambda term_values: 2 - qml.math.sum(term_values),
+            executor=executor,
+        )
+        I_3322_cost = qnet.I_3322_bell_inequality_cost_fn(chsh_ansatz)
+
+        np.random.seed(7)
+        settings = chsh_ansatz.rand_network_settings()
+        assert np.isclose(cost(*settings), I_3322_cost(*settings))
+        assert executor.num_executions == 8
+
+        assert np.allclose(qml.grad(cost)(*settings), qml.grad(I_3322_cost)(*settings))
+
+    def test_errors(self, chsh_ansatz):
+        with pytest.raises(ValueError, match="At least one term is required."):
+            qnet.correlator_cost_fn(chsh_ansatz, [])
+
+        with pytest.raises(ValueError, match="one element per joint measurement outcome, 4"):
+            qnet.correlator_cost_fn(chsh_ansatz, [([[0], [0, 0]], np.ones(3))])
@@ -1,10 +1,21 @@
 import pytest
 import pennylane as qml
 from pennylane import numpy as np
+import scipy.sparse
 
 import qnetvo as qnet
 
 
+class CountingExecutor(qnet.SerialExecutor):
+    def __init__(self):
+        super().__init__()
+        self.num_executions = 0
+
+    def map(self, network_ansatz, qnode_fn, settings_list, qnode_kwargs={}):
+        self.num_executions += len(settings_list)
+        return super().map(network_ansatz, qnode_fn, settings_list, qnode_kwargs)
+
+
 class TestLinearInequalityCost:
     def example_ansatz(self):
         prep_nodes = [
@@ -59,6 +70,107 @@ class TestLinearInequalityCost:
         assert np.isclose(dichotomic_cost(*zero_settings), -1)
         assert np.isclose(dichotomic_cost(*settings), -2)
 
+    def test_parallel_linear_probs_grad_fn(self):
+        network_ansatz = self.example_ansatz()
+
+        np.random.seed(29)
+        game = np.random.rand(8, 8)
+        postmap = np.array([[1, 0, 0, 1, 0, 1, 1, 0], [0, 1, 1, 0, 1, 0, 0, 1]])
+        settings = network_ansatz.rand_network_settings()
+
+        cost = qnet.linear_probs_cost_fn(network_ansatz, game)
+        grad_fn = qnet.parallel_linear_probs_grad_fn(network_ansatz, game)
+        assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
+
+        dichotomic_game = game[0:2]
+        cost = qnet.linear_probs_cost_fn(network_ansatz, dichotomic_game, postmap=postmap)
+        grad_fn = qnet.parallel_linear_probs_grad_fn(
+            network_ansatz, dichotomic_game, postmap=postmap
+        )
+        assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
+
+        with pytest.raises(ValueError, match="The `game` matrix must have 8 columns."):
+            qnet.parallel_linear_probs_grad_fn(network_ansatz, np.ones((8, 4)))
+
+    def test_linear_probs_cost_broadcast(self):
+        network_ansatz = self.example_ansatz()
+
+        game = np.array([[1, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0, 0, 0]])
+        postmap = np.array([[1, 0, 0, 1, 0, 1, 1, 0], [0, 1, 1, 0, 1, 0, 0, 1]])
+
+        cost = qnet.linear_probs_cost_fn(network_ansatz, game, postmap=postmap)
+        broadcast_cost = qnet.linear_probs_cost_fn(
+            network_ansatz, game, postmap=postmap, broadcast=True
+        )
+
+        np.random.seed(123)
+        settings = network_ansatz.rand_network_settings()
+
+        assert np.isclose(broadcast_cost(*settings), cost(*settings))
+        assert np.allclose(
+            qml.grad(broadcast_cost)(network_ansatz.network_settings_array(settings)),
+            qml.grad(cost)(network_ansatz.network_settings_array(settings)),
+        )
+
+    def test_linear_probs_cost_coarse_graining_postmap(self):
+        network_ansatz = self.example_ansatz()
+
+        np.random.seed(31)
+        game = np.random.rand(2, 8)
+        settings = network_ansatz.rand_network_settings()
+
+        postmap = qnet.CoarseGrainingPostmap.parity(3)
+        cost = qnet.linear_probs_cost_fn(network_ansatz, game, postmap=postmap)
+
+        raw_behavior = qnet.behavior_fn(network_ansatz)
+        dense_cost = lambda *settings: -np.sum(game * (postmap.matrix @ raw_behavior(settings)))
+
+        assert np.isclose(cost(*settings), dense_cost(*settings))
+        assert np.allclose(qml.grad(cost)(*settings), qml.grad(dense_cost)(*settings))
+
+    def test_linear_probs_cost_sparse_game(self):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(3, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(3, 2, [1], qnet.local_RY, 1),
+        ]
+        network_ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        # the CHSH game embedded in ternary inputs
+        game = np.zeros((4, 9))
+        for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            game[:, 3 * x + y] = qnet.parity_vector(2) * (-1) ** (x * y)
+
+        np.random.seed(17)
+        settings = network_ansatz.rand_network_settings()
+
+        chsh_ansatz = qnet.NetworkAnsatz(
+            prep_nodes,
+            [
+                qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+                qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+            ],
+        )
+        chsh_cost = qnet.chsh_inequality_cost_fn(chsh_ansatz)
+        chsh_settings = [settings[i] for i in [0, 1, 3, 4]]
+
+        for sparse_game in [game, scipy.sparse.csr_matrix(game)]:
+            for broadcast in [False, True]:
+                executor = CountingExecutor()
+                cost = qnet.linear_probs_cost_fn(
+                    network_ansatz, sparse_game, broadcast=broadcast, executor=executor
+                )
+
+                assert np.isclose(cost(*settings), chsh_cost(*chsh_settings))
+                assert executor.num_executions == (1 if broadcast else 4)
+
+        grad_fn = qnet.parallel_linear_probs_grad_fn(network_ansatz, scipy.sparse.csr_matrix(game))
+        cost = qnet.linear_probs_cost_fn(network_ansatz, game)
+        assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
+
+        zero_cost = qnet.linear_probs_cost_fn(network_ansatz, np.zeros((4, 9)))
+        assert zero_cost(*settings) == 0
+
     @pytest.mark.parametrize(
         "game,postmap,match",
         [
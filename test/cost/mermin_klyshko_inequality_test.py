@@ -53,7 +53,8 @@ class TestMerminKlyshkoInequality:
         assert len(meas_inputs_list) == num_terms
         assert len(scalars_list) == num_terms
 
-    def test_mermin_klyshko_inequality_fn_CHSH_scenario(self):
+    @pytest.mark.parametrize("cache_prep", [False, True])
+    def test_mermin_klyshko_inequality_fn_CHSH_scenario(self, cache_prep):
         prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
 
         meas_nodes = [
@@ -63,7 +64,7 @@ class TestMerminKlyshkoInequality:
 
         ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
 
-        mk_chsh_cost = qnet.mermin_klyshko_cost_fn(ansatz)
+        mk_chsh_cost = qnet.mermin_klyshko_cost_fn(ansatz, cache_prep=cache_prep)
         settings = [0, np.pi / 2, np.pi / 4, -np.pi / 4]
         chsh_cost = mk_chsh_cost(*settings)
 
@@ -118,3 +119,17 @@ class TestMerminKlyshkoInequality:
         assert np.isclose(
             -(mermin_klyshko_cost(*opt_meas_settings)), qnet.mermin_klyshko_quantum_bound(n)
         )
+
+
+@pytest.mark.parametrize("n", [2, 3])
+def test_parallel_mermin_klyshko_grad_fn(n):
+    prep_nodes = [qnet.PrepareNode(1, range(n), qnet.ghz_state, 0)]
+    meas_nodes = [qnet.MeasureNode(2, 2, [i], qnet.local_RY, 1) for i in range(n)]
+    ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+    cost = qnet.mermin_klyshko_cost_fn(ansatz)
+    grad_fn = qnet.parallel_mermin_klyshko_grad_fn(ansatz)
+
+    np.random.seed(19)
+    settings = ansatz.rand_network_settings()
+    assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
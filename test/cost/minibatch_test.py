@@ -0,0 +1,214 @@
+import pytest
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo as qnet
+
+
+def ternary_ansatz():
+    prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+    meas_nodes = [
+        qnet.MeasureNode(3, 2, [0], qnet.local_RY, 1),
+        qnet.MeasureNode(3, 2, [1], qnet.local_RY, 1),
+    ]
+    return qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+
+class TestMinibatchLinearProbsCostFn:
+    @pytest.mark.parametrize("sampling", ["uniform", "prior", "importance"])
+    def test_unbiased_estimates(self, sampling):
+        ansatz = ternary_ansatz()
+
+        np.random.seed(5)
+        game = np.random.rand(4, 9)
+        game[:, 4] = 0
+        settings = ansatz.rand_network_settings()
+
+        input_probs = 0.5 + np.random.rand(9)
+        cost = qnet.minibatch_linear_probs_cost_fn(
+            ansatz, game, 3, sampling=sampling, input_probs=input_probs, seed=11
+        )
+        exact_cost = qnet.linear_probs_cost_fn(ansatz, game)
+
+        num_samples = 300
+        estimates = [cost(*settings) for _ in range(num_samples)]
+        info = cost.estimator_info()
+
+        assert info["num_evaluations"] == num_samples
+        assert info["num_executions"] <= 3 * num_samples
+        assert info["estimate"] == -estimates[-1]
+
+        # the spread of the estimates is consistent with the tracked variance
+        assert np.isclose(np.var(estimates), info["mean_variance"], rtol=0.3)
+        assert np.isclose(
+            np.mean(estimates),
+            exact_cost(*settings),
+            atol=4 * np.sqrt(info["mean_variance"] / num_samples),
+        )
+
+        cost.estimator_clear()
+        assert cost.estimator_info()["num_evaluations"] == 0
+
+    def test_grad(self):
+        ansatz = ternary_ansatz()
+
+        # a CHSH game embedded in the ternary inputs
+        game = np.zeros((4, 9))
+        for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+            game[:, 3 * x + y] = qnet.parity_vector(2) * (-1) ** (x * y)
+
+        np.random.seed(3)
+        settings = ansatz.network_settings_array(ansatz.rand_network_settings())
+
+        # the importance sampler only draws the four CHSH inputs with equal probability
+        cost = qnet.minibatch_linear_probs_cost_fn(ansatz, game, 4, seed=7)
+        exact_cost = qnet.linear_probs_cost_fn(ansatz, game)
+
+        num_samples = 200
+        grads = [qml.grad(cost)(settings) for _ in range(num_samples)]
+        assert np.allclose(np.mean(grads, axis=0), qml.grad(exact_cost)(settings), atol=0.15)
+
+        opt_dict = qnet.gradient_descent(
+            cost,
+            ansatz.rand_network_settings(),
+            num_steps=10,
+            step_size=0.5,
+            sample_width=1,
+            verbose=False,
+        )
+        assert len(opt_dict["scores"]) == 11
+
+    def test_grad_variance(self):
+        ansatz = ternary_ansatz()
+
+        np.random.seed(17)
+        game = np.random.rand(4, 9)
+        settings = ansatz.network_settings_array(ansatz.rand_network_settings())
+
+        cost = qnet.minibatch_linear_probs_cost_fn(
+            ansatz, game, 3, sampling="uniform", seed=2, track_grad_variance=True
+        )
+
+        # forward evaluations do not record a gradient variance
+        cost(settings)
+        assert cost.estimator_info()["num_grad_evaluations"] == 0
+        assert cost.estimator_info()["grad_variance"] is None
+
+        num_samples = 300
+        grads = [qml.grad(cost)(settings) for _ in range(num_samples)]
+        info = cost.estimator_info()
+
+        assert info["num_grad_evaluations"] == num_samples
+        assert info["num_evaluations"] == num_samples + 1
+
+        # the spread of the gradients is consistent with the tracked variance
+        assert np.isclose(np.sum(np.var(grads, axis=0)), info["mean_grad_variance"], rtol=0.3)
+
+        cost.estimator_clear()
+        assert cost.estimator_info()["mean_grad_variance"] is None
+
+    def test_sampler_state(self, tmp_path):
+        ansatz = ternary_ansatz()
+
+        np.random.seed(23)
+        game = np.random.rand(4, 9)
+        settings = ansatz.rand_network_settings()
+
+        # a generator is advanced in place and its state can be persisted by the caller
+        rng = np.random.default_rng(5)
+        cost = qnet.minibatch_linear_probs_cost_fn(ansatz, game, 2, seed=rng)
+
+        rng_state = rng.bit_generator.state
+        estimates = [cost(*settings) for _ in range(3)]
+        assert rng.bit_generator.state != rng_state
+
+        rng.bit_generator.state = rng_state
+        assert [cost(*settings) for _ in range(3)] == estimates
+
+        # the default sampler draws from np.random, which is restored from checkpoints
+        cost = qnet.minibatch_linear_probs_cost_fn(ansatz, game, 2)
+        opt_kwargs = {"step_size": 0.1, "sample_width": 1, "verbose": False}
+        checkpoint_path = str(tmp_path / "checkpoint.pkl")
+
+        np.random.seed(29)
+        match_dict = qnet.gradient_descent(cost, settings, num_steps=6, **opt_kwargs)
+
+        np.random.seed(29)
+        qnet.gradient_descent(
+            cost,
+            settings,
+            num_steps=4,
+            checkpoint_path=checkpoint_path,
+            checkpoint_width=3,
+            **opt_kwargs,
+        )
+
+        np.random.seed(0)
+        opt_dict = qnet.gradient_descent(
+            cost, settings, num_steps=6, resume_from=checkpoint_path, **opt_kwargs
+        )
+
+        assert np.allclose(opt_dict["scores"], match_dict["scores"])
+        assert np.allclose(opt_dict["opt_settings"], match_dict["opt_settings"])
+
+    def test_errors(self):
+        ansatz = ternary_ansatz()
+        game = np.ones((4, 9))
+
+        with pytest.raises(ValueError, match="The `batch_size` must be at least 1."):
+            qnet.minibatch_linear_probs_cost_fn(ansatz, game, 0)
+
+        with pytest.raises(ValueError, match="The `sampling` must be either"):
+            qnet.minibatch_linear_probs_cost_fn(ansatz, game, 2, sampling="stratified")
+
+        with pytest.raises(ValueError, match="The `input_probs` must have 9 elements."):
+            qnet.minibatch_linear_probs_cost_fn(ansatz, game, 2, sampling="prior")
+
+        with pytest.raises(ValueError, match="The `input_probs` must be nonzero"):
+            qnet.minibatch_linear_probs_cost_fn(
+                ansatz, game, 2, sampling="prior", input_probs=np.eye(9)[0]
+            )
+
+        with pytest.raises(ValueError, match="The `game` must have a nonzero column."):
+            qnet.minibatch_linear_probs_cost_fn(ansatz, np.zeros((4, 9)), 2)
+
+
+class TestMinibatchMutualInfoCostFn:
+    def test_mutual_info_estimates(self):
+        prep_nodes = [qnet.PrepareNode(8, [0, 1, 2], qnet.local_RY, 3)]
+        meas_nodes = [qnet.MeasureNode(1, 8, [0, 1, 2], qnet.local_RY, 3)]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        priors = [np.ones(8) / 8]
+
+        exact_cost = qnet.mutual_info_cost_fn(ansatz, priors)
+
+        # encoding each input into a distinct basis state
+        settings = ansatz.zero_network_settings()
+        for x in range(8):
+            settings[3 * x : 3 * x + 3] = np.pi * np.array(qnet.mixed_base_num(x, [2, 2, 2]))
+
+        for sampling in ["prior", "uniform"]:
+            cost = qnet.minibatch_mutual_info_cost_fn(ansatz, priors, 64, sampling=sampling, seed=3)
+
+            assert np.isclose(cost(*settings), exact_cost(*settings), atol=0.2)
+            assert np.isclose(cost.estimator_info()["estimate"], 3)
+            assert np.isclose(cost.estimator_info()["variance"], 0)
+            assert cost.estimator_info()["num_executions"] <= 8
+
+        np.random.seed(13)
+        rand_settings = ansatz.rand_network_settings()
+        cost = qnet.minibatch_mutual_info_cost_fn(ansatz, priors, 16, seed=5)
+        estimates = [cost(*rand_settings) for _ in range(50)]
+        assert np.isclose(np.mean(estimates), exact_cost(*rand_settings), atol=0.2)
+
+        grad = qml.grad(cost)(ansatz.network_settings_array(rand_settings))
+        assert grad.shape == (ansatz.num_settings,)
+
+        cost = qnet.minibatch_mutual_info_cost_fn(
+            ansatz, priors, 16, seed=5, track_grad_variance=True
+        )
+        qml.grad(cost)(ansatz.network_settings_array(rand_settings))
+        assert cost.estimator_info()["grad_variance"] > 0
+
+        with pytest.raises(ValueError, match="The `sampling` must be either 'prior' or 'uniform'"):
+            qnet.minibatch_mutual_info_cost_fn(ansatz, priors, 4, sampling="importance")
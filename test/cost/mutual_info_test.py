@@ -54,6 +54,27 @@ class TestMutualInfoCostFn:
 
         assert np.isclose(mutual_info(*network_settings), -2)
 
+    def test_mutual_info_broadcast(self):
+        ansatz = qnet.NetworkAnsatz(
+            [qnet.PrepareNode(3, [0], qnet.local_RY, 1)],
+            [qnet.MeasureNode(1, 2, [0], qnet.local_RY, 1)],
+        )
+        priors = [np.array([0.5, 0.3, 0.2])]
+        postmap = np.array([[1, 0], [0, 1]])
+
+        mutual_info = qnet.mutual_info_cost_fn(ansatz, priors, postmap=postmap)
+        broadcast_mutual_info = qnet.mutual_info_cost_fn(
+            ansatz, priors, postmap=postmap, broadcast=True
+        )
+
+        network_settings = [0.1, 2.3, -0.4, 0.7]
+        assert np.isclose(broadcast_mutual_info(*network_settings), mutual_info(*network_settings))
+
+        chunked_mutual_info = qnet.mutual_info_cost_fn(
+            ansatz, priors, postmap=postmap, chunk_size=2
+        )
+        assert np.isclose(chunked_mutual_info(*network_settings), mutual_info(*network_settings))
+
 
 class TestMutualInfoOptimimzation:
     @pytest.mark.parametrize(
@@ -6,8 +6,10 @@ import qnetvo as qnet
 
 
 class TestNLocalChainBellInequality:
-    @pytest.mark.parametrize("parallel_flag", [False, True])
-    def test_nlocal_chain_22_cost_fn(self, parallel_flag):
+    @pytest.mark.parametrize(
+        "parallel_flag, cache_prep", [(False, False), (True, False), (False, True)]
+    )
+    def test_nlocal_chain_22_cost_fn(self, parallel_flag, cache_prep):
         prep_nodes = [
             qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0),
             qnet.PrepareNode(1, [2, 3], qnet.ghz_state, 0),
@@ -21,7 +23,7 @@ class TestNLocalChainBellInequality:
         bilocal_chain_ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
 
         bilocal_chain_cost = qnet.nlocal_chain_22_cost_fn(
-            bilocal_chain_ansatz, parallel=parallel_flag
+            bilocal_chain_ansatz, parallel=parallel_flag, cache_prep=cache_prep
         )
 
         zero_settings = bilocal_chain_ansatz.zero_network_settings()
@@ -32,6 +34,27 @@ class TestNLocalChainBellInequality:
 
         assert np.isclose(bilocal_chain_cost(*ideal_settings), -(1 / np.sqrt(2) + 1 / np.sqrt(2)))
 
+    @pytest.mark.parametrize(
+        "cost_fn", [qnet.nlocal_chain_22_cost_fn, qnet.chain_I22_fn, qnet.chain_J22_fn]
+    )
+    @pytest.mark.parametrize(
+        "exec_kwargs", [{"parallel": True}, {"executor": qnet.SerialExecutor()}]
+    )
+    def test_cache_prep_executor_errors(self, cost_fn, exec_kwargs):
+        prep_nodes = [
+            qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0),
+            qnet.PrepareNode(1, [2, 3], qnet.ghz_state, 0),
+        ]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1, 2], qnet.local_RY, 2),
+            qnet.MeasureNode(2, 2, [3], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        with pytest.raises(ValueError, match="cannot be combined"):
+            cost_fn(ansatz, cache_prep=True, **exec_kwargs)
+
     @pytest.mark.parametrize("natural_grad", [True, False])
     @pytest.mark.parametrize(
         "prep_nodes,meas_nodes",
@@ -84,6 +84,35 @@ class TestNlocalStar22CostFn:
 
         assert np.isclose(trilocal_22_cost(*ideal_settings), -np.sqrt(2))
 
+    @pytest.mark.parametrize("broadcast, cache_prep", [(True, False), (False, True), (True, True)])
+    def test_trilocal_star_cost_broadcast(self, broadcast, cache_prep):
+        trilocal_star_ansatz = self.trilocal_star_ry_ansatz()
+        cost = qnet.nlocal_star_22_cost_fn(trilocal_star_ansatz)
+        broadcast_cost = qnet.nlocal_star_22_cost_fn(
+            trilocal_star_ansatz, broadcast=broadcast, cache_prep=cache_prep
+        )
+
+        np.random.seed(123)
+        settings = trilocal_star_ansatz.rand_network_settings(as_array=True)
+
+        assert np.isclose(broadcast_cost(settings), cost(settings))
+        assert np.allclose(qml.grad(broadcast_cost)(settings), qml.grad(cost)(settings))
+
+    @pytest.mark.parametrize(
+        "cost_fn", [qnet.nlocal_star_22_cost_fn, qnet.star_I22_fn, qnet.star_J22_fn]
+    )
+    @pytest.mark.parametrize(
+        "opt_kwargs",
+        [
+            {"broadcast": True, "parallel": True},
+            {"cache_prep": True, "parallel": True},
+            {"cache_prep": True, "executor": qnet.SerialExecutor()},
+        ],
+    )
+    def test_star_executor_option_errors(self, cost_fn, opt_kwargs):
+        with pytest.raises(ValueError, match="cannot be combined"):
+            cost_fn(self.bilocal_star_ry_ansatz(), **opt_kwargs)
+
     @pytest.mark.parametrize("parallel_flag, nthreads", [(False, 4), (True, 4), (True, 5)])
     @pytest.mark.flaky(5)
     def test_bilocal_star_22_cost_gradient_descent(self, parallel_flag, nthreads):
@@ -110,9 +139,14 @@ class TestNlocalStar22CostFn:
     def test_trilocal_star_22_cost_gradient_descent(self, parallel_flag, nthreads):
         trilocal_star_ansatz = self.trilocal_star_ry_ansatz()
 
+        # the cost is built before seeding because constructing devices consumes random draws
+        trilocal_star_cost = qnet.nlocal_star_22_cost_fn(
+            trilocal_star_ansatz, parallel=False, nthreads=nthreads
+        )
+
         np.random.seed(45)
         opt_dict = qnet.gradient_descent(
-            qnet.nlocal_star_22_cost_fn(trilocal_star_ansatz, parallel=False, nthreads=nthreads),
+            trilocal_star_cost,
             trilocal_star_ansatz.rand_network_settings(),
             num_steps=8,
             step_size=2,
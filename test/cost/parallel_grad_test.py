@@ -0,0 +1,86 @@
+import pytest
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo as qnet
+
+
+@pytest.fixture
+def chsh_ansatz():
+    prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+    meas_nodes = [
+        qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+        qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+    ]
+    return qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+
+class TestParallelGradFn:
+    def test_linear_terms(self, chsh_ansatz):
+        terms = [
+            ([[0], [x, y]], qnet.global_parity_expval_qnode, -((-1) ** (x * y)))
+            for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]
+        ]
+        grad_fn = qnet.parallel_grad_fn(chsh_ansatz, terms)
+
+        cost = qnet.chsh_inequality_cost_fn(chsh_ansatz)
+
+        np.random.seed(13)
+        settings = chsh_ansatz.rand_network_settings()
+        assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
+
+    def test_weighted_probs_terms_and_outer_fn(self, chsh_ansatz):
+        np.random.seed(17)
+        weights = [np.random.rand(4) for _ in range(2)]
+        terms = [
+            ([[0], [0, 0]], qnet.joint_probs_qnode, weights[0]),
+            ([[0], [1, 1]], qnet.global_parity_expval_qnode, 0.5),
+            ([[0], [0, 1]], qnet.joint_probs_qnode, weights[1]),
+        ]
+        outer_fn = lambda term_values: qml.math.sum(term_values[0:2]) ** 2 + qml.math.sin(
+            term_values[2]
+        )
+
+        probs_qnode = qnet.joint_probs_qnode(chsh_ansatz)
+        expval_qnode = qnet.global_parity_expval_qnode(chsh_ansatz)
+
+        def cost(*settings):
+            v0 = qml.math.sum(
+                weights[0] * probs_qnode(chsh_ansatz.qnode_settings(settings, [[0], [0, 0]]))
+            )
+            v1 = 0.5 * expval_qnode(chsh_ansatz.qnode_settings(settings, [[0], [1, 1]]))
+            v2 = qml.math.sum(
+                weights[1] * probs_qnode(chsh_ansatz.qnode_settings(settings, [[0], [0, 1]]))
+            )
+            return (v0 + v1) ** 2 + qml.math.sin(v2)
+
+        settings = chsh_ansatz.rand_network_settings()
+        grad_fn = qnet.parallel_grad_fn(chsh_ansatz, terms, outer_fn=outer_fn)
+        assert np.allclose(grad_fn(*settings), qml.grad(cost)(*settings))
+
+        with qnet.SerialExecutor() as executor:
+            serial_grad_fn = qnet.parallel_grad_fn(
+                chsh_ansatz, terms, outer_fn=outer_fn, executor=executor
+            )
+            assert np.allclose(serial_grad_fn(*settings), grad_fn(*settings))
+
+    def test_natural_grad(self, chsh_ansatz):
+        settings = chsh_ansatz.rand_network_settings()
+        terms = [([[0], [0, 1]], qnet.joint_probs_qnode, np.array([1, 0, 0, -1]))]
+
+        nat_grad_fn = qnet.parallel_grad_fn(chsh_ansatz, terms, natural_grad=True)
+
+        probs_qnode = qnet.joint_probs_qnode(chsh_ansatz)
+        qnode_settings = chsh_ansatz.qnode_settings(settings, [[0], [0, 1]])
+        match_grad = qnet.qnode_grad(
+            probs_qnode, qnode_settings, natural_grad=True, weights=np.array([1, 0, 0, -1])
+        )
+
+        assert np.allclose(
+            nat_grad_fn(*settings),
+            chsh_ansatz.expand_qnode_settings(match_grad, [[0], [0, 1]]),
+        )
+
+    def test_parallel_grad_fn_errors(self, chsh_ansatz):
+        with pytest.raises(ValueError, match="At least one term is required."):
+            qnet.parallel_grad_fn(chsh_ansatz, [])
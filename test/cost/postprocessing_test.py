@@ -1,4 +1,5 @@
 import pytest
+import pennylane as qml
 from pennylane import numpy as np
 
 import qnetvo as qnet
@@ -27,3 +28,79 @@ class TestPostProcessing:
             match="Input `n_qubits` must satisfy `n_qubits >= 1`.",
         ):
             qnet.parity_vector(0)
+
+    def test_parity_sign_vector(self):
+        assert np.all(qnet.parity_sign_vector(1, [0]) == [1, -1])
+        assert np.all(qnet.parity_sign_vector(2, [0]) == [1, 1, -1, -1])
+        assert np.all(qnet.parity_sign_vector(2, [1]) == [1, -1, 1, -1])
+        assert np.all(qnet.parity_sign_vector(3, [0, 1, 2]) == qnet.parity_vector(3))
+        assert np.all(qnet.parity_sign_vector(3, []) == np.ones(8))
+
+        with pytest.raises(ValueError, match="Input `n_qubits` must satisfy `n_qubits >= 1`."):
+            qnet.parity_sign_vector(0, [])
+
+        with pytest.raises(ValueError, match="Input `qubit_ids` must be a subset"):
+            qnet.parity_sign_vector(2, [2])
+
+    def test_parity_sign_matrix(self):
+        sign_matrix = qnet.parity_sign_matrix(2, [[0, 1], [0], [1]])
+
+        assert sign_matrix.shape == (3, 4)
+        assert np.all(sign_matrix == [[1, -1, -1, 1], [1, 1, -1, -1], [1, -1, 1, -1]])
+
+        probs_vec = np.array([0.1, 0.2, 0.3, 0.4])
+        assert np.allclose(sign_matrix @ probs_vec, [0, -0.4, -0.2])
+
+    def test_coarse_graining_postmap(self):
+        postmap = qnet.CoarseGrainingPostmap([1, 0, 0, 1])
+
+        assert postmap.shape == (2, 4)
+        assert len(postmap) == 2
+        assert np.all(postmap.matrix == [[0, 1, 1, 0], [1, 0, 0, 1]])
+        assert np.all(postmap.T == postmap.matrix.T)
+
+        probs_vec = np.array([0.1, 0.2, 0.3, 0.4])
+        assert np.allclose(postmap @ probs_vec, [0.5, 0.5])
+
+        behavior = np.array([[0.1, 0.2, 0.3, 0.4], [0.4, 0.3, 0.2, 0.1]]).T
+        assert np.allclose(postmap @ behavior, postmap.matrix @ behavior)
+
+        # outputs without any bitstrings have zero probability
+        postmap = qnet.CoarseGrainingPostmap([0, 0, 2, 2], num_out=4)
+        assert np.allclose(postmap @ probs_vec, [0.3, 0, 0.7, 0])
+
+        identity = qnet.CoarseGrainingPostmap(range(4))
+        assert identity.is_identity
+        assert identity @ probs_vec is probs_vec
+
+        with pytest.raises(ValueError, match=r"Each label must be in `range\(2\)`."):
+            qnet.CoarseGrainingPostmap([0, 2], num_out=2)
+
+    def test_coarse_graining_postmap_constructors(self):
+        parity_postmap = qnet.CoarseGrainingPostmap.parity(3)
+        assert np.all(parity_postmap.labels == [0, 1, 1, 0, 1, 0, 0, 1])
+
+        bits_postmap = qnet.CoarseGrainingPostmap.bit_selection(3, [2, 0])
+        assert np.all(bits_postmap.labels == [0, 2, 0, 2, 1, 3, 1, 3])
+        assert bits_postmap.shape == (4, 8)
+
+        with pytest.raises(ValueError, match="Input `qubit_ids` must be a subset"):
+            qnet.CoarseGrainingPostmap.bit_selection(2, [2])
+
+        dense_postmap = np.array([[1, 0, 0, 1], [0, 1, 1, 0]])
+        assert qnet.is_deterministic_postmap(dense_postmap)
+        assert np.all(qnet.CoarseGrainingPostmap.from_matrix(dense_postmap).labels == [0, 1, 1, 0])
+
+        stochastic_postmap = np.array([[1, 0.5, 0, 1], [0, 0.5, 1, 0]])
+        assert not qnet.is_deterministic_postmap(stochastic_postmap)
+        with pytest.raises(ValueError, match="The `postmap` matrix must be deterministic."):
+            qnet.CoarseGrainingPostmap.from_matrix(stochastic_postmap)
+
+    def test_coarse_graining_postmap_grad(self):
+        postmap = qnet.CoarseGrainingPostmap.parity(2)
+        probs_vec = np.array([0.1, 0.2, 0.3, 0.4], requires_grad=True)
+
+        cost = lambda probs: postmap @ (probs**2)
+        dense_cost = lambda probs: postmap.matrix @ (probs**2)
+
+        assert np.allclose(qml.jacobian(cost)(probs_vec), qml.jacobian(dense_cost)(probs_vec))
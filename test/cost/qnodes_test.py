@@ -1,3 +1,4 @@
+import logging
 import pytest
 import pennylane as qml
 from pennylane import numpy as np
@@ -144,3 +145,207 @@ class TestQNodes:
             ValueError, match="Specified wires must be a subset of the wires in the network ansatz."
         ):
             qnet.density_matrix_qnode(ansatz, wires=[3])
+
+    @pytest.mark.parametrize("dev_name", ["default.qubit", "default.mixed"])
+    def test_cached_prep_qnode_fn(self, dev_name):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes, dev_kwargs={"name": dev_name})
+
+        np.random.seed(5)
+        settings = ansatz.rand_network_settings()
+        inputs_list = [[[0], [x, y]] for x in range(2) for y in range(2)]
+
+        probs_qnode = qnet.joint_probs_qnode(ansatz)
+        match_probs = np.stack(
+            [probs_qnode(ansatz.qnode_settings(settings, inputs)) for inputs in inputs_list]
+        )
+
+        for broadcast in [False, True]:
+            cached_probs = qnet.cached_prep_qnode_fn(
+                ansatz, qnet.joint_probs_qnode, broadcast=broadcast
+            )
+            assert np.allclose(cached_probs(settings, inputs_list), match_probs)
+
+        expval_qnode = qnet.global_parity_expval_qnode(ansatz)
+        cached_expvals = qnet.cached_prep_qnode_fn(ansatz, qnet.global_parity_expval_qnode)
+
+        def match_cost(*settings):
+            return sum(
+                expval_qnode(ansatz.qnode_settings(settings, inputs)) for inputs in inputs_list
+            )
+
+        def cached_cost(*settings):
+            return np.sum(cached_expvals(settings, inputs_list))
+
+        assert np.isclose(cached_cost(*settings), match_cost(*settings))
+        assert np.allclose(
+            qml.grad(cached_cost)(*settings), qml.grad(match_cost)(*settings), atol=1e-6
+        )
+
+    def test_prepared_state_qnode_classical_communication_error(self):
+        prep_nodes = [qnet.PrepareNode(wires=[0, 1], ansatz_fn=qnet.ghz_state)]
+        cc_nodes = [qnet.CCSenderNode(num_in=2, wires=[0], cc_wires_out=[0])]
+        meas_nodes = [qnet.CCReceiverNode(wires=[1], cc_wires_in=[0])]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, cc_nodes, meas_nodes)
+
+        with pytest.raises(ValueError, match="classical communication"):
+            qnet.prepared_state_qnode(ansatz)
+
+        with pytest.raises(ValueError, match="classical communication"):
+            qnet.joint_probs_qnode(ansatz, prepared_state=True)
+
+    def test_node_parity_sign_matrix(self):
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1, 2], qnet.local_RY, 2),
+        ]
+
+        sign_matrix = qnet.node_parity_sign_matrix(meas_nodes, [[0, 1], [0], [1]])
+
+        assert np.all(sign_matrix[0] == qnet.parity_vector(3))
+        assert np.all(sign_matrix[1] == qnet.parity_sign_vector(3, [0]))
+        assert np.all(sign_matrix[2] == qnet.parity_sign_vector(3, [1, 2]))
+
+    @pytest.mark.parametrize("dev_name", ["default.qubit", "default.mixed"])
+    def test_parity_correlators_fn(self, dev_name):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1, 2], qnet.local_RY, 3)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1, 2], qnet.local_RY, 2),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes, dev_kwargs={"name": dev_name})
+
+        np.random.seed(3)
+        settings = ansatz.rand_network_settings()
+        inputs_list = [[[0], [x, y]] for x in range(2) for y in range(2)]
+        qnode_settings = ansatz.qnode_settings(settings, inputs_list[0])
+
+        global_qnode = qnet.global_parity_expval_qnode(ansatz)
+        local_qnode = qnet.local_parity_expval_qnode(ansatz)
+        correlators = qnet.parity_correlators_fn(ansatz)
+
+        match_correlators = np.array([global_qnode(qnode_settings), *local_qnode(qnode_settings)])
+        assert np.allclose(correlators(qnode_settings), match_correlators)
+
+        assert np.allclose(
+            qml.jacobian(correlators)(qnode_settings)[0],
+            qml.grad(global_qnode)(qnode_settings),
+        )
+
+        subset_correlators = qnet.parity_correlators_fn(ansatz, node_subsets=[[1], [0, 1]])
+        assert np.allclose(subset_correlators(qnode_settings), match_correlators[[2, 0]])
+
+        broadcast_settings = ansatz.broadcast_qnode_settings(settings, inputs_list)
+        broadcast_correlators = correlators(broadcast_settings)
+
+        assert broadcast_correlators.shape == (4, 3)
+        for i, inputs in enumerate(inputs_list):
+            assert np.allclose(
+                broadcast_correlators[i], correlators(ansatz.qnode_settings(settings, inputs))
+            )
+
+    def test_memoize_qnode(self):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+        memoized_qnode = qnet.memoize_qnode(qnode, maxsize=2)
+
+        settings = [np.array([0.1, 0.2, 0.3, x], requires_grad=True) for x in [0.4, 0.5, 0.6]]
+
+        assert np.isclose(memoized_qnode(settings[0]), qnode(settings[0]))
+        assert np.isclose(memoized_qnode(settings[0]), qnode(settings[0]))
+        assert memoized_qnode.cache_info() == {"hits": 1, "misses": 1, "maxsize": 2, "currsize": 1}
+
+        # gradients bypass the cache
+        assert np.allclose(qml.grad(memoized_qnode)(settings[0]), qml.grad(qnode)(settings[0]))
+        assert memoized_qnode.cache_info()["hits"] == 1
+
+        # least recently used results are evicted
+        memoized_qnode(settings[1])
+        memoized_qnode(settings[0])
+        memoized_qnode(settings[2])
+        assert memoized_qnode.cache_info() == {"hits": 2, "misses": 3, "maxsize": 2, "currsize": 2}
+
+        memoized_qnode(settings[0])
+        assert memoized_qnode.cache_info()["hits"] == 3
+        memoized_qnode(settings[1])
+        assert memoized_qnode.cache_info()["misses"] == 4
+
+        memoized_qnode.cache_clear()
+        assert memoized_qnode.cache_info() == {"hits": 0, "misses": 0, "maxsize": 2, "currsize": 0}
+
+        with pytest.raises(ValueError, match="The `maxsize` must be at least 1."):
+            qnet.memoize_qnode(qnode, maxsize=0)
+
+    def test_select_diff_method(self, caplog):
+        def ansatz_fn(num_meas_nodes=2, noise=False, cc=False, dev_kwargs=None):
+            prep_nodes = [qnet.PrepareNode(1, range(num_meas_nodes), qnet.ghz_state, 0)]
+            meas_nodes = [
+                qnet.MeasureNode(2, 2, [i], qnet.local_RY, 1) for i in range(num_meas_nodes)
+            ]
+            layers = [prep_nodes]
+            if noise:
+                layers += [[qnet.NoiseNode([0], lambda settings, wires: qml.BitFlip(0.1, wires))]]
+            if cc:
+                cc_meas = lambda settings, wires: [qml.measure(wires[0])]
+                layers += [[qnet.CCSenderNode(1, [0], [0], cc_meas, 0)]]
+                meas_nodes[1] = qnet.CCReceiverNode(
+                    2, [1], [0], lambda settings, wires, cc_wires: qml.RY(settings[0], wires), 1
+                )
+
+            return qnet.NetworkAnsatz(*layers, meas_nodes, dev_kwargs=dev_kwargs)
+
+        assert qnet.select_diff_method(ansatz_fn()) == "backprop"
+        assert qnet.select_diff_method(ansatz_fn(), max_backprop_wires=1) == "adjoint"
+        assert (
+            qnet.select_diff_method(ansatz_fn(), allow_adjoint=False, max_backprop_wires=1)
+            == "backprop"
+        )
+        assert qnet.select_diff_method(ansatz_fn(cc=True), max_backprop_wires=1) == "backprop"
+        assert (
+            qnet.select_diff_method(ansatz_fn(num_meas_nodes=1), max_backprop_wires=0)
+            == "parameter-shift"
+        )
+
+        shots_ansatz = ansatz_fn(dev_kwargs={"name": "default.qubit", "shots": 100})
+        assert qnet.select_diff_method(shots_ansatz) == "parameter-shift"
+
+        assert qnet.select_diff_method(ansatz_fn(noise=True)) == "parameter-shift"
+        mixed_ansatz = ansatz_fn(noise=True, dev_kwargs={"name": "default.mixed"})
+        assert qnet.select_diff_method(mixed_ansatz) == "backprop"
+
+        lightning_ansatz = ansatz_fn(dev_kwargs={"name": "lightning.qubit"})
+        with caplog.at_level(logging.INFO, logger="qnetvo.qnodes"):
+            assert qnet.select_diff_method(lightning_ansatz) == "adjoint"
+        assert caplog.messages == [
+            "selected diff_method='adjoint' because the device is a compiled state-vector simulator"
+        ]
+
+        # qnodes and cost functions resolve the automatic method
+        ansatz = ansatz_fn()
+        assert qnet.global_parity_expval_qnode(ansatz, diff_method="auto").diff_method == "backprop"
+        assert qnet.joint_probs_qnode(ansatz, diff_method="auto").diff_method == "backprop"
+        assert (
+            qnet.global_parity_expval_qnode(lightning_ansatz, diff_method="auto").diff_method
+            == "adjoint"
+        )
+        assert (
+            qnet.joint_probs_qnode(lightning_ansatz, diff_method="auto").diff_method
+            == "parameter-shift"
+        )
+
+        np.random.seed(3)
+        settings = lightning_ansatz.rand_network_settings()
+        cost = qnet.chsh_inequality_cost_fn(lightning_ansatz, diff_method="auto")
+        match_cost = qnet.chsh_inequality_cost_fn(ansatz_fn())
+        assert np.isclose(cost(*settings), match_cost(*settings))
+        assert np.allclose(qml.grad(cost)(*settings), qml.grad(match_cost)(*settings))
@@ -0,0 +1,533 @@
+import pytest
+import asyncio
+import os
+import pickle
+import threading
+import time
+import pennylane as qml
+from pennylane import numpy as np
+
+import qnetvo as qnet
+
+
+@pytest.fixture(scope="module")
+def process_executor():
+    executor = qnet.ProcessExecutor(num_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def chsh_ansatz():
+    prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2)]
+    meas_nodes = [
+        qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+        qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+    ]
+    return qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+
+def test_qnode_grad():
+    ansatz = chsh_ansatz()
+    qnode = qnet.global_parity_expval_qnode(ansatz)
+    settings = np.array([0.1, 0.2, 0.3, 0.4], requires_grad=True)
+
+    assert np.allclose(qnet.qnode_grad(qnode, settings), qml.grad(qnode)(settings))
+
+    metric_inv = np.linalg.pinv(qml.metric_tensor(qnode, approx="block-diag")(settings))
+    assert np.allclose(
+        qnet.qnode_grad(qnode, settings, natural_grad=True),
+        metric_inv @ qml.grad(qnode)(settings),
+    )
+
+    probs_qnode = qnet.joint_probs_qnode(ansatz)
+    weights = np.array([1, -1, -1, 1])
+    assert np.allclose(
+        qnet.qnode_grad(probs_qnode, settings, weights=weights), qml.grad(qnode)(settings)
+    )
+    assert np.allclose(
+        qnet.qnode_grad(probs_qnode, settings, natural_grad=True, weights=weights),
+        metric_inv @ qml.grad(qnode)(settings),
+    )
+
+    with qnet.SerialExecutor() as executor:
+        grads = executor.map_grad(
+            ansatz, qnet.joint_probs_qnode, [settings, settings], weights_list=[weights, -weights]
+        )
+        assert np.allclose(grads[0], -grads[1])
+
+        with pytest.raises(ValueError, match="The `weights_list` must have the same length"):
+            executor.map_grad(ansatz, qnet.joint_probs_qnode, [settings], weights_list=[])
+
+
+@pytest.mark.parametrize(
+    "executor_class, kwargs",
+    [
+        (qnet.SerialExecutor, {}),
+        (qnet.ThreadExecutor, {"num_workers": 2}),
+        (qnet.AsyncExecutor, {}),
+    ],
+)
+class TestLocalExecutors:
+    def test_map(self, executor_class, kwargs):
+        ansatz = chsh_ansatz()
+        np.random.seed(3)
+        settings_list = [np.random.rand(4, requires_grad=True) for _ in range(5)]
+
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+
+        with executor_class(**kwargs) as executor:
+            results = executor.map(ansatz, qnet.global_parity_expval_qnode, settings_list)
+            assert np.allclose(results, [qnode(settings) for settings in settings_list])
+
+            grads = executor.map_grad(ansatz, qnet.global_parity_expval_qnode, settings_list)
+            assert np.allclose(grads, [qml.grad(qnode)(settings) for settings in settings_list])
+
+            # results are differentiable
+            settings = np.array([0.1, 0.2, 0.3, 0.4], requires_grad=True)
+            sum_fn = lambda settings: qml.math.sum(
+                qml.math.stack(
+                    executor.map(ansatz, qnet.global_parity_expval_qnode, [settings, 2 * settings])
+                )
+            )
+            assert np.allclose(
+                qml.grad(sum_fn)(settings), qml.grad(lambda s: qnode(s) + qnode(2 * s))(settings)
+            )
+
+    def test_memoize(self, executor_class, kwargs):
+        ansatz = chsh_ansatz()
+        num_executions = [0]
+
+        def counting_qnode_fn(network_ansatz):
+            qnode = qnet.global_parity_expval_qnode(network_ansatz)
+
+            def counting_qnode(settings):
+                num_executions[0] += 1
+                return qnode(settings)
+
+            return counting_qnode
+
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+        settings_list = [np.array([0.1, 0.2, 0.3, x], requires_grad=True) for x in [0.4, 0.5]]
+
+        with executor_class(memoize=8, **kwargs) as executor:
+            results = executor.map(ansatz, counting_qnode_fn, settings_list + settings_list[0:1])
+            assert np.allclose(results, [qnode(settings_list[i]) for i in [0, 1, 0]])
+            assert num_executions[0] == 2
+
+            results = executor.map(ansatz, counting_qnode_fn, settings_list[1:2])
+            assert np.isclose(results[0], qnode(settings_list[1]))
+            assert num_executions[0] == 2
+            assert executor.memo.info()["hits"] == 1
+
+            # traced settings are evaluated and remain differentiable
+            sum_fn = lambda settings: qml.math.sum(
+                qml.math.stack(executor.map(ansatz, counting_qnode_fn, [settings]))
+            )
+            assert np.allclose(
+                qml.grad(sum_fn)(settings_list[0]), qml.grad(qnode)(settings_list[0])
+            )
+            assert num_executions[0] == 3
+
+            cost = qnet.chsh_inequality_cost_fn(ansatz, executor=executor)
+            match_cost = qnet.chsh_inequality_cost_fn(ansatz)
+            settings = ansatz.rand_network_settings()
+            assert np.isclose(cost(*settings), match_cost(*settings))
+            assert np.isclose(cost(*settings), match_cost(*settings))
+            assert np.allclose(qml.grad(cost)(*settings), qml.grad(match_cost)(*settings))
+
+    def test_cost_fns(self, executor_class, kwargs):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        np.random.seed(5)
+        settings = ansatz.rand_network_settings()
+
+        game = np.random.rand(4, 4)
+        cost_fns = [
+            lambda **kw: qnet.chsh_inequality_cost_fn(ansatz, **kw),
+            lambda **kw: qnet.linear_probs_cost_fn(ansatz, game, **kw),
+            lambda **kw: qnet.linear_probs_cost_fn(ansatz, game, broadcast=True, **kw),
+            lambda **kw: qnet.shannon_entropy_cost_fn(ansatz, **kw),
+            lambda **kw: qnet.mermin_klyshko_cost_fn(ansatz, **kw),
+            lambda **kw: qnet.negativity_cost_fn(ansatz, 1, 1, [0, 1], **kw),
+        ]
+
+        with executor_class(**kwargs) as executor:
+            for cost_fn in cost_fns:
+                assert np.isclose(cost_fn(executor=executor)(*settings), cost_fn()(*settings))
+
+            behavior = qnet.behavior_fn(ansatz, executor=executor)
+            assert np.allclose(
+                behavior(ansatz.network_settings_array(settings)),
+                qnet.behavior_fn(ansatz)(ansatz.network_settings_array(settings)),
+            )
+
+            grad_fn = qnet.parallel_chsh_grad_fn(ansatz, executor=executor)
+            assert np.allclose(grad_fn(*settings), qnet.parallel_chsh_grad_fn(ansatz)(*settings))
+
+    def test_cost_gradient_descent(self, executor_class, kwargs):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(3, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(3, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        np.random.seed(9)
+        settings = ansatz.rand_network_settings()
+
+        with executor_class(**kwargs) as executor:
+            cost = qnet.I_3322_bell_inequality_cost_fn(ansatz, executor=executor)
+            match_cost = qnet.I_3322_bell_inequality_cost_fn(ansatz)
+
+            opt_kwargs = {"num_steps": 3, "step_size": 0.1, "verbose": False}
+            opt_dict = qnet.gradient_descent(cost, settings, **opt_kwargs)
+            match_dict = qnet.gradient_descent(match_cost, settings, **opt_kwargs)
+
+            assert np.allclose(opt_dict["scores"], match_dict["scores"])
+
+
+def test_thread_executor_work_queue():
+    # a qnode constructor whose evaluations sleep for ``settings[0]`` seconds
+    def latency_qnode_fn(network_ansatz):
+        def qnode(settings):
+            time.sleep(float(settings[0]))
+            return threading.get_ident()
+
+        return qnode
+
+    ansatz = chsh_ansatz()
+    settings_list = [np.array([0.5])] + [np.array([0.0]) for _ in range(5)]
+
+    with qnet.ThreadExecutor(num_workers=2) as executor:
+        thread_ids = executor.map(ansatz, latency_qnode_fn, settings_list)
+
+    # the fast thread evaluates all remaining settings while the slow evaluation runs
+    assert len(set(thread_ids)) == 2
+    assert thread_ids.count(thread_ids[0]) == 1
+
+
+def test_default_thread_executor_shares_pool():
+    ansatz = chsh_ansatz()
+    settings = ansatz.rand_network_settings()
+
+    costs = [qnet.chsh_inequality_cost_fn(ansatz, parallel=True) for _ in range(3)]
+    for cost in costs:
+        cost(*settings)
+    num_threads = threading.active_count()
+
+    costs = [qnet.chsh_inequality_cost_fn(ansatz, parallel=True) for _ in range(3)]
+    for cost in costs:
+        cost(*settings)
+
+    assert threading.active_count() == num_threads
+
+    executor = qnet.executors._default_thread_executor()
+    assert executor.pool is qnet.executors._default_thread_executor().pool
+
+    # a shared pool is not shut down by the executor
+    executor.shutdown()
+    parallel_cost = qnet.chsh_inequality_cost_fn(ansatz, parallel=True)
+    assert np.isclose(parallel_cost(*settings), qnet.chsh_inequality_cost_fn(ansatz)(settings))
+
+
+def test_async_executor_amap():
+    ansatz = chsh_ansatz()
+    settings_list = [np.array([0.1 * i, 0.2, 0.3, 0.4]) for i in range(6)]
+    qnode = qnet.global_parity_expval_qnode(ansatz)
+
+    async def _amap(executor):
+        return await executor.amap(ansatz, qnet.global_parity_expval_qnode, settings_list)
+
+    with qnet.AsyncExecutor(max_concurrency=2) as executor:
+        results = asyncio.run(_amap(executor))
+
+    assert np.allclose(results, [qnode(settings) for settings in settings_list])
+
+
+class MockLatencyDevice:
+    """Wraps the global parity qnode with artificial latency and transient failures."""
+
+    def __init__(self, latency=0.05, num_failures=0):
+        self.latency = latency
+        self.num_failures = num_failures
+        self.lock = threading.Lock()
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+        self.start_times = []
+        self.calls = {}
+
+    def qnode_fn(self, network_ansatz):
+        qnode = qnet.global_parity_expval_qnode(network_ansatz)
+
+        def latency_qnode(settings):
+            key = tuple(qml.math.to_numpy(settings).tolist())
+            with self.lock:
+                self.start_times.append(time.monotonic())
+                self.calls[key] = self.calls.get(key, 0) + 1
+                num_calls = self.calls[key]
+                self.num_in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.num_in_flight)
+
+            try:
+                time.sleep(self.latency)
+                if num_calls <= self.num_failures:
+                    raise ConnectionError("Mock remote execution failed.")
+
+                return qnode(settings)
+            finally:
+                with self.lock:
+                    self.num_in_flight -= 1
+
+        return latency_qnode
+
+
+class TestAsyncExecutor:
+    def test_max_concurrency(self):
+        ansatz = chsh_ansatz()
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+        settings_list = [np.array([0.1 * i, 0.2, 0.3, 0.4]) for i in range(12)]
+
+        device = MockLatencyDevice(latency=0.05)
+        with qnet.AsyncExecutor(max_concurrency=3) as executor:
+            results = executor.map(ansatz, device.qnode_fn, settings_list)
+
+        assert device.max_in_flight == 3
+        assert np.allclose(results, [qnode(settings) for settings in settings_list])
+
+    def test_num_threads(self):
+        ansatz = chsh_ansatz()
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+        settings_list = [np.array([0.1 * i, 0.2, 0.3, 0.4]) for i in range(12)]
+
+        device = MockLatencyDevice(latency=0.05)
+        with qnet.AsyncExecutor(max_concurrency=8, num_threads=2) as executor:
+            assert executor.pool._max_workers == 2
+            results = executor.map(ansatz, device.qnode_fn, settings_list)
+
+        assert device.max_in_flight == 2
+        assert np.allclose(results, [qnode(settings) for settings in settings_list])
+
+        with qnet.AsyncExecutor(max_concurrency=1000) as executor:
+            assert executor.num_threads == min(1000, os.cpu_count() + 4)
+
+    def test_rate_limit(self):
+        ansatz = chsh_ansatz()
+        settings_list = [np.array([0.1 * i, 0.2, 0.3, 0.4]) for i in range(5)]
+
+        device = MockLatencyDevice(latency=0)
+        with qnet.AsyncExecutor(max_concurrency=5, rate_limit=20, burst=1) as executor:
+            executor.map(ansatz, device.qnode_fn, settings_list)
+
+        start_times = sorted(device.start_times)
+        assert start_times[-1] - start_times[0] >= 0.15
+
+    def test_retries(self):
+        ansatz = chsh_ansatz()
+        qnode = qnet.global_parity_expval_qnode(ansatz)
+        settings_list = [np.array([0.1 * i, 0.2, 0.3, 0.4]) for i in range(6)]
+
+        device = MockLatencyDevice(latency=0.01, num_failures=2)
+        with qnet.AsyncExecutor(max_concurrency=2, max_retries=2, retry_backoff=0.01) as executor:
+            results = executor.map(ansatz, device.qnode_fn, settings_list)
+
+            assert executor.num_retries == 12
+
+        assert np.allclose(results, [qnode(settings) for settings in settings_list])
+
+        device = MockLatencyDevice(latency=0.01, num_failures=2)
+        with qnet.AsyncExecutor(max_retries=1, retry_backoff=0.01) as executor:
+            with pytest.raises(ConnectionError, match="Mock remote execution failed."):
+                executor.map(ansatz, device.qnode_fn, settings_list)
+
+        device = MockLatencyDevice(latency=0.01, num_failures=1)
+        with qnet.AsyncExecutor(max_retries=1, retry_exceptions=(TimeoutError,)) as executor:
+            with pytest.raises(ConnectionError, match="Mock remote execution failed."):
+                executor.map(ansatz, device.qnode_fn, settings_list)
+
+        # errors that are not transient are raised without retrying
+        def invalid_qnode_fn(network_ansatz):
+            def invalid_qnode(settings):
+                raise ValueError("Invalid settings.")
+
+            return invalid_qnode
+
+        with qnet.AsyncExecutor(max_retries=2, retry_backoff=0.01) as executor:
+            with pytest.raises(ValueError, match="Invalid settings."):
+                executor.map(ansatz, invalid_qnode_fn, settings_list)
+
+            assert executor.num_retries == 0
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match="The `max_concurrency` must be at least 1."):
+            qnet.AsyncExecutor(max_concurrency=0)
+
+        with pytest.raises(ValueError, match="The `num_threads` must be at least 1."):
+            qnet.AsyncExecutor(num_threads=0)
+
+        with pytest.raises(ValueError, match="The `rate_limit` must be positive."):
+            qnet.AsyncExecutor(rate_limit=0)
+
+
+class TestProcessExecutor:
+    def test_map(self, process_executor):
+        ansatz = chsh_ansatz()
+        np.random.seed(3)
+        settings_list = [np.random.rand(4) for _ in range(5)]
+
+        expval_qnode = qnet.global_parity_expval_qnode(ansatz)
+        results = process_executor.map(ansatz, qnet.global_parity_expval_qnode, settings_list)
+
+        assert len(results) == 5
+        assert np.allclose(results, [expval_qnode(settings) for settings in settings_list])
+
+        local_qnode = qnet.local_parity_expval_qnode(ansatz)
+        results = process_executor.map(ansatz, qnet.local_parity_expval_qnode, settings_list)
+        assert np.allclose(results, [local_qnode(settings) for settings in settings_list])
+
+        grads = process_executor.map_grad(ansatz, qnet.global_parity_expval_qnode, settings_list)
+        assert np.allclose(
+            grads,
+            [
+                qml.grad(expval_qnode)(np.array(settings, requires_grad=True))
+                for settings in settings_list
+            ],
+        )
+
+        nat_grads = process_executor.map_grad(
+            ansatz, qnet.global_parity_expval_qnode, settings_list, natural_grad=True
+        )
+        assert np.allclose(
+            nat_grads,
+            [
+                qnet.qnode_grad(expval_qnode, np.array(settings, requires_grad=True), True)
+                for settings in settings_list
+            ],
+        )
+
+    def test_worker_evaluate_handshake(self, monkeypatch):
+        monkeypatch.setattr(qnet.executors, "_worker_ansatzes", qnet.qnodes._LRUCache(2))
+        monkeypatch.setattr(qnet.executors, "_worker_qnodes", qnet.qnodes._LRUCache(2))
+
+        ansatz = chsh_ansatz()
+        settings_list = [np.array([0.1, 0.2, 0.3, 0.4])]
+        expval = qnet.global_parity_expval_qnode(ansatz)(settings_list[0])
+
+        def task(token, ansatz_bytes):
+            return (token, ansatz_bytes, qnet.global_parity_expval_qnode, pickle.dumps({}), "value")
+
+        # a task without the pickled ansatz is returned to the executor
+        assert qnet.executors._worker_evaluate(task("a", None), settings_list) is None
+
+        results = qnet.executors._worker_evaluate(task("a", pickle.dumps(ansatz)), settings_list)
+        assert np.allclose(results, [expval])
+        results = qnet.executors._worker_evaluate(task("a", None), settings_list)
+        assert np.allclose(results, [expval])
+
+        # the least recently used ansatz is evicted
+        for token in ["b", "c"]:
+            qnet.executors._worker_evaluate(task(token, pickle.dumps(ansatz)), settings_list)
+
+        assert qnet.executors._worker_ansatzes.info()["currsize"] == 2
+        assert qnet.executors._worker_qnodes.info()["currsize"] == 2
+        assert qnet.executors._worker_evaluate(task("a", None), settings_list) is None
+
+    def test_map_resends_ansatz(self):
+        ansatz = chsh_ansatz()
+        np.random.seed(11)
+        settings_list = [np.random.rand(4) for _ in range(6)]
+        expval_qnode = qnet.global_parity_expval_qnode(ansatz)
+
+        with qnet.ProcessExecutor(num_workers=2) as executor:
+            # the pickled ansatz is only sent with the first call, which reaches one worker
+            results = executor.map(ansatz, qnet.global_parity_expval_qnode, settings_list[0:1])
+            assert np.allclose(results, [expval_qnode(settings_list[0])])
+
+            results = executor.map(ansatz, qnet.global_parity_expval_qnode, settings_list)
+            assert np.allclose(results, [expval_qnode(settings) for settings in settings_list])
+
+    def test_map_mixed_device(self, process_executor):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes, dev_kwargs={"name": "default.mixed"})
+
+        results = process_executor.map(
+            ansatz, qnet.joint_probs_qnode, [np.array([0.0, np.pi / 2])], {"diff_method": "best"}
+        )
+        assert np.allclose(results, [[0.25, 0.25, 0.25, 0.25]])
+
+    def test_chsh_cost_and_grad(self, process_executor):
+        ansatz = chsh_ansatz()
+        np.random.seed(5)
+        settings = ansatz.rand_network_settings()
+
+        cost = qnet.chsh_inequality_cost_fn(ansatz)
+        executor_cost = qnet.chsh_inequality_cost_fn(ansatz, executor=process_executor)
+        assert np.isclose(executor_cost(*settings), cost(*settings))
+
+        for natural_grad in [False, True]:
+            grad_fn = qnet.parallel_chsh_grad_fn(ansatz, natural_grad=natural_grad)
+            executor_grad_fn = qnet.parallel_chsh_grad_fn(
+                ansatz, natural_grad=natural_grad, executor=process_executor
+            )
+            assert np.allclose(executor_grad_fn(*settings), grad_fn(*settings))
+
+        # the traced settings cannot be differentiated through the worker processes
+        with pytest.raises(ValueError, match="The `ProcessExecutor` only supports forward"):
+            qml.grad(executor_cost)(*settings)
+
+        opt_kwargs = {"num_steps": 5, "step_size": 0.1, "verbose": False}
+        opt_dict = qnet.gradient_descent(cost, settings, grad_fn=grad_fn, **opt_kwargs)
+        executor_opt_dict = qnet.gradient_descent(
+            executor_cost, settings, grad_fn=executor_grad_fn, **opt_kwargs
+        )
+        assert np.allclose(executor_opt_dict["scores"], opt_dict["scores"])
+
+    def test_nlocal_chain_cost_and_grad(self, process_executor):
+        prep_nodes = [
+            qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2),
+            qnet.PrepareNode(1, [2, 3], qnet.local_RY, 2),
+        ]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1, 2], qnet.local_RY, 2),
+            qnet.MeasureNode(2, 2, [3], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        np.random.seed(7)
+        settings = ansatz.rand_network_settings()
+
+        cost = qnet.nlocal_chain_22_cost_fn(ansatz)
+        executor_cost = qnet.nlocal_chain_22_cost_fn(ansatz, executor=process_executor)
+        assert np.isclose(executor_cost(*settings), cost(*settings))
+
+        grad_fn = qnet.parallel_nlocal_chain_grad_fn(ansatz)
+        executor_grad_fn = qnet.parallel_nlocal_chain_grad_fn(ansatz, executor=process_executor)
+        assert np.allclose(executor_grad_fn(*settings), grad_fn(*settings))
+
+    def test_nlocal_star_cost_and_grad(self, process_executor):
+        prep_nodes = [
+            qnet.PrepareNode(1, [0, 1], qnet.local_RY, 2),
+            qnet.PrepareNode(1, [2, 3], qnet.local_RY, 2),
+        ]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [2], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1, 3], qnet.local_RY, 2),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        np.random.seed(9)
+        settings = ansatz.rand_network_settings()
+
+        cost = qnet.nlocal_star_22_cost_fn(ansatz)
+        executor_cost = qnet.nlocal_star_22_cost_fn(ansatz, executor=process_executor)
+        assert np.isclose(executor_cost(*settings), cost(*settings))
+
+        grad_fn = qnet.parallel_nlocal_star_grad_fn(ansatz)
+        executor_grad_fn = qnet.parallel_nlocal_star_grad_fn(ansatz, executor=process_executor)
+        assert np.allclose(executor_grad_fn(*settings), grad_fn(*settings))
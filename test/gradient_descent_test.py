@@ -1,5 +1,7 @@
 import pytest
+import os
 import re
+import pennylane as qml
 import tensorflow as tf
 from pennylane import numpy as np
 
@@ -60,3 +62,471 @@ class TestGradientDescent:
         assert opt_dict["samples"] == [0, 25, 50]
         assert len(opt_dict["scores"]) == 3
         assert len(opt_dict["settings_history"]) == 51
+
+    def test_settings_array(self):
+        cost = lambda x: qml.math.sum((x - np.array([1.0, 2.0, 3.0])) ** 2)
+        settings = np.zeros(3, requires_grad=True)
+        opt_dict = qnet.gradient_descent(cost, settings, num_steps=50, step_size=0.1, verbose=False)
+
+        assert np.isclose(opt_dict["opt_score"], 0, atol=1e-6)
+        assert np.allclose(opt_dict["opt_settings"], [1, 2, 3], atol=1e-4)
+        assert opt_dict["opt_settings"].shape == (3,)
+        assert len(opt_dict["settings_history"]) == 51
+
+        # fixed settings are masked
+        mask = np.array([True, False, True])
+        for optimizer in [None, "adam"]:
+            opt_dict = qnet.gradient_descent(
+                cost,
+                settings,
+                num_steps=50,
+                step_size=0.1,
+                verbose=False,
+                optimizer=optimizer,
+                trainable_mask=mask,
+            )
+
+            assert opt_dict["opt_settings"][1] == 0
+            assert np.isclose(opt_dict["opt_score"], -4, atol=0.1)
+
+        # tensorflow interface
+        tf_cost = lambda x: tf.reduce_sum((x - tf.constant([1.0, 2.0, 3.0])) ** 2)
+        tf_opt_dict = qnet.gradient_descent(
+            tf_cost,
+            tf.Variable([0.0, 0.0, 0.0]),
+            num_steps=50,
+            step_size=0.1,
+            verbose=False,
+            interface="tf",
+            trainable_mask=mask,
+        )
+
+        assert np.allclose(tf_opt_dict["opt_settings"].numpy(), [1, 0, 3], atol=1e-4)
+
+    def test_trainable_mask_settings_list(self):
+        cost = lambda x, y: qml.math.sum((x - np.array([1.0, 2.0])) ** 2) + (y - 3.0) ** 2
+        settings = [np.zeros(2, requires_grad=True), np.array(0.0, requires_grad=True)]
+
+        # the mask is indexed per element of the settings list
+        mask = [np.array([True, False]), True]
+        for optimizer in [None, "adam"]:
+            opt_dict = qnet.gradient_descent(
+                cost,
+                settings,
+                num_steps=50,
+                step_size=0.1,
+                verbose=False,
+                optimizer=optimizer,
+                trainable_mask=mask,
+            )
+
+            assert opt_dict["opt_settings"][0][1] == 0
+            assert np.isclose(opt_dict["opt_score"], -4, atol=0.1)
+
+        # the masks of non-trainable elements are skipped
+        fixed_settings = [
+            np.array(0.0, requires_grad=False),
+            np.array(0.0, requires_grad=True),
+            np.array(0.0, requires_grad=True),
+        ]
+        fixed_cost = lambda *x: qml.math.sum((qml.math.stack(x) - np.array([1.0, 2.0, 3.0])) ** 2)
+        opt_dict = qnet.gradient_descent(
+            fixed_cost,
+            fixed_settings,
+            num_steps=50,
+            step_size=0.1,
+            verbose=False,
+            trainable_mask=[True, True, False],
+        )
+        assert np.allclose(opt_dict["opt_settings"], [0, 2, 0], atol=1e-4)
+
+        # a list of scalar settings is masked by an array
+        scalar_cost = lambda *x: qml.math.sum((qml.math.stack(x) - np.array([1.0, 2.0, 3.0])) ** 2)
+        scalar_settings = [np.array(0.0, requires_grad=True) for _ in range(3)]
+        opt_dict = qnet.gradient_descent(
+            scalar_cost,
+            scalar_settings,
+            num_steps=50,
+            step_size=0.1,
+            verbose=False,
+            trainable_mask=np.array([True, False, True]),
+        )
+        assert np.allclose(opt_dict["opt_settings"], [1, 0, 3], atol=1e-4)
+
+        # tensorflow interface
+        tf_cost = lambda x, y: tf.reduce_sum((x - tf.constant([1.0, 2.0])) ** 2) + (y - 3.0) ** 2
+        tf_opt_dict = qnet.gradient_descent(
+            tf_cost,
+            [tf.Variable([0.0, 0.0]), tf.Variable(0.0)],
+            num_steps=50,
+            step_size=0.1,
+            verbose=False,
+            interface="tf",
+            trainable_mask=mask,
+        )
+        assert np.allclose(tf_opt_dict["opt_settings"][0].numpy(), [1, 0], atol=1e-4)
+        assert np.isclose(tf_opt_dict["opt_settings"][1].numpy(), 3, atol=1e-4)
+
+        with pytest.raises(ValueError, match="The `trainable_mask` must have one element per"):
+            qnet.gradient_descent(cost, settings, verbose=False, trainable_mask=[True])
+
+    def test_multi_start(self):
+        cost = lambda x: qml.math.sum((x - np.array([1.0, 2.0])) ** 2)
+        init_settings = np.array([[0.0, 0.0], [1.0, 1.0], [1.0, 2.5]], requires_grad=True)
+
+        for optimizer in [None, "adam"]:
+            opt_dict = qnet.gradient_descent(
+                cost,
+                init_settings,
+                num_steps=20,
+                step_size=0.1,
+                sample_width=10,
+                verbose=False,
+                optimizer=optimizer,
+                multi_start=True,
+            )
+
+            assert opt_dict["best_start"] == 2
+            assert opt_dict["start_scores"].shape == (3, 3)
+            assert opt_dict["start_opt_settings"].shape == (3, 2)
+            assert opt_dict["start_settings_history"].shape == (21, 3, 2)
+            assert len(opt_dict["settings_history"]) == 21
+            assert opt_dict["samples"] == [0, 10, 20]
+            assert np.allclose(opt_dict["start_settings_history"][0], init_settings)
+            assert np.isclose(opt_dict["opt_score"], max(opt_dict["start_opt_scores"]))
+            assert np.allclose(opt_dict["scores"], opt_dict["start_scores"][2])
+
+            # each start follows its independent trajectory
+            for j in range(3):
+                start_opt_dict = qnet.gradient_descent(
+                    cost,
+                    init_settings[j],
+                    num_steps=20,
+                    step_size=0.1,
+                    sample_width=10,
+                    verbose=False,
+                    optimizer=optimizer,
+                )
+                assert np.allclose(start_opt_dict["scores"], opt_dict["start_scores"][j])
+                assert np.allclose(
+                    start_opt_dict["opt_settings"], opt_dict["start_opt_settings"][j]
+                )
+
+        # tensorflow interface
+        tf_cost = lambda x: tf.reduce_sum((x - tf.constant([1.0, 2.0], dtype=tf.float64)) ** 2)
+        tf_opt_dict = qnet.gradient_descent(
+            tf_cost,
+            tf.Variable(init_settings.numpy()),
+            num_steps=20,
+            step_size=0.1,
+            verbose=False,
+            interface="tf",
+            trainable_mask=np.array([True, False]),
+            multi_start=True,
+        )
+
+        assert tf_opt_dict["best_start"] == 2
+        assert np.allclose(tf_opt_dict["start_opt_settings"][:, 1], init_settings[:, 1])
+
+    def test_multi_start_network_settings(self, tmp_path):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        np.random.seed(42)
+        init_settings = ansatz.rand_network_settings(num_starts=4)
+        assert init_settings.shape == (4, 4)
+
+        opt_dict = qnet.gradient_descent(
+            qnet.chsh_inequality_cost_fn(ansatz),
+            init_settings,
+            num_steps=30,
+            step_size=0.2,
+            verbose=False,
+            multi_start=True,
+        )
+
+        assert np.isclose(opt_dict["opt_score"], 2 * np.sqrt(2), atol=1e-2)
+        assert opt_dict["start_opt_scores"].shape == (4,)
+
+        filename = str(tmp_path / "multi_start")
+        qnet.write_optimization_json(opt_dict, filename)
+        opt_json = qnet.read_optimization_json(filename + ".json")
+
+        assert opt_json["best_start"] == opt_dict["best_start"]
+        assert np.allclose(opt_json["start_scores"], opt_dict["start_scores"])
+
+    @pytest.mark.parametrize("interface", ["autograd", "tf"])
+    def test_fused_step_and_cost(self, interface):
+        num_calls = []
+
+        def cost(x):
+            num_calls.append(1)
+            return qml.math.sum((x - 1.0) ** 2)
+
+        init_settings = (
+            np.zeros(2, requires_grad=True) if interface == "autograd" else tf.Variable([0.0, 0.0])
+        )
+        opt_dict = qnet.gradient_descent(
+            cost,
+            init_settings,
+            num_steps=10,
+            step_size=0.1,
+            sample_width=1,
+            verbose=False,
+            interface=interface,
+        )
+
+        # one evaluation per step and one for the final settings
+        assert len(num_calls) == 11
+        assert len(opt_dict["step_scores"]) == 11
+        assert np.allclose(opt_dict["step_scores"], opt_dict["scores"])
+        assert np.isclose(opt_dict["step_scores"][0], -2)
+        assert np.isclose(opt_dict["step_scores"][-1], opt_dict["opt_score"])
+
+    def test_custom_grad_fn_scores(self):
+        cost = lambda x: qml.math.sum((x - 1.0) ** 2)
+        grad_fn = lambda x: 2 * (x - 1.0)
+
+        opt_dict = qnet.gradient_descent(
+            cost,
+            np.zeros(2, requires_grad=True),
+            num_steps=10,
+            step_size=0.1,
+            sample_width=5,
+            grad_fn=grad_fn,
+            verbose=False,
+        )
+        match_opt_dict = qnet.gradient_descent(
+            cost,
+            np.zeros(2, requires_grad=True),
+            num_steps=10,
+            step_size=0.1,
+            sample_width=5,
+            verbose=False,
+        )
+
+        assert "step_scores" not in opt_dict
+        assert np.allclose(opt_dict["scores"], match_opt_dict["scores"])
+        assert np.allclose(opt_dict["opt_settings"], match_opt_dict["opt_settings"])
+
+    def test_history_policy(self, tmp_path):
+        cost = lambda x: qml.math.sum((x - np.array([1.0, 2.0])) ** 2)
+        settings = np.zeros(2, requires_grad=True)
+
+        opt_dict = qnet.gradient_descent(cost, settings, num_steps=10, verbose=False)
+        assert len(opt_dict["settings_history"]) == 11
+        assert opt_dict["history_steps"] == list(range(11))
+
+        # no history
+        opt_dict = qnet.gradient_descent(
+            cost, settings, num_steps=10, verbose=False, history_width=None
+        )
+        assert opt_dict["settings_history"] == []
+        assert opt_dict["history_steps"] == []
+
+        # every k-th step
+        match_dict = qnet.gradient_descent(cost, settings, num_steps=10, verbose=False)
+        opt_dict = qnet.gradient_descent(
+            cost, settings, num_steps=10, verbose=False, history_width=4
+        )
+        assert opt_dict["history_steps"] == [0, 4, 8]
+        for i, step in enumerate(opt_dict["history_steps"]):
+            assert np.allclose(
+                opt_dict["settings_history"][i], match_dict["settings_history"][step]
+            )
+
+        # ring buffer
+        opt_dict = qnet.gradient_descent(
+            cost, settings, num_steps=10, verbose=False, history_size=3
+        )
+        assert opt_dict["history_steps"] == [8, 9, 10]
+        assert np.allclose(opt_dict["settings_history"], match_dict["settings_history"][8:])
+
+        # streaming to a memory-mapped file
+        history_mmap = np.memmap(tmp_path / "history.dat", dtype=float, mode="w+", shape=(6, 2))
+        opt_dict = qnet.gradient_descent(
+            cost,
+            settings,
+            num_steps=10,
+            verbose=False,
+            history_width=2,
+            history_array=history_mmap,
+        )
+        assert opt_dict["history_steps"] == [0, 2, 4, 6, 8, 10]
+        assert np.allclose(opt_dict["settings_history"], match_dict["settings_history"][::2])
+        assert np.allclose(history_mmap, match_dict["settings_history"][::2])
+
+        # list settings are streamed as rows
+        list_history = np.zeros((11, 2))
+        opt_dict = qnet.gradient_descent(
+            lambda x, y: (x - 1) ** 2 + (y - 2) ** 2,
+            [np.array(0.0), np.array(0.0)],
+            num_steps=10,
+            verbose=False,
+            history_array=list_history,
+        )
+        assert np.allclose(list_history, match_dict["settings_history"])
+
+        with pytest.raises(ValueError, match="The `history_array` requires at least 11 rows."):
+            qnet.gradient_descent(
+                cost, settings, num_steps=10, verbose=False, history_array=np.zeros((10, 2))
+            )
+
+        with pytest.raises(ValueError, match="Only one of `history_size` and `history_array`"):
+            qnet.gradient_descent(
+                cost,
+                settings,
+                num_steps=10,
+                verbose=False,
+                history_size=2,
+                history_array=np.zeros((11, 2)),
+            )
+
+        # multi-start histories
+        opt_dict = qnet.gradient_descent(
+            cost,
+            np.array([[0.0, 0.0], [1.0, 1.0]], requires_grad=True),
+            num_steps=10,
+            verbose=False,
+            multi_start=True,
+            history_size=2,
+        )
+        assert opt_dict["start_settings_history"].shape == (2, 2, 2)
+        assert len(opt_dict["settings_history"]) == 2
+
+    @pytest.mark.parametrize("optimizer", [None, "adam"])
+    @pytest.mark.parametrize("as_array", [False, True])
+    def test_checkpoint_resume(self, tmp_path, optimizer, as_array):
+        prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+            qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+        chsh_cost = qnet.chsh_inequality_cost_fn(ansatz)
+
+        # the cost consumes random numbers to verify that the random state is restored
+        cost = lambda *settings: chsh_cost(*settings) + 1e-3 * np.random.rand()
+
+        np.random.seed(7)
+        init_settings = ansatz.rand_network_settings(as_array=as_array)
+        opt_kwargs = {"sample_width": 4, "verbose": False, "optimizer": optimizer}
+
+        np.random.seed(11)
+        match_dict = qnet.gradient_descent(cost, init_settings, num_steps=12, **opt_kwargs)
+
+        checkpoint_path = str(tmp_path / "checkpoint.pkl")
+        record_path = str(tmp_path / "records.jsonl")
+
+        # interrupted run
+        np.random.seed(11)
+        qnet.gradient_descent(
+            cost,
+            init_settings,
+            num_steps=8,
+            checkpoint_path=checkpoint_path,
+            checkpoint_width=3,
+            record_path=record_path,
+            **opt_kwargs,
+        )
+
+        checkpoint = qnet.read_optimization_checkpoint(checkpoint_path)
+        assert checkpoint["step"] == 6
+        assert not os.path.exists(checkpoint_path + ".tmp")
+        assert len(qnet.read_optimization_records(record_path)) == 8
+
+        np.random.seed(0)
+        opt_dict = qnet.gradient_descent(
+            cost,
+            init_settings,
+            num_steps=12,
+            resume_from=checkpoint_path,
+            record_path=record_path,
+            **opt_kwargs,
+        )
+
+        assert opt_dict["scores"] == match_dict["scores"]
+        assert opt_dict["step_scores"] == match_dict["step_scores"]
+        assert opt_dict["samples"] == match_dict["samples"]
+        assert opt_dict["history_steps"] == match_dict["history_steps"]
+        assert np.array_equal(
+            qml.math.stack(opt_dict["opt_settings"]), qml.math.stack(match_dict["opt_settings"])
+        )
+        for settings, match_settings in zip(
+            opt_dict["settings_history"], match_dict["settings_history"]
+        ):
+            assert np.array_equal(qml.math.stack(settings), qml.math.stack(match_settings))
+
+        records = qnet.read_optimization_records(record_path)
+        assert [record["step"] for record in records] == list(range(12))
+        assert np.allclose([record["score"] for record in records], match_dict["step_scores"][:-1])
+
+    def test_checkpoint_resume_tf(self, tmp_path):
+        cost = lambda x: tf.reduce_sum((x - tf.constant([1.0, 2.0])) ** 2)
+        checkpoint_path = str(tmp_path / "checkpoint.pkl")
+
+        match_dict = qnet.gradient_descent(
+            cost, tf.Variable([0.0, 0.0]), num_steps=10, verbose=False, interface="tf"
+        )
+        qnet.gradient_descent(
+            cost,
+            tf.Variable([0.0, 0.0]),
+            num_steps=7,
+            verbose=False,
+            interface="tf",
+            checkpoint_path=checkpoint_path,
+            checkpoint_width=5,
+        )
+        opt_dict = qnet.gradient_descent(
+            cost,
+            tf.Variable([0.0, 0.0]),
+            num_steps=10,
+            verbose=False,
+            interface="tf",
+            resume_from=checkpoint_path,
+        )
+
+        assert np.array_equal(opt_dict["opt_settings"].numpy(), match_dict["opt_settings"].numpy())
+        assert np.allclose(opt_dict["step_scores"], match_dict["step_scores"])
+
+        # the momentum slots are built before their checkpointed values are restored
+        opt_kwargs = {
+            "num_steps": 10,
+            "step_size": 0.05,
+            "verbose": False,
+            "interface": "tf",
+            "optimizer_kwargs": {"momentum": 0.9},
+        }
+        match_dict = qnet.gradient_descent(cost, tf.Variable([0.0, 0.0]), **opt_kwargs)
+        qnet.gradient_descent(
+            cost,
+            tf.Variable([0.0, 0.0]),
+            **{**opt_kwargs, "num_steps": 7},
+            checkpoint_path=checkpoint_path,
+            checkpoint_width=5,
+        )
+
+        checkpoint = qnet.read_optimization_checkpoint(checkpoint_path)
+        assert len(checkpoint["optimizer_state"]) == 3
+
+        opt_dict = qnet.gradient_descent(
+            cost, tf.Variable([0.0, 0.0]), **opt_kwargs, resume_from=checkpoint_path
+        )
+
+        assert np.allclose(opt_dict["opt_settings"].numpy(), match_dict["opt_settings"].numpy())
+        assert np.allclose(opt_dict["step_scores"], match_dict["step_scores"])
+
+        # a resumed optimizer without momentum does not match the checkpoint
+        with pytest.raises(ValueError, match="The checkpointed optimizer state does not match"):
+            qnet.gradient_descent(
+                cost,
+                tf.Variable([0.0, 0.0]),
+                num_steps=10,
+                verbose=False,
+                interface="tf",
+                resume_from=checkpoint_path,
+            )
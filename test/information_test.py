@@ -58,6 +58,65 @@ class TestBehaviorFn:
             ],
         )
 
+    def test_broadcast(self):
+        prep_nodes = [
+            qnet.PrepareNode(2, [0], qnet.local_RY, 1),
+            qnet.PrepareNode(3, [1], qnet.local_RY, 1),
+        ]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0, 1], qnet.local_RY, 2),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        np.random.seed(123)
+        settings = ansatz.rand_network_settings()
+
+        for postmap in [np.array([]), np.array([[1, 0, 0, 1], [0, 1, 1, 0]])]:
+            P_Net = qnet.behavior_fn(ansatz, postmap=postmap)
+            P_Net_broadcast = qnet.behavior_fn(ansatz, postmap=postmap, broadcast=True)
+
+            assert np.allclose(P_Net_broadcast(settings), P_Net(settings))
+
+            # the six input combinations are evaluated in chunks of four and two
+            P_Net_chunked = qnet.behavior_fn(ansatz, postmap=postmap, chunk_size=4)
+            assert np.allclose(P_Net_chunked(settings), P_Net(settings))
+
+            settings_array = ansatz.network_settings_array(settings)
+            assert np.allclose(
+                qml.jacobian(P_Net_chunked)(settings_array), qml.jacobian(P_Net)(settings_array)
+            )
+
+    def test_grad(self):
+        prep_nodes = [
+            qnet.PrepareNode(2, [0], qnet.local_RY, 1),
+            qnet.PrepareNode(3, [1], qnet.local_RY, 1),
+        ]
+        meas_nodes = [
+            qnet.MeasureNode(2, 2, [0, 1], qnet.local_RY, 2),
+        ]
+        ansatz = qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+        np.random.seed(27)
+        settings = ansatz.network_settings_array(ansatz.rand_network_settings())
+
+        for postmap in [np.array([]), np.array([[1, 0, 0, 1], [0, 1, 1, 0]])]:
+            for broadcast in [False, True]:
+                P_Net = qnet.behavior_fn(ansatz, postmap=postmap, broadcast=broadcast)
+                jac = qml.jacobian(P_Net)(settings)
+
+                assert jac.shape == P_Net(settings).shape + settings.shape
+
+                for i in range(len(settings)):
+                    shift = np.zeros(len(settings))
+                    shift[i] = np.pi / 2
+                    shift_jac = (P_Net(settings + shift) - P_Net(settings - shift)) / 2
+
+                    assert np.allclose(jac[:, :, i], shift_jac)
+
+                # any differentiable function of the behavior has a gradient
+                cost = lambda settings: -qml.math.sum(P_Net(settings)[0] ** 2)
+                assert np.allclose(qml.grad(cost)(settings), -2 * P_Net(settings)[0] @ jac[0])
+
     def test_42_coarse_grain(self):
         prep_nodes = [
             qnet.PrepareNode(2, [0], qnet.local_RY, 1),
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 import pennylane as qml
 from pennylane import numpy as np
@@ -147,6 +148,56 @@ def test_qnode_settings(chsh_ansatz):
     assert np.allclose(settings, [1.2344523, -1.34372619, -1.71624293, -0.48313636])
 
 
+def test_qnode_settings_ids(chsh_ansatz):
+    assert chsh_ansatz.qnode_num_settings == 4
+
+    ids = chsh_ansatz.qnode_settings_ids([[0], [0, 1]])
+    assert np.all(ids == [0, 1, 2, 5])
+    assert chsh_ansatz.qnode_settings_ids([[0], [0, 1]]) is ids
+
+    ids_matrix = chsh_ansatz.qnode_settings_ids_matrix(
+        [[[0], [x, y]] for x, y in [(0, 0), (0, 1), (1, 0), (1, 1)]]
+    )
+    assert ids_matrix.shape == (4, 4)
+    assert np.all(ids_matrix == [[0, 1, 2, 4], [0, 1, 2, 5], [0, 1, 3, 4], [0, 1, 3, 5]])
+
+    settings_array = np.arange(6.0)
+    assert np.allclose(
+        chsh_ansatz.qnode_settings((settings_array,), [[0], [1, 1]]), settings_array[ids_matrix[3]]
+    )
+
+    # scatter-add is the adjoint of the gather
+    expanded = chsh_ansatz.expand_qnode_settings(np.array([1.0, 2.0, 3.0, 4.0]), [[0], [1, 0]])
+    assert np.allclose(expanded, [1, 2, 0, 3, 4, 0])
+
+
+def test_qnode_settings_array(chsh_ansatz):
+    np.random.seed(123)
+    network_settings = chsh_ansatz.rand_network_settings()
+
+    np.random.seed(123)
+    settings_array = chsh_ansatz.rand_network_settings(as_array=True)
+
+    assert chsh_ansatz.num_settings == 6
+    assert np.allclose(chsh_ansatz.network_settings_array(network_settings), settings_array)
+    assert chsh_ansatz.network_settings_array((settings_array,)) is settings_array
+
+    for network_inputs in [[[0], [0, 1]], [[0], [1, 0]]]:
+        assert np.allclose(
+            chsh_ansatz.qnode_settings(network_settings, network_inputs),
+            chsh_ansatz.qnode_settings((settings_array,), network_inputs),
+        )
+
+    qnode_settings_grad = qml.jacobian(
+        lambda settings: chsh_ansatz.qnode_settings(settings, [[0], [0, 1]])
+    )(settings_array)
+
+    assert np.allclose(
+        qnode_settings_grad,
+        [[1, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 1]],
+    )
+
+
 @pytest.mark.parametrize(
     "layer_inputs, layer_id, match",
     [([1, 0], 0, [1, 2]), ([0, 1], 0, [0, 3]), ([1], 1, [6, 7])],
@@ -392,6 +443,62 @@ def test_fixed_network_settings():
     assert all([isinstance(tf_rand_settings[i], tf.Tensor) for i in [0, 2, 4, 6]])
 
 
+def test_network_settings_as_array():
+    def ansatz_circuit(settings, wires):
+        return None
+
+    prep_nodes = [
+        qnetvo.PrepareNode(2, [0], ansatz_circuit, 1),
+        qnetvo.PrepareNode(2, [1], ansatz_circuit, 1),
+    ]
+    meas_nodes = [
+        qnetvo.MeasureNode(2, 2, [0], ansatz_circuit, 1),
+        qnetvo.MeasureNode(2, 2, [1], ansatz_circuit, 1),
+    ]
+    network_ansatz = qnetvo.NetworkAnsatz(prep_nodes, meas_nodes)
+
+    zero_settings = network_ansatz.zero_network_settings(as_array=True)
+
+    assert isinstance(zero_settings, np.tensor)
+    assert zero_settings.shape == (8,)
+    assert qml.math.requires_grad(zero_settings)
+    assert np.allclose(zero_settings, 0)
+
+    np.random.seed(123)
+    rand_settings = network_ansatz.rand_network_settings(
+        fixed_setting_ids=[0, 2, 4, 6], fixed_settings=[0, 2, 4, 6], as_array=True
+    )
+
+    assert isinstance(rand_settings, np.tensor)
+    assert qml.math.requires_grad(rand_settings)
+    assert np.allclose(rand_settings, [0, -1.34372619, 2, 0.3224202, 4, -0.48313636, 6, 1.1613195])
+
+    mask = network_ansatz.trainable_settings_mask(fixed_setting_ids=[0, 2, 4, 6])
+    assert np.all(mask == [False, True, False, True, False, True, False, True])
+    assert np.all(network_ansatz.trainable_settings_mask())
+
+    np.random.seed(123)
+    tf_rand_settings = network_ansatz.tf_rand_network_settings(as_array=True)
+
+    assert isinstance(tf_rand_settings, tf.Variable)
+    assert tf_rand_settings.shape == (8,)
+
+    np.random.seed(123)
+    batch_settings = network_ansatz.rand_network_settings(
+        fixed_setting_ids=[0, 2, 4, 6], fixed_settings=[0, 2, 4, 6], num_starts=3
+    )
+
+    assert batch_settings.shape == (3, 8)
+    assert qml.math.requires_grad(batch_settings)
+    assert np.allclose(batch_settings[:, [0, 2, 4, 6]], [0, 2, 4, 6])
+    assert np.allclose(batch_settings[0], rand_settings)
+
+    tf_batch_settings = network_ansatz.tf_rand_network_settings(num_starts=3)
+
+    assert isinstance(tf_batch_settings, tf.Variable)
+    assert tf_batch_settings.shape == (3, 8)
+
+
 @pytest.mark.parametrize(
     "network_input, match_settings",
     [
@@ -406,3 +513,88 @@ def test_expand_qnode_settings_chsh_ansatz(chsh_ansatz, network_input, match_set
     network_settings = chsh_ansatz.expand_qnode_settings(qnode_settings, network_input)
 
     assert all(network_settings == match_settings)
+
+
+def test_expand_qnode_settings_grad(chsh_ansatz):
+    network_input = [[0], [1, 0]]
+    weights = np.arange(6.0)
+
+    # the expanded settings are differentiable with respect to the qnode settings
+    cost = lambda qn_settings: np.sum(
+        weights * chsh_ansatz.expand_qnode_settings(qn_settings, network_input)
+    )
+    qn_settings = np.array([1.0, 2.0, 3.0, 4.0], requires_grad=True)
+    assert np.allclose(qml.grad(cost)(qn_settings), [0, 1, 3, 4])
+
+    # tensorflow interface
+    tf_settings = tf.Variable([1.0, 2.0, 3.0, 4.0], dtype=tf.float64)
+    with tf.GradientTape() as tape:
+        expanded = chsh_ansatz.expand_qnode_settings(tf_settings, network_input)
+        tf_cost = tf.reduce_sum(tf.constant(weights) * expanded)
+
+    assert np.allclose(expanded.numpy(), [1, 2, 0, 3, 4, 0])
+    assert np.allclose(tape.gradient(tf_cost, tf_settings).numpy(), [0, 1, 3, 4])
+
+
+def test_network_ansatz_pickle(chsh_ansatz):
+    unpickled_ansatz = pickle.loads(pickle.dumps(chsh_ansatz))
+
+    assert unpickled_ansatz.num_settings == chsh_ansatz.num_settings
+    assert unpickled_ansatz.network_wires == chsh_ansatz.network_wires
+    assert unpickled_ansatz.parameter_partitions == chsh_ansatz.parameter_partitions
+
+    settings = chsh_ansatz.rand_network_settings()
+    qnode_settings = chsh_ansatz.qnode_settings(settings, [[0], [1, 1]])
+    assert np.isclose(
+        qnetvo.global_parity_expval_qnode(unpickled_ansatz)(qnode_settings),
+        qnetvo.global_parity_expval_qnode(chsh_ansatz)(qnode_settings),
+    )
+
+
+def test_network_inputs(ex_network_ansatz):
+    network_inputs = qnetvo.NetworkInputs(ex_network_ansatz)
+
+    num_inputs_list = np.concatenate(ex_network_ansatz.layers_node_num_in).tolist()
+    expected_inputs = [
+        qnetvo.ragged_reshape(
+            qnetvo.mixed_base_num(i, num_inputs_list), ex_network_ansatz.layers_num_nodes
+        )
+        for i in range(np.prod(ex_network_ansatz.layers_total_num_in))
+    ]
+
+    assert len(network_inputs) == len(expected_inputs)
+    assert list(network_inputs) == expected_inputs
+    assert network_inputs[3] == expected_inputs[3]
+    assert network_inputs[-1] == expected_inputs[-1]
+    assert network_inputs[2:7:2] == expected_inputs[2:7:2]
+
+    chunks = list(network_inputs.chunks(5))
+    assert [len(chunk) for chunk in chunks[:-1]] == [5] * (len(chunks) - 1)
+    assert sum(chunks, []) == expected_inputs
+
+    assert np.all(
+        network_inputs.qnode_settings_ids_matrix()
+        == ex_network_ansatz.qnode_settings_ids_matrix(expected_inputs)
+    )
+    assert np.all(
+        network_inputs.qnode_settings_ids_matrix(2, 4)
+        == ex_network_ansatz.qnode_settings_ids_matrix(expected_inputs[2:4])
+    )
+
+    with pytest.raises(IndexError, match="out of range"):
+        network_inputs[len(expected_inputs)]
+
+    with pytest.raises(ValueError, match="The `chunk_size` must be at least 1."):
+        next(network_inputs.chunks(0))
+
+
+def test_network_inputs_large():
+    prep_nodes = [qnetvo.PrepareNode(10, [i], qnetvo.local_RY, 1) for i in range(4)]
+    meas_nodes = [qnetvo.MeasureNode(10, 2, [i], qnetvo.local_RY, 1) for i in range(4)]
+    ansatz = qnetvo.NetworkAnsatz(prep_nodes, meas_nodes)
+
+    network_inputs = qnetvo.NetworkInputs(ansatz)
+
+    assert len(network_inputs) == 10**8
+    assert network_inputs[1234567] == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert len(next(network_inputs.chunks(1000))) == 1000
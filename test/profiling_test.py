@@ -0,0 +1,109 @@
+import pytest
+import pennylane as qml
+import autograd.core
+from pennylane import numpy as np
+
+import qnetvo as qnet
+
+
+def chsh_ansatz():
+    prep_nodes = [qnet.PrepareNode(1, [0, 1], qnet.ghz_state, 0)]
+    meas_nodes = [
+        qnet.MeasureNode(2, 2, [0], qnet.local_RY, 1),
+        qnet.MeasureNode(2, 2, [1], qnet.local_RY, 1),
+    ]
+    return qnet.NetworkAnsatz(prep_nodes, meas_nodes)
+
+
+class TestProfiler:
+    def test_profile_cost_and_grad(self):
+        ansatz = chsh_ansatz()
+        cost = qnet.chsh_inequality_cost_fn(ansatz)
+
+        np.random.seed(3)
+        settings = ansatz.rand_network_settings()
+
+        with qnet.Profiler() as profiler:
+            cost(*settings)
+            qml.grad(cost)(*settings)
+
+        assert profiler.num_executions == 8
+        assert profiler.qnode_stats["global_parity_expval_qnode"]["calls"] == 8
+        assert profiler.qnode_stats["global_parity_expval_qnode"]["executions"] == 8
+
+        assert profiler.phase_counts["settings"] == 8
+        assert profiler.phase_counts["device"] == 8
+        assert profiler.phase_counts["backward"] == 1
+        for phase in ["settings", "construct", "device", "backward", "qnode"]:
+            assert profiler.phase_times[phase] > 0
+
+        assert profiler.total_time >= sum(profiler.phase_times.values()) - 1e-6
+        assert "global_parity_expval_qnode" in profiler.report()
+
+    def test_profile_thread_executor(self):
+        ansatz = chsh_ansatz()
+        with qnet.ThreadExecutor(num_workers=2) as executor:
+            cost = qnet.chsh_inequality_cost_fn(ansatz, executor=executor)
+            settings = ansatz.rand_network_settings()
+
+            with qnet.Profiler() as profiler:
+                cost(*settings)
+
+        assert profiler.num_executions == 4
+        assert profiler.phase_counts["qnode"] == 4
+
+    def test_patches_restored(self):
+        originals = [
+            qnet.NetworkAnsatz.qnode_settings,
+            qml.QNode.__call__,
+            qml.QNode.construct,
+            autograd.core.backward_pass,
+        ]
+
+        with qnet.Profiler():
+            assert qml.QNode.__call__ is not originals[1]
+
+        assert [
+            qnet.NetworkAnsatz.qnode_settings,
+            qml.QNode.__call__,
+            qml.QNode.construct,
+            autograd.core.backward_pass,
+        ] == originals
+
+    def test_missing_internals(self, monkeypatch):
+        ansatz = chsh_ansatz()
+        cost = qnet.chsh_inequality_cost_fn(ansatz)
+        settings = ansatz.rand_network_settings()
+
+        # as if the PennyLane execution module were reorganized
+        monkeypatch.setattr("qnetvo.profiling._pl_execution", None)
+        with pytest.warns(UserWarning, match="could not instrument _make_inner_execute"):
+            with qnet.Profiler() as profiler:
+                cost(*settings)
+
+        # device executions fall back to being timed as part of the qnode calls
+        assert profiler.uninstrumented == ["_make_inner_execute"]
+        assert profiler.num_executions == 0
+        assert profiler.phase_counts["device"] == 0
+        assert profiler.phase_counts["qnode"] == 4
+        assert profiler.phase_times["qnode"] > 0
+        assert profiler.total_time > 0
+
+    def test_unsupported_pennylane_version(self, monkeypatch):
+        monkeypatch.setattr(qml, "__version__", "0.99.0")
+        with pytest.warns(UserWarning, match="The `Profiler` is not tested with PennyLane 0.99.0"):
+            with qnet.Profiler() as profiler:
+                pass
+
+        assert profiler.uninstrumented == []
+
+    def test_nested_profiler(self):
+        with qnet.Profiler():
+            with pytest.raises(RuntimeError, match="A `Profiler` is already active."):
+                with qnet.Profiler():
+                    pass
+
+        with qnet.Profiler() as profiler:
+            pass
+
+        assert profiler.num_executions == 0
@@ -280,6 +280,87 @@ class TestOptimzationFileIO:
         for i in range(5):
             assert opt_dict["settings_history"][i] == opt_json["settings_history"][i]
 
+    def test_optimization_npz_io(self, tmp_path):
+        opt_dict = self.construct_opt_dict()
+        opt_dict["opt_score"] = qnp.array(12.0)
+        opt_dict["step_size"] = 0.1
+        opt_dict["history_steps"] = []
+
+        filename = str(tmp_path / "opt")
+        qnetvo.write_optimization_npz(opt_dict, filename)
+
+        assert os.path.exists(filename + ".npz")
+
+        npz_dict = qnetvo.read_optimization_npz(filename + ".npz")
+
+        assert npz_dict["datetime"] == "2021-05-22T11:11:11Z"
+        assert npz_dict["opt_score"] == 12
+        assert npz_dict["step_size"] == 0.1
+        assert np.allclose(npz_dict["opt_settings"], opt_dict["opt_settings"])
+        assert np.allclose(npz_dict["scores"], opt_dict["scores"])
+        assert np.all(npz_dict["samples"] == opt_dict["samples"])
+        assert np.allclose(npz_dict["settings_history"], opt_dict["settings_history"])
+        assert npz_dict["history_steps"].shape == (0,)
+
+        # selective reads
+        meta_dict = qnetvo.read_optimization_npz(filename + ".npz", keys=[])
+        assert set(meta_dict.keys()) == {"datetime", "opt_score", "step_size"}
+
+        opt_settings_dict = qnetvo.read_optimization_npz(filename + ".npz", keys=["opt_settings"])
+        assert "settings_history" not in opt_settings_dict
+        assert np.allclose(opt_settings_dict["opt_settings"], opt_dict["opt_settings"])
+
+        # memory-mapped reads
+        mmap_dict = qnetvo.read_optimization_npz(
+            filename + ".npz", keys=["settings_history", "history_steps"], mmap_mode="r"
+        )
+        assert isinstance(mmap_dict["settings_history"], np.memmap)
+        assert np.allclose(mmap_dict["settings_history"], opt_dict["settings_history"])
+        assert mmap_dict["history_steps"].shape == (0,)
+
+    def test_optimization_npz_gradient_descent(self, tmp_path):
+        cost = lambda x: qml.math.sum((x - 1.0) ** 2)
+        opt_dict = qnetvo.gradient_descent(
+            cost, qnp.zeros(3, requires_grad=True), num_steps=10, verbose=False
+        )
+
+        filename = str(tmp_path / "opt")
+        qnetvo.write_optimization_npz(opt_dict, filename)
+        npz_dict = qnetvo.read_optimization_npz(filename + ".npz", mmap_mode="r")
+
+        assert np.isclose(npz_dict["opt_score"], opt_dict["opt_score"])
+        assert npz_dict["settings_history"].shape == (11, 3)
+        assert np.allclose(npz_dict["settings_history"], opt_dict["settings_history"])
+        assert np.allclose(npz_dict["step_scores"], opt_dict["step_scores"])
+
+    def test_optimization_checkpoint_io(self, tmp_path):
+        filepath = str(tmp_path / "checkpoint.pkl")
+        checkpoint = {"step": 3, "settings": qnp.array([0.1, 0.2], requires_grad=True)}
+
+        qnetvo.write_optimization_checkpoint(checkpoint, filepath)
+
+        assert os.path.exists(filepath)
+        assert not os.path.exists(filepath + ".tmp")
+
+        read_checkpoint = qnetvo.read_optimization_checkpoint(filepath)
+        assert read_checkpoint["step"] == 3
+        assert np.allclose(read_checkpoint["settings"], [0.1, 0.2])
+        assert qml.math.requires_grad(read_checkpoint["settings"])
+
+        # existing checkpoints are replaced
+        qnetvo.write_optimization_checkpoint({"step": 6}, filepath)
+        assert qnetvo.read_optimization_checkpoint(filepath) == {"step": 6}
+
+    def test_read_optimization_records(self, tmp_path):
+        filepath = str(tmp_path / "records.jsonl")
+        with open(filepath, "w") as file:
+            file.write('{"step": 0, "score": 1.5}\n{"step": 1}\n')
+
+        assert qnetvo.read_optimization_records(filepath) == [
+            {"step": 0, "score": 1.5},
+            {"step": 1},
+        ]
+
     def test_mixed_base_num(self):
         assert np.all(qnetvo.mixed_base_num(0, [2, 2]) == [0, 0])
         assert np.all(qnetvo.mixed_base_num(2, [2, 2]) == [1, 0])